@@ -0,0 +1,266 @@
+"""Archive d'assets hors-ligne : donnees Pokemon, moves et sprites dans un seul fichier.
+
+Le bundler resout toutes les especes de bdd/pokemon.json et bdd/evolutions.json,
+leurs moves et leurs sprites (face/dos), puis les ecrit dans bdd/assets.pack.
+Le jeu ouvre l'archive au demarrage (mmap) et la consulte avant le cache et le
+reseau : une machine qui a l'archive n'a plus besoin de PokeAPI.
+
+    python -m api.asset_bundle            # construit (cache puis PokeAPI)
+    python -m api.asset_bundle --offline  # construit depuis la BDD et le cache seulement
+
+Format (little-endian) :
+    en-tete "<4sHHIQI" : magic, version du format, reserve, nombre d'entrees,
+                          offset et taille de l'index
+    blobs des entrees, bout a bout
+    index JSON (UTF-8) : {"version": ..., "created": ..., "entries":
+                          {"<category>/<key>": [offset, taille]}}
+
+Les categories sont celles du cache API : "pokemon", "moves" (JSON) et
+"sprites" (PNG, cle "<id>_<front|back>").
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import BASE_DIR, ASSET_BUNDLE_PATH, API_MAX_WORKERS
+
+
+MAGIC = b"PKAS"
+FORMAT_VERSION = 1
+
+POKEMON_JSON_PATH = os.path.join(BASE_DIR, "bdd", "pokemon.json")
+EVOLUTIONS_JSON_PATH = os.path.join(BASE_DIR, "bdd", "evolutions.json")
+
+_HEADER = struct.Struct("<4sHHIQI")
+
+# URL PokeAPI d'un sprite face/dos -> (id, side)
+_SPRITE_URL = re.compile(r"/sprites/pokemon/(back/)?(\d+)\.png$")
+
+
+def sprite_key_for_url(url):
+    """Cle "sprites" d'une URL de sprite PokeAPI (face ou dos), ou None."""
+    match = _SPRITE_URL.search(url or "")
+    if not match:
+        return None
+    side = "back" if match.group(1) else "front"
+    return f"{match.group(2)}_{side}"
+
+
+# ----------------------------------------------------------------------
+# Ecriture
+# ----------------------------------------------------------------------
+
+def write_bundle(entries, path=ASSET_BUNDLE_PATH, version=None):
+    """Ecrit l'archive (ecriture atomique).
+
+    Args:
+        entries: dict {(category, key): bytes}
+        version: identifiant de contenu (date de construction si None)
+
+    Returns:
+        int: taille du fichier
+    """
+    created = int(time.time())
+    index = {}
+    blobs = []
+    offset = _HEADER.size
+    for (category, key), data in sorted(entries.items()):
+        index[f"{category}/{key}"] = [offset, len(data)]
+        blobs.append(data)
+        offset += len(data)
+
+    index_bytes = json.dumps({
+        "version": version or time.strftime("%Y%m%d-%H%M%S", time.gmtime(created)),
+        "created": created,
+        "entries": index,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(index), offset, len(index_bytes)))
+        for data in blobs:
+            f.write(data)
+        f.write(index_bytes)
+    os.replace(tmp_path, path)
+    return offset + len(index_bytes)
+
+
+def _referenced_species():
+    """Ids de toutes les especes de bdd/pokemon.json et bdd/evolutions.json."""
+    ids = set()
+    with open(POKEMON_JSON_PATH, "r", encoding="utf-8") as f:
+        ids.update(p["id"] for p in json.load(f))
+    if os.path.exists(EVOLUTIONS_JSON_PATH):
+        with open(EVOLUTIONS_JSON_PATH, "r", encoding="utf-8") as f:
+            for pokemon_id, evolution in json.load(f).items():
+                ids.add(int(pokemon_id))
+                ids.add(int(evolution["evolves_to"]))
+    return sorted(ids)
+
+
+def build_bundle(client, path=ASSET_BUNDLE_PATH, max_workers=API_MAX_WORKERS):
+    """Resout especes, moves et sprites via l'APIClient puis ecrit l'archive.
+
+    Returns:
+        tuple: (nombre d'entrees, taille du fichier, liste des ressources manquantes)
+    """
+    entries = {}
+    missing = []
+    lock = threading.Lock()
+
+    def add(category, key, data):
+        with lock:
+            entries[(category, key)] = data
+
+    def resolve_species(pokemon_id):
+        try:
+            data = client.fetch_pokemon_data(pokemon_id)
+        except Exception as e:
+            missing.append(f"pokemon/{pokemon_id} ({e})")
+            return []
+        # Les especes de la BDD locale n'ont pas besoin d'etre dans l'archive
+        if pokemon_id not in client.local_pokemon_db:
+            add("pokemon", str(pokemon_id), json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        for side in ("front", "back"):
+            try:
+                sprite_path = client.download_sprite(pokemon_id, side)
+            except Exception as e:
+                sprite_path = None
+                missing.append(f"sprites/{pokemon_id}_{side} ({e})")
+            if sprite_path:
+                with open(sprite_path, "rb") as f:
+                    add("sprites", f"{pokemon_id}_{side}", f.read())
+        return [move["name"] for move in data["moves"]]
+
+    def resolve_move(move_name):
+        try:
+            data = client.fetch_move_data(move_name)
+        except Exception as e:
+            missing.append(f"moves/{move_name} ({e})")
+            return
+        if data:
+            add("moves", move_name, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        move_lists = list(pool.map(resolve_species, _referenced_species()))
+        move_names = sorted({name for names in move_lists for name in names})
+        list(pool.map(resolve_move, move_names))
+
+    size = write_bundle(entries, path)
+    return len(entries), size, sorted(missing)
+
+
+# ----------------------------------------------------------------------
+# Lecture
+# ----------------------------------------------------------------------
+
+class AssetBundle:
+    """Archive ouverte en lecture (mmap) : get(category, key) -> bytes ou None."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count, index_offset, index_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} n'est pas une archive d'assets (version {FORMAT_VERSION})")
+
+        index = json.loads(self._map[index_offset:index_offset + index_size])
+        self.version = index["version"]
+        self.created = index["created"]
+        self._entries = {name: tuple(entry) for name, entry in index["entries"].items()}
+        if len(self._entries) != count:
+            self._map.close()
+            raise ValueError(f"{path} : index corrompu")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def get(self, category, key):
+        """Octets de l'entree, ou None si absente."""
+        entry = self._entries.get(f"{category}/{key}")
+        if entry is None:
+            return None
+        offset, size = entry
+        return self._map[offset:offset + size]
+
+    def keys(self, category):
+        prefix = f"{category}/"
+        return sorted(name[len(prefix):] for name in self._entries if name.startswith(prefix))
+
+    def sprite_for_url(self, url):
+        """Octets du sprite correspondant a une URL PokeAPI, ou None."""
+        key = sprite_key_for_url(url)
+        return self.get("sprites", key) if key else None
+
+    def extract_sprite_url(self, url, filepath):
+        """Ecrit le sprite d'une URL PokeAPI dans filepath. Retourne True si trouve."""
+        data = self.sprite_for_url(url)
+        if data is None:
+            return False
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+        return True
+
+    def close(self):
+        self._map.close()
+
+
+_shared_bundle = None
+_shared_loaded = False
+_shared_lock = threading.Lock()
+
+
+def get_asset_bundle():
+    """Archive partagee par le processus (ouverte au premier appel), ou None si absente."""
+    global _shared_bundle, _shared_loaded
+    if not _shared_loaded:
+        with _shared_lock:
+            if not _shared_loaded:
+                if os.path.exists(ASSET_BUNDLE_PATH):
+                    try:
+                        _shared_bundle = AssetBundle(ASSET_BUNDLE_PATH)
+                    except (OSError, ValueError) as e:
+                        print(f"[AssetBundle] {ASSET_BUNDLE_PATH} ignoree ({e})")
+                _shared_loaded = True
+    return _shared_bundle
+
+
+def main():
+    from api.client import APIClient
+
+    parser = argparse.ArgumentParser(description="Construit l'archive d'assets hors-ligne")
+    parser.add_argument("--output", default=ASSET_BUNDLE_PATH)
+    parser.add_argument("--offline", action="store_true",
+                        help="BDD locale et cache uniquement (aucun appel reseau)")
+    parser.add_argument("--workers", type=int, default=API_MAX_WORKERS)
+    args = parser.parse_args()
+
+    client = APIClient(offline=args.offline)
+    count, size, missing = build_bundle(client, args.output, args.workers)
+    bundle = AssetBundle(args.output)
+    details = ", ".join(f"{c} {len(bundle.keys(c))}" for c in ("pokemon", "moves", "sprites"))
+    print(f"{args.output} : {count} entrees ({details}), {size} octets, version {bundle.version}")
+    bundle.close()
+    if missing:
+        print(f"{len(missing)} ressources manquantes :")
+        for name in missing:
+            print(f"  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,417 @@
-"""Cache disque pour les reponses API et les sprites."""
+"""Cache disque pour les reponses API et les sprites.
 
+Deux backends interchangeables stockent des blobs (category, key) -> bytes :
+    - FileBackend   : un fichier par entree (cache/<category>/<key>.json|.png),
+                      l'ancien format
+    - SQLiteBackend : une seule base SQLite en mode WAL (cache/cache.sqlite3),
+                      cle primaire indexee, ecritures groupees par transaction,
+                      lecteurs et ecrivains concurrents (threads de chargement)
+
+Cache ajoute par-dessus l'encodage JSON, les chemins de sprites et un niveau
+memoire (MemoryLRU) : une entree JSON n'est lue et decodee depuis le disque
+qu'une fois par processus tant qu'elle reste dans les limites du LRU.
+Une archive d'assets (api/asset_bundle.py), si fournie, est consultee entre
+la memoire et le backend.
+
+Outil d'import de l'arborescence existante dans la base SQLite :
+    python -m api.cache import
+    python -m api.cache stats
+"""
+
+import argparse
+import contextlib
 import json
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
 
+from config import CACHE_DIR, CACHE_BACKEND, CACHE_MEMORY_ENTRIES, CACHE_MEMORY_BYTES
 
-class Cache:
-    """Cache les donnees API en JSON et les sprites en PNG sur le disque."""
+
+JSON_CATEGORIES = ("pokemon", "moves", "types")
+SPRITE_CATEGORY = "sprites"
+SQLITE_FILENAME = "cache.sqlite3"
+
+
+def _extension(category):
+    return ".png" if category == SPRITE_CATEGORY else ".json"
+
+
+def _write_atomic(path, data):
+    """Ecrit un fichier d'un coup (pas de fichier tronque si deux threads ecrivent)."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class FileBackend:
+    """Un fichier par entree dans cache_dir/<category>/."""
+
+    name = "files"
 
     def __init__(self, cache_dir):
         self.cache_dir = cache_dir
-        self._ensure_dirs()
+        for sub in JSON_CATEGORIES + (SPRITE_CATEGORY,):
+            os.makedirs(os.path.join(cache_dir, sub), exist_ok=True)
+
+    def path(self, category, key):
+        return os.path.join(self.cache_dir, category, f"{key}{_extension(category)}")
+
+    def get(self, category, key):
+        """Retourne les octets de l'entree ou None si absente."""
+        try:
+            with open(self.path(category, key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, category, key, data):
+        _write_atomic(self.path(category, key), data)
+
+    def put_many(self, items):
+        """Ecrit une liste de (category, key, data)."""
+        for category, key, data in items:
+            self.put(category, key, data)
+
+    def keys(self, category):
+        ext = _extension(category)
+        directory = os.path.join(self.cache_dir, category)
+        return sorted(name[:-len(ext)] for name in os.listdir(directory) if name.endswith(ext))
+
+    @contextlib.contextmanager
+    def batch(self):
+        yield self
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """Toutes les entrees dans une base SQLite (WAL), une connexion par thread."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path, timeout=10.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.created = not os.path.exists(db_path)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " category TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " data BLOB NOT NULL,"
+            " PRIMARY KEY (category, key)"
+            ") WITHOUT ROWID"
+        )
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, category, key):
+        """Retourne les octets de l'entree ou None si absente (une lecture indexee)."""
+        row = self._connection().execute(
+            "SELECT data FROM entries WHERE category = ? AND key = ?", (category, key)
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def put(self, category, key, data):
+        self.put_many([(category, key, data)])
+
+    def put_many(self, items):
+        """Ecrit une liste de (category, key, data) dans une seule transaction."""
+        conn = self._connection()
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (category, key, data) VALUES (?, ?, ?)",
+            [(category, key, sqlite3.Binary(data)) for category, key, data in items],
+        )
+        if self._local.depth == 0:
+            conn.commit()
+
+    def keys(self, category):
+        rows = self._connection().execute(
+            "SELECT key FROM entries WHERE category = ? ORDER BY key", (category,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Regroupe les ecritures du thread courant dans une transaction."""
+        conn = self._connection()
+        self._local.depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.rollback()
+            raise
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            conn.commit()
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def make_backend(cache_dir, backend=CACHE_BACKEND):
+    """Cree le backend demande ("sqlite" ou "files")."""
+    if backend == "sqlite":
+        os.makedirs(cache_dir, exist_ok=True)
+        return SQLiteBackend(os.path.join(cache_dir, SQLITE_FILENAME))
+    if backend == "files":
+        return FileBackend(cache_dir)
+    raise ValueError(f"Backend de cache inconnu : {backend}")
+
+
+def import_tree(cache_dir, backend):
+    """Copie l'arborescence fichier (un fichier par entree) dans le backend.
 
-    def _ensure_dirs(self):
-        """Cree les sous-dossiers de cache si necessaire."""
-        for sub in ("pokemon", "moves", "types", "sprites"):
-            os.makedirs(os.path.join(self.cache_dir, sub), exist_ok=True)
+    Tout est ecrit dans une seule transaction. Retourne {category: nombre}.
+    """
+    files = FileBackend(cache_dir)
+    counts = {}
+    with backend.batch():
+        for category in JSON_CATEGORIES + (SPRITE_CATEGORY,):
+            items = []
+            for key in files.keys(category):
+                data = files.get(category, key)
+                if data is not None:
+                    items.append((category, key, data))
+            backend.put_many(items)
+            counts[category] = len(items)
+    return counts
+
+
+class MemoryLRU:
+    """Cache memoire LRU borne en nombre d'entrees et en octets.
+
+    La taille d'une entree est celle de son encodage sur disque. Compte les
+    hits, misses et evictions. Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, max_entries=CACHE_MEMORY_ENTRIES, max_bytes=CACHE_MEMORY_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # cle -> (valeur, taille)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def get(self, key):
+        """Retourne (True, valeur) si present (devient le plus recent), sinon (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value, size):
+        """Ajoute ou remplace une entree puis evince les plus anciennes si besoin."""
+        if size > self.max_bytes or self.max_entries <= 0:
+            self.invalidate(key)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def put_if_absent(self, key, value, size):
+        """Comme put, mais seulement si la cle n'est pas deja presente (verifie sous le verrou).
+
+        Pour memoriser un resultat lu sans verrou (absence sur disque...) sans
+        ecraser une valeur ecrite entre-temps par un autre thread.
+        """
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Compteurs et occupation du cache."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class Cache:
+    """Cache les donnees API (JSON) et les sprites (PNG) via un backend.
+
+    Les donnees JSON renvoyees sont partagees par le niveau memoire :
+    a ne pas modifier.
+    """
+
+    def __init__(self, cache_dir, backend=CACHE_BACKEND,
+                 memory_entries=CACHE_MEMORY_ENTRIES, memory_bytes=CACHE_MEMORY_BYTES,
+                 bundle=None):
+        """
+        Args:
+            cache_dir: dossier du cache
+            backend: "sqlite" (par defaut, voir config.CACHE_BACKEND) ou "files"
+            memory_entries: nombre max d'entrees JSON gardees en memoire (0 = desactive)
+            memory_bytes: taille max (octets encodes) du niveau memoire
+            bundle: AssetBundle en lecture seule consulte avant le backend (optionnel)
+        """
+        self.cache_dir = cache_dir
+        self.memory = MemoryLRU(memory_entries, memory_bytes)
+        self.bundle = bundle
+        self.sprites_dir = os.path.join(cache_dir, SPRITE_CATEGORY)
+        os.makedirs(self.sprites_dir, exist_ok=True)
+        self.backend = make_backend(cache_dir, backend)
+
+        # Premiere ouverture de la base : reprendre le cache fichier existant
+        if getattr(self.backend, "created", False):
+            import_tree(cache_dir, self.backend)
 
     def get_json(self, category, key):
-        """Retourne les donnees JSON cachees ou None si absentes."""
-        path = os.path.join(self.cache_dir, category, f"{key}.json")
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return None
+        """Retourne les donnees JSON cachees ou None si absentes (memoire, archive puis disque)."""
+        found, value = self.memory.get((category, key))
+        if found:
+            return value
+        data = self.bundle.get(category, key) if self.bundle else None
+        if data is None:
+            data = self.backend.get(category, key)
+        if data is None:
+            # Absence memorisee aussi (save_json la remplacera), sauf si un
+            # autre thread a sauvegarde la valeur pendant la lecture
+            self.memory.put_if_absent((category, key), None, 0)
+            return None
+        value = json.loads(data)
+        self.memory.put((category, key), value, len(data))
+        return value
 
     def save_json(self, category, key, data):
         """Sauvegarde des donnees JSON dans le cache."""
-        path = os.path.join(self.cache_dir, category, f"{key}.json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False)
+        encoded = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.backend.put(category, key, encoded)
+        self.memory.put((category, key), data, len(encoded))
+
+    def batch(self):
+        """Contexte regroupant plusieurs sauvegardes en une transaction."""
+        return self.backend.batch()
 
     def get_sprite_path(self, pokemon_id, side="front"):
-        """Retourne le chemin du sprite cache ou None si absent."""
-        filename = f"{pokemon_id}_{side}.png"
-        path = os.path.join(self.cache_dir, "sprites", filename)
+        """Retourne le chemin du sprite cache ou None si absent.
+
+        Les sprites sont charges par chemin (pygame) : avec le backend SQLite,
+        le fichier est extrait de la base au premier acces. Le resultat
+        (chemin ou absence) est garde dans le niveau memoire.
+        """
+        key = f"{pokemon_id}_{side}"
+        found, path = self.memory.get((SPRITE_CATEGORY, key))
+        if found:
+            return path
+        path = self._find_sprite(key)
+        self.memory.put_if_absent((SPRITE_CATEGORY, key), path, len(path) if path else 0)
+        return path
+
+    def _find_sprite(self, key):
+        path = os.path.join(self.sprites_dir, f"{key}.png")
         if os.path.exists(path):
             return path
-        return None
+        image_bytes = self.bundle.get(SPRITE_CATEGORY, key) if self.bundle else None
+        if image_bytes is None and not isinstance(self.backend, FileBackend):
+            image_bytes = self.backend.get(SPRITE_CATEGORY, key)
+        if image_bytes is None:
+            return None
+        _write_atomic(path, image_bytes)
+        return path
 
     def save_sprite(self, pokemon_id, side, image_bytes):
         """Sauvegarde un sprite PNG et retourne son chemin."""
-        filename = f"{pokemon_id}_{side}.png"
-        path = os.path.join(self.cache_dir, "sprites", filename)
-        with open(path, "wb") as f:
-            f.write(image_bytes)
+        key = f"{pokemon_id}_{side}"
+        path = os.path.join(self.sprites_dir, f"{key}.png")
+        if not isinstance(self.backend, FileBackend):
+            self.backend.put(SPRITE_CATEGORY, key, image_bytes)
+        _write_atomic(path, image_bytes)
+        self.memory.put((SPRITE_CATEGORY, key), path, len(path))
         return path
+
+    def stats(self):
+        """Compteurs du niveau memoire (hits, misses, evictions, occupation)."""
+        return self.memory.stats()
+
+    def close(self):
+        self.backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outils du cache API")
+    parser.add_argument("command", choices=("import", "stats"),
+                        help="import : copie cache/ dans la base SQLite ; stats : contenu de la base")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    backend = make_backend(args.cache_dir, "sqlite")
+    if args.command == "import":
+        counts = import_tree(args.cache_dir, backend)
+    else:
+        counts = {c: len(backend.keys(c)) for c in JSON_CATEGORIES + (SPRITE_CATEGORY,)}
+    total = sum(counts.values())
+    details = ", ".join(f"{category} {count}" for category, count in counts.items())
+    print(f"{backend.db_path} : {total} entrees ({details})")
+    backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 """Client API pour Pokemon - Lit d'abord la BDD locale (bdd/), puis PokeAPI en fallback."""
 
-import json
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import requests
 
-from config import API_BASE_URL, SPRITE_URL_FRONT, SPRITE_URL_BACK, CACHE_DIR, DEFAULT_LEVEL, BASE_DIR
+from config import (API_BASE_URL, SPRITE_URL_FRONT, SPRITE_URL_BACK, CACHE_DIR, DEFAULT_LEVEL,
+                    API_MAX_WORKERS)
+from api.asset_bundle import get_asset_bundle
 from api.cache import Cache
+from api.game_data import get_game_data
 from models.move import Move
 from models.pokemon import Pokemon
 from models.evolution import EvolutionManager
@@ -14,26 +18,33 @@ from models.evolution import EvolutionManager
 class APIClient:
     """Recupere les donnees Pokemon depuis la BDD locale ou PokeAPI avec mise en cache."""
 
-    def __init__(self):
+    def __init__(self, offline=False, game_data=None, max_workers=API_MAX_WORKERS):
+        """
+        Args:
+            offline: si True, n'utilise que la BDD locale et le cache disque
+                     (aucun appel reseau, sprites absents = None)
+            game_data: referentiel GameData (celui du processus si None)
+            max_workers: taille du pool de threads des requetes paralleles
+        """
         self.base_url = API_BASE_URL
-        self.cache = Cache(CACHE_DIR)
+        self.cache = Cache(CACHE_DIR, bundle=get_asset_bundle())
         self.session = requests.Session()
+        self.offline = offline
+        self.game_data = game_data if game_data is not None else get_game_data()
 
-        # Charger la BDD locale de Manon
-        self.local_pokemon_db = self._load_local_pokemon_db()
+        # Pool borne pour les requetes paralleles (cree au premier besoin) et
+        # requetes en cours, dedupliquees par cle
+        self.max_workers = max_workers
+        self._executor = None
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
 
         self.evolution_manager = EvolutionManager()
 
-    def _load_local_pokemon_db(self):
-        """Charge bdd/pokemon.json en memoire. Retourne un dict {id: pokemon_data}."""
-        db_path = os.path.join(BASE_DIR, "bdd", "pokemon.json")
-        if os.path.exists(db_path):
-            with open(db_path, "r", encoding="utf-8") as f:
-                pokemon_list = json.load(f)
-            # Indexer par ID pour acces rapide
-            return {p["id"]: p for p in pokemon_list}
-        print("ATTENTION: bdd/pokemon.json introuvable, fallback sur API")
-        return {}
+    @property
+    def local_pokemon_db(self):
+        """BDD locale de Manon (GameData partage) : se lit comme un dict {id: pokemon_data}."""
+        return self.game_data
 
     def fetch_pokemon_data(self, pokemon_id):
         """Recupere les donnees brutes d'un Pokemon (BDD locale > cache > API)."""
@@ -48,6 +59,9 @@ class APIClient:
         if cached:
             return cached
 
+        if self.offline:
+            raise LookupError(f"Pokemon {pokemon_id} absent de la BDD locale et du cache")
+
         # 3. Fallback: appeler l'API
         url = f"{self.base_url}/pokemon/{pokemon_id}"
         response = self.session.get(url, timeout=15)
@@ -106,6 +120,9 @@ class APIClient:
         if cached:
             return cached
 
+        if self.offline:
+            raise LookupError(f"Attaque '{move_name}' absente du cache")
+
         url = f"{self.base_url}/move/{move_name}"
         response = self.session.get(url, timeout=15)
         response.raise_for_status()
@@ -140,6 +157,9 @@ class APIClient:
         if cached_path:
             return cached_path
 
+        if self.offline:
+            return None
+
         if side == "front":
             url = SPRITE_URL_FRONT.format(id=pokemon_id)
         else:
@@ -203,6 +223,56 @@ class APIClient:
 
         return pokemon
 
+    def build_team(self, pokemon_ids, level=DEFAULT_LEVEL):
+        """Construit une equipe : une liste de Pokemon dans l'ordre de pokemon_ids.
+
+        Les donnees Pokemon, les donnees des moves candidats et les sprites de
+        tous les membres sont recuperes en parallele sur le pool (une seule
+        requete par ressource, meme si plusieurs membres la partagent). Les
+        Pokemon sont ensuite assembles par build_pokemon depuis le cache.
+        """
+        pokemon_ids = list(pokemon_ids)
+        unique_ids = list(dict.fromkeys(pokemon_ids))
+
+        data_futures = [self._submit(("pokemon", pid), self.fetch_pokemon_data, pid)
+                        for pid in unique_ids]
+        sprite_futures = [self._submit(("sprite", pid, side), self.download_sprite, pid, side)
+                          for pid in unique_ids for side in ("front", "back")]
+
+        move_futures = []
+        for future in data_futures:
+            if future.exception() is not None:
+                continue
+            data = future.result()
+            for move_name in self._candidate_move_names(data["moves"], level):
+                move_futures.append(self._submit(("move", move_name), self.fetch_move_data, move_name))
+
+        # Les erreurs reapparaissent (ou sont ignorees) dans build_pokemon comme avant
+        wait(sprite_futures + move_futures)
+
+        return [self.build_pokemon(pid, level) for pid in pokemon_ids]
+
+    def _submit(self, key, fn, *args):
+        """Lance fn(*args) sur le pool, ou rejoint la requete deja en cours pour cette cle."""
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="api"
+                )
+            future = self._executor.submit(fn, *args)
+            self._in_flight[key] = future
+
+        def _done(_future):
+            with self._in_flight_lock:
+                if self._in_flight.get(key) is _future:
+                    del self._in_flight[key]
+
+        future.add_done_callback(_done)
+        return future
+
     def get_pokemon_preview(self, pokemon_id):
         """Recupere les infos de base pour l'ecran de selection."""
         data = self.fetch_pokemon_data(pokemon_id)
@@ -215,22 +285,25 @@ class APIClient:
             "stats": data["stats"],
         }
 
-    def _select_moves(self, available_moves, pokemon_types, level):
-        """Selectionne les 4 meilleures attaques pour un Pokemon."""
+    def _candidate_move_names(self, available_moves, level):
+        """Noms des moves candidats (apprenables a ce niveau) pour _select_moves."""
         # Filtrer par niveau
         eligible = [m for m in available_moves if m["level"] <= level]
         if not eligible:
             eligible = available_moves[:10] if available_moves else []
+        return [m["name"] for m in eligible]
 
+    def _select_moves(self, available_moves, pokemon_types, level):
+        """Selectionne les 4 meilleures attaques pour un Pokemon."""
         # Recuperer les donnees de tous les moves candidats
         move_details = []
-        for move_entry in eligible:
+        for move_name in self._candidate_move_names(available_moves, level):
             try:
-                data = self.fetch_move_data(move_entry["name"])
+                data = self.fetch_move_data(move_name)
                 if data["power"] > 0:
                     is_stab = data["type"] in pokemon_types
                     score = data["power"] * (1.5 if is_stab else 1.0)
-                    move_details.append((move_entry["name"], data, score, is_stab))
+                    move_details.append((move_name, data, score, is_stab))
             except Exception:
                 continue
 
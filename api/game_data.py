@@ -0,0 +1,160 @@
+"""Referentiel des donnees de jeu (especes Pokemon) partage par tout le processus.
+
+GameData est cree par main.Game et partage via StateManager.game_data : les
+etats et l'APIClient n'ont plus chacun leur copie de la BDD.
+
+Index :
+    - id -> espece et nom -> espece (dicts, construits au chargement)
+    - alias de noms ("ratata" -> "rattata") pour les noms venant des cartes
+    - type -> especes et move -> especes qui l'apprennent (construits au premier appel)
+
+Les noms sont compares sans casse ni accents : "Salameche" trouve "salamèche".
+"""
+
+import threading
+import unicodedata
+
+from api.pokedex_db import get_pokedex_db
+
+
+# Noms alternatifs (deja normalises) -> nom de la BDD
+ALIASES = {
+    "ratata": "rattata",
+}
+
+
+def normalize_name(name):
+    """Cle de recherche d'un nom : minuscules, sans accents ni espaces autour."""
+    name = unicodedata.normalize("NFKD", name.strip().lower())
+    return "".join(ch for ch in name if not unicodedata.combining(ch))
+
+
+class GameData:
+    """Especes Pokemon indexees par id, nom, type et move.
+
+    Se lit aussi comme un dict {id: espece} (remplace APIClient.local_pokemon_db).
+    Les especes sont les dicts de la BDD compilee : a ne pas modifier.
+    """
+
+    def __init__(self, aliases=None):
+        self.aliases = dict(ALIASES)
+        if aliases:
+            self.aliases.update({normalize_name(k): v for k, v in aliases.items()})
+
+        self._db = None
+        self._species = []
+        self._by_id = {}
+        self._by_name = {}
+        self._by_type = None
+        self._by_move = None
+        self._lock = threading.Lock()
+        self._refresh()
+
+    # ------------------------------------------------------------------
+    # Especes
+    # ------------------------------------------------------------------
+
+    def all_species(self):
+        """Toutes les especes, triees par id."""
+        self._refresh()
+        return self._species
+
+    def species(self, pokemon_id):
+        """Espece par id, ou None."""
+        self._refresh()
+        return self._by_id.get(pokemon_id)
+
+    def species_by_name(self, name):
+        """Espece par nom (sans casse ni accents, alias compris), ou None."""
+        self._refresh()
+        key = normalize_name(name)
+        key = normalize_name(self.aliases.get(key, key))
+        return self._by_name.get(key)
+
+    def add_alias(self, alias, name):
+        """Declare un nom alternatif pour une espece."""
+        self.aliases[normalize_name(alias)] = name
+
+    def species_of_type(self, type_name):
+        """Especes ayant ce type (index construit au premier appel)."""
+        self._refresh()
+        if self._by_type is None:
+            with self._lock:
+                if self._by_type is None:
+                    index = {}
+                    for species in self._species:
+                        for t in species["types"]:
+                            index.setdefault(t, []).append(species)
+                    self._by_type = index
+        return self._by_type.get(type_name, [])
+
+    def learners_of(self, move_name):
+        """Especes qui apprennent ce move (index construit au premier appel)."""
+        self._refresh()
+        if self._by_move is None:
+            with self._lock:
+                if self._by_move is None:
+                    index = {}
+                    for species in self._species:
+                        for move in species.get("moves", []):
+                            index.setdefault(move, []).append(species)
+                    self._by_move = index
+        return self._by_move.get(move_name, [])
+
+    # ------------------------------------------------------------------
+    # Protocole dict {id: espece} (lecture seule)
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        self._refresh()
+        return len(self._species)
+
+    def __iter__(self):
+        self._refresh()
+        return iter(self._by_id)
+
+    def __contains__(self, pokemon_id):
+        self._refresh()
+        return pokemon_id in self._by_id
+
+    def __getitem__(self, pokemon_id):
+        self._refresh()
+        return self._by_id[pokemon_id]
+
+    def get(self, pokemon_id, default=None):
+        species = self.species(pokemon_id)
+        return default if species is None else species
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+
+    def _refresh(self):
+        """Reconstruit les index si la BDD partagee a ete rechargee (ajout d'un Pokemon)."""
+        db = get_pokedex_db()
+        if db is self._db:
+            return
+        with self._lock:
+            if db is self._db:
+                return
+            species = db.all()
+            self._species = species
+            self._by_id = {s["id"]: s for s in species}
+            self._by_name = {normalize_name(s["name"]): s for s in species}
+            self._by_type = None
+            self._by_move = None
+            self._db = db
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_game_data():
+    """Referentiel partage du processus (cree au premier appel, normalement par main.Game)."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = GameData()
+    return _shared
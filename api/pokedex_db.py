@@ -0,0 +1,347 @@
+"""BDD Pokemon compilee : bdd/pokemon.json -> bdd/pokemon.bin.
+
+bdd/pokemon.json reste la source editable (AddPokemonState l'enrichit).
+Ce module la compile en un binaire compact, relu d'un bloc (aucun parsing :
+les fiches sont decodees a la demande) et partage par tout le processus via
+get_pokedex_db() : plus aucun etat ne reparse le JSON.
+
+Format (little-endian) :
+    en-tete   : magic "PKDX", version, nb de fiches, nb de chaines,
+                taille + mtime du JSON source (detection d'un binaire perime)
+    chaines   : table des offsets (nb + 1 entiers u32) puis les chaines UTF-8
+                (noms, types, moves, sprites : chaque chaine n'est stockee qu'une fois)
+    fiches    : enregistrements de taille fixe, tries par id
+    index nom : numeros de fiche tries par nom (recherche par bisection)
+
+Usage :
+    python -m api.pokedex_db          # (re)compile bdd/pokemon.bin
+"""
+
+import bisect
+import json
+import os
+import struct
+import sys
+import threading
+
+from config import BASE_DIR
+
+
+DB_JSON_PATH = os.path.join(BASE_DIR, "bdd", "pokemon.json")
+DB_BIN_PATH = os.path.join(BASE_DIR, "bdd", "pokemon.bin")
+
+MAGIC = b"PKDX"
+FORMAT_VERSION = 1
+
+STAT_KEYS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+SPRITE_KEYS = ("front_default", "back_default", "front_shiny", "official_artwork")
+MAX_TYPES = 2
+MAX_MOVES = 4
+
+# Valeur sentinelle : type, sprite, move ou mesure absent
+NONE = 0xFFFFFFFF
+
+# magic, version, reserve, nb fiches, nb chaines, taille source, mtime source (ns)
+_HEADER = struct.Struct("<4sHHIIqq")
+# id, nom, types, stats, sprites, nb moves, moves, poids, taille
+_RECORD = struct.Struct(
+    f"<II{MAX_TYPES}I{len(STAT_KEYS)}H{len(SPRITE_KEYS)}IB{MAX_MOVES}III"
+)
+_OFFSET = struct.Struct("<I")
+_INDEX = struct.Struct("<H")
+
+# Positions des champs dans le tuple d'un enregistrement
+_F_ID = 0
+_F_NAME = 1
+_F_TYPES = 2
+_F_STATS = _F_TYPES + MAX_TYPES
+_F_SPRITES = _F_STATS + len(STAT_KEYS)
+_F_MOVE_COUNT = _F_SPRITES + len(SPRITE_KEYS)
+_F_MOVES = _F_MOVE_COUNT + 1
+_F_WEIGHT = _F_MOVES + MAX_MOVES
+_F_HEIGHT = _F_WEIGHT + 1
+
+
+# ----------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------
+
+def _source_signature(json_path):
+    stat = os.stat(json_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def compile_pokedex(pokemon_list, source_signature=(0, 0)):
+    """Compile la liste de bdd/pokemon.json en binaire. Retourne les octets.
+
+    Raises:
+        ValueError: si une fiche depasse le format (plus de 2 types, 4 moves...)
+    """
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        if value is None:
+            return NONE
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(strings)
+            strings.append(value)
+        return index
+
+    records = []
+    for pokemon in sorted(pokemon_list, key=lambda p: p["id"]):
+        types = pokemon.get("types", [])
+        moves = pokemon.get("moves", [])
+        if len(types) > MAX_TYPES or len(moves) > MAX_MOVES:
+            raise ValueError(f"Pokemon {pokemon['id']} : {len(types)} types / {len(moves)} moves "
+                             f"(max {MAX_TYPES} / {MAX_MOVES})")
+        sprites = pokemon.get("sprites", {})
+        record = _RECORD.pack(
+            pokemon["id"],
+            intern(pokemon["name"]),
+            *[intern(types[k]) if k < len(types) else NONE for k in range(MAX_TYPES)],
+            *[pokemon["stats"][key] for key in STAT_KEYS],
+            *[intern(sprites.get(key)) for key in SPRITE_KEYS],
+            len(moves),
+            *[intern(moves[k]) if k < len(moves) else NONE for k in range(MAX_MOVES)],
+            pokemon.get("weight", NONE),
+            pokemon.get("height", NONE),
+        )
+        records.append((pokemon["name"], record))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    name_order = sorted(range(len(records)), key=lambda i: records[i][0])
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records), len(strings), *source_signature)]
+    parts.extend(_OFFSET.pack(offset) for offset in offsets)
+    parts.extend(encoded)
+    parts.extend(record for _, record in records)
+    parts.extend(_INDEX.pack(i) for i in name_order)
+    return b"".join(parts)
+
+
+def build_pokedex(json_path=DB_JSON_PATH, bin_path=DB_BIN_PATH):
+    """Compile le JSON vers le fichier binaire (ecriture atomique). Retourne les octets."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        pokemon_list = json.load(f)
+    data = compile_pokedex(pokemon_list, _source_signature(json_path))
+
+    tmp_path = bin_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, bin_path)
+    return data
+
+
+# ----------------------------------------------------------------------
+# Lecture
+# ----------------------------------------------------------------------
+
+class PokedexDB:
+    """Acces en lecture a la BDD compilee, sans parser de JSON.
+
+    Se comporte comme un dict {id: fiche} en lecture seule. Chaque fiche est
+    un dict neuf au meme format que bdd/pokemon.json.
+    """
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer: octets du binaire
+
+        Raises:
+            ValueError: si le buffer n'est pas une BDD compilee de cette version
+        """
+        self._buffer = buffer
+        magic, version, _, count, string_count, size, mtime = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("BDD Pokemon compilee invalide ou d'une autre version")
+        self.source_signature = (size, mtime)
+        self._count = count
+
+        offsets_start = _HEADER.size
+        strings_start = offsets_start + (string_count + 1) * _OFFSET.size
+        self._string_offsets = struct.unpack_from(f"<{string_count + 1}I", buffer, offsets_start)
+        self._strings_start = strings_start
+        self._strings = [None] * string_count
+
+        self._records_start = strings_start + self._string_offsets[-1]
+        index_start = self._records_start + count * _RECORD.size
+        self._name_order = struct.unpack_from(f"<{count}H", buffer, index_start)
+
+        # Index id -> numero de fiche (les fiches sont triees par id)
+        self._ids = [
+            struct.unpack_from("<I", buffer, self._records_start + i * _RECORD.size)[0]
+            for i in range(count)
+        ]
+        self._names = None
+        self._all = None
+
+    @classmethod
+    def open(cls, path=DB_BIN_PATH):
+        """Lit un fichier compile.
+
+        Lu d'un bloc plutot que par mmap : le fichier ne pese que quelques
+        dizaines de Ko et un mmap ouvert empecherait de le remplacer sous
+        Windows quand AddPokemonState le recompile.
+        """
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    # -- Protocole dict (lecture seule) --------------------------------
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __contains__(self, pokemon_id):
+        return self._position(pokemon_id) is not None
+
+    def __getitem__(self, pokemon_id):
+        position = self._position(pokemon_id)
+        if position is None:
+            raise KeyError(pokemon_id)
+        return self._decode(position)
+
+    def get(self, pokemon_id, default=None):
+        """Fiche d'un Pokemon par id (dict neuf), ou default."""
+        position = self._position(pokemon_id)
+        return default if position is None else self._decode(position)
+
+    def ids(self):
+        """IDs tries."""
+        return list(self._ids)
+
+    # -- Recherches ----------------------------------------------------
+
+    def find_by_name(self, name):
+        """Fiche d'un Pokemon par nom exact (tel que dans la BDD), ou None."""
+        if self._names is None:
+            self._names = [self._read_name(i) for i in self._name_order]
+        k = bisect.bisect_left(self._names, name)
+        if k < len(self._names) and self._names[k] == name:
+            return self._decode(self._name_order[k])
+        return None
+
+    def all(self):
+        """Toutes les fiches, triees par id (liste partagee : ne pas modifier)."""
+        if self._all is None:
+            self._all = [self._decode(i) for i in range(self._count)]
+        return self._all
+
+    # -- Interne -------------------------------------------------------
+
+    def _position(self, pokemon_id):
+        k = bisect.bisect_left(self._ids, pokemon_id)
+        if k < self._count and self._ids[k] == pokemon_id:
+            return k
+        return None
+
+    def _string(self, index):
+        if index == NONE:
+            return None
+        value = self._strings[index]
+        if value is None:
+            start = self._strings_start + self._string_offsets[index]
+            end = self._strings_start + self._string_offsets[index + 1]
+            value = sys.intern(self._buffer[start:end].decode("utf-8"))
+            self._strings[index] = value
+        return value
+
+    def _read_name(self, position):
+        offset = self._records_start + position * _RECORD.size + _OFFSET.size
+        return self._string(_OFFSET.unpack_from(self._buffer, offset)[0])
+
+    def _decode(self, position):
+        fields = _RECORD.unpack_from(self._buffer, self._records_start + position * _RECORD.size)
+        string = self._string
+
+        sprites = {}
+        for key, index in zip(SPRITE_KEYS, fields[_F_SPRITES:_F_MOVE_COUNT]):
+            if index != NONE:
+                sprites[key] = string(index)
+
+        pokemon = {
+            "id": fields[_F_ID],
+            "name": string(fields[_F_NAME]),
+            "types": [string(i) for i in fields[_F_TYPES:_F_STATS] if i != NONE],
+            "stats": dict(zip(STAT_KEYS, fields[_F_STATS:_F_SPRITES])),
+            "sprites": sprites,
+            "moves": [string(i) for i in fields[_F_MOVES:_F_MOVES + fields[_F_MOVE_COUNT]]],
+        }
+        if fields[_F_WEIGHT] != NONE:
+            pokemon["weight"] = fields[_F_WEIGHT]
+        if fields[_F_HEIGHT] != NONE:
+            pokemon["height"] = fields[_F_HEIGHT]
+        return pokemon
+
+
+# ----------------------------------------------------------------------
+# Chargeur partage
+# ----------------------------------------------------------------------
+
+_shared_db = None
+_shared_lock = threading.Lock()
+
+
+def _load(json_path=DB_JSON_PATH, bin_path=DB_BIN_PATH):
+    """Ouvre le binaire, le recompile s'il est absent ou plus vieux que le JSON."""
+    if not os.path.exists(json_path):
+        if os.path.exists(bin_path):
+            return PokedexDB.open(bin_path)
+        print("ATTENTION: bdd/pokemon.json introuvable, fallback sur API")
+        return PokedexDB(compile_pokedex([]))
+
+    signature = _source_signature(json_path)
+    if os.path.exists(bin_path):
+        try:
+            db = PokedexDB.open(bin_path)
+            if db.source_signature == signature:
+                return db
+        except (OSError, ValueError):
+            pass
+
+    try:
+        build_pokedex(json_path, bin_path)
+        return PokedexDB.open(bin_path)
+    except OSError as e:
+        # Dossier en lecture seule : compilation en memoire
+        print(f"[PokedexDB] Ecriture de {bin_path} impossible ({e}), BDD compilee en memoire")
+        with open(json_path, "r", encoding="utf-8") as f:
+            return PokedexDB(compile_pokedex(json.load(f), signature))
+
+
+def get_pokedex_db():
+    """BDD Pokemon partagee par tout le processus (chargee au premier appel)."""
+    global _shared_db
+    if _shared_db is None:
+        with _shared_lock:
+            if _shared_db is None:
+                _shared_db = _load()
+    return _shared_db
+
+
+def reload_pokedex_db():
+    """Recompile et recharge la BDD partagee (apres modification de bdd/pokemon.json)."""
+    global _shared_db
+    with _shared_lock:
+        _shared_db = _load()
+    return _shared_db
+
+
+def main():
+    data = build_pokedex()
+    db = PokedexDB(data)
+    print(f"{DB_BIN_PATH} : {len(db)} Pokemon, {len(data)} octets "
+          f"(JSON : {os.path.getsize(DB_JSON_PATH)} octets)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
-"""Intelligence artificielle pour le combat Pokemon - 3 niveaux de difficulte."""
+"""Intelligence artificielle pour le combat Pokemon - 4 niveaux de difficulte."""
 
 import random
 
+from battle.damage_calculator import DamageCalculator
+from battle.search import (ExpectiminimaxSearch, ACTION_SWITCH,
+                           DEFAULT_MAX_PLIES, DEFAULT_TIME_BUDGET_MS)
+
 
 # Constante pour signaler un switch volontaire
 AI_SWITCH = "AI_SWITCH"
@@ -14,13 +18,30 @@ class AIOpponent:
     - "facile"    : choix souvent aleatoire, pas de switch strategique
     - "normal"    : favorise le meilleur move, switch apres KO par matchup de type
     - "difficile" : toujours le meilleur move, switch volontaire strategique
+    - "expert"    : recherche expectiminimax sur 2 a 4 plies (moves, switchs, remplacants)
     """
 
-    def __init__(self, pokemon, type_chart, difficulty="normal", team=None):
+    def __init__(self, pokemon, type_chart, difficulty="normal", team=None,
+                 opponent_team=None, search_plies=DEFAULT_MAX_PLIES,
+                 search_budget_ms=DEFAULT_TIME_BUDGET_MS):
+        """
+        Args:
+            opponent_team: equipe adverse, utilisee par la recherche "expert"
+            search_plies: profondeur de recherche "expert" (2 plies = 1 tour)
+            search_budget_ms: budget de temps par decision "expert" (None = illimite)
+        """
         self.pokemon = pokemon
         self.type_chart = type_chart
         self.difficulty = difficulty
         self.team = team  # equipe complete pour le switch strategique
+        self.opponent_team = opponent_team
+        self.damage_calc = DamageCalculator(type_chart)
+
+        self.search = None
+        if difficulty == "expert":
+            self.search = ExpectiminimaxSearch(
+                type_chart, max_plies=search_plies, time_budget_ms=search_budget_ms
+            )
 
     # ------------------------------------------------------------------
     # API publique
@@ -33,6 +54,14 @@ class AIOpponent:
             (move, None)          -> l'IA attaque avec ce move
             (AI_SWITCH, pokemon)  -> l'IA veut switcher vers ce pokemon
         """
+        if self.search:
+            decision = self._search_decision(opponent, switchable_pokemon)
+            if decision:
+                kind, target = decision
+                if kind == ACTION_SWITCH:
+                    return AI_SWITCH, target
+                return target, None
+
         if self.difficulty == "difficile" and switchable_pokemon:
             switch_target = self._should_switch(opponent, switchable_pokemon)
             if switch_target:
@@ -43,6 +72,11 @@ class AIOpponent:
 
     def choose_move(self, opponent):
         """Choisit une attaque contre l'adversaire selon la difficulte."""
+        if self.search:
+            decision = self._search_decision(opponent, None)
+            if decision:
+                return decision[1]
+
         available_moves = [m for m in self.pokemon.moves if m.has_pp()]
 
         if not available_moves:
@@ -69,10 +103,31 @@ class AIOpponent:
             else:
                 return random.choice(available_moves)
 
-        else:  # difficile
+        else:  # difficile (et repli de l'expert)
             # Toujours le meilleur move
             return scored_moves[0][0]
 
+    def ponder(self):
+        """Reflexion en arriere-plan pendant les animations (rien a faire ici, cf. MCTSOpponent)."""
+
+    def stop(self):
+        """Arrete la reflexion en arriere-plan (cf. MCTSOpponent)."""
+
+    def _search_decision(self, opponent, switchable_pokemon):
+        """Lance la recherche expectiminimax (None si elle ne peut pas decider)."""
+        if not self.team:
+            return None
+        return self.search.choose(
+            self.team, self.pokemon, self._known_opponents(opponent), opponent, switchable_pokemon
+        )
+
+    def _known_opponents(self, opponent):
+        """Equipe adverse pour la recherche ([opponent] si elle est inconnue)."""
+        opponent_team = self.opponent_team
+        if not opponent_team or opponent not in opponent_team:
+            opponent_team = [opponent]
+        return opponent_team
+
     def choose_switch_after_ko(self, alive_pokemon, opponent):
         """Choisit le Pokemon a envoyer apres un KO selon la difficulte."""
         if not alive_pokemon:
@@ -81,6 +136,14 @@ class AIOpponent:
         if self.difficulty == "facile":
             return random.choice(alive_pokemon)
 
+        if self.search and self.team:
+            # Expert : le remplacant qui donne la meilleure valeur de recherche
+            best = self.search.choose_replacement(
+                self.team, alive_pokemon, self._known_opponents(opponent), opponent
+            )
+            if best is not None:
+                return best
+
         # Normal et Difficile : choisir le meilleur matchup de type
         return self._best_matchup(alive_pokemon, opponent)
 
@@ -93,45 +156,56 @@ class AIOpponent:
         if not move.is_damaging():
             return self._score_status_move(move, opponent)
 
+        if self.difficulty in ("difficile", "expert"):
+            return self._score_expected_damage(move, opponent)
+
         power = move.power
         effectiveness = self.type_chart.get_effectiveness(move.move_type, opponent.types)
 
         # Bonus STAB
         stab = 1.5 if move.move_type in self.pokemon.types else 1.0
 
-        base_score = power * effectiveness * stab
+        return power * effectiveness * stab
 
-        if self.difficulty == "difficile":
-            # Bonus si le move peut KO l'adversaire
-            if effectiveness >= 2.0:
-                base_score *= 1.2
-            # Malus si immunite
-            if effectiveness == 0:
-                base_score = 0
+    def _score_expected_damage(self, move, opponent):
+        """Score un move (difficile) par ses degats esperes et sa probabilite de KO.
 
-        return base_score
+        Utilise la distribution exacte des degats (precision, 16 tirages,
+        critique) : score = % de PV adverses retires en moyenne + bonus de KO.
+        Une immunite donne 0.
+        """
+        distribution = self.damage_calc.distribution(self.pokemon, opponent, move)
+        hp = max(1, opponent.current_hp)
+        expected = distribution.expected_damage(cap=hp)
+        ko_chance = distribution.ko_probability(hp)
+        return expected / max(1, opponent.max_hp) * 100 + ko_chance * 100
 
     def _score_status_move(self, move, opponent):
-        """Score un move de statut selon le contexte."""
-        if self.difficulty == "difficile":
+        """Score un move de statut selon le contexte.
+
+        En difficile/expert, le score est un equivalent en % de PV adverses,
+        comparable a celui des attaques (_score_expected_damage) : un bon
+        statut passe devant un coup faible, jamais devant un coup qui porte.
+        """
+        if self.difficulty in ("difficile", "expert"):
             # Les moves de statut sont plus valorises en difficile
             if opponent.status is not None:
-                return 5.0  # L'adversaire a deja un statut, peu utile
+                return 2.0  # L'adversaire a deja un statut, peu utile
             if move.ailment == "paralysis":
                 # Tres utile si l'adversaire est plus rapide
                 if opponent.speed > self.pokemon.speed:
-                    return 60.0
-                return 35.0
+                    return 24.0
+                return 14.0
             if move.ailment == "burn":
                 # Utile contre les attaquants physiques
                 if opponent.attack > opponent.sp_attack:
-                    return 55.0
-                return 30.0
+                    return 22.0
+                return 12.0
             if move.ailment in ("sleep", "freeze"):
-                return 65.0  # Tres puissant
+                return 26.0  # Tres puissant
             if move.ailment == "poison":
-                return 40.0
-            return 25.0
+                return 16.0
+            return 10.0
         else:
             # Facile et Normal : score fixe bas pour les moves de statut
             return 20.0
@@ -191,15 +265,18 @@ class AIOpponent:
         - Les degats que le Pokemon peut infliger (types offensifs)
         - Les degats que le Pokemon subirait (types defensifs)
         """
-        offensive_score = 0.0
-        for poke_type in pokemon.types:
-            eff = self.type_chart.get_effectiveness(poke_type, opponent.types)
-            offensive_score = max(offensive_score, eff)
-
-        defensive_score = 0.0
-        for opp_type in opponent.types:
-            eff = self.type_chart.get_effectiveness(opp_type, pokemon.types)
-            defensive_score = max(defensive_score, eff)
+        # Profils defensifs precalcules par le TypeChart (une lecture par type)
+        opponent_profile = self.type_chart.get_defensive_profile(opponent.types)
+        pokemon_profile = self.type_chart.get_defensive_profile(pokemon.types)
+
+        offensive_score = max(
+            (opponent_profile.get(poke_type, 1.0) for poke_type in pokemon.types),
+            default=0.0,
+        )
+        defensive_score = max(
+            (pokemon_profile.get(opp_type, 1.0) for opp_type in opponent.types),
+            default=0.0,
+        )
 
         # Score final : bon offensivement et resistant defensivement
         if defensive_score == 0:
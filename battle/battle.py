@@ -3,6 +3,7 @@
 import random
 
 from battle.damage_calculator import DamageCalculator
+from battle.snapshot import BattleSnapshot
 from models.combat import Combat
 
 
@@ -40,6 +41,9 @@ class Battle:
         self._p1_switched = False
         self._p2_switched = False
 
+        # Disposition du snapshot, reutilisee tant que les equipes ne changent pas
+        self._snapshot_layout = None
+
     def switch_pokemon(self, player_num, new_pokemon):
         """Change le Pokemon actif d'un joueur. Retourne les messages."""
         messages = []
@@ -59,6 +63,19 @@ class Battle:
 
         return messages
 
+    def snapshot(self):
+        """Capture l'etat dynamique du combat (BattleSnapshot, copie en quelques microsecondes)."""
+        layout = self._snapshot_layout
+        if layout is not None and not layout.matches(self):
+            layout = None
+        snap = BattleSnapshot.from_battle(self, layout)
+        self._snapshot_layout = snap.layout
+        return snap
+
+    def restore(self, snapshot):
+        """Remet le combat dans l'etat d'un snapshot pris sur ce meme combat."""
+        snapshot.apply_to(self)
+
     def execute_turn(self, move1, move2):
         """Execute un tour complet. Retourne la liste des messages."""
         self.turn_number += 1
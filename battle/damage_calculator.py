@@ -2,6 +2,17 @@
 
 import random
 
+import numpy as np
+
+
+# Facteurs aleatoires discrets (16 tirages equiprobables de 85% a 100%)
+RANDOM_ROLLS = tuple(r / 100 for r in range(85, 101))
+CRITICAL_CHANCE = 1 / 16
+
+# Cache des distributions partage par tous les calculateurs (et toutes les IA)
+_distribution_cache = {}
+DISTRIBUTION_CACHE_SIZE = 50000
+
 
 class DamageResult:
     """Resultat d'un calcul de degats."""
@@ -14,6 +25,46 @@ class DamageResult:
         self.move = move
 
 
+class DamageBatchResult:
+    """Resultat d'un calcul de degats vectorise (un tableau par champ, N coups)."""
+
+    def __init__(self, damage, effectiveness, is_critical, is_stab):
+        self.damage = damage                # int64 (N,)
+        self.effectiveness = effectiveness  # float32 (N,)
+        self.is_critical = is_critical      # bool (N,)
+        self.is_stab = is_stab              # bool (N,)
+
+    def __len__(self):
+        return len(self.damage)
+
+
+class DamageDistribution:
+    """Distribution discrete des degats d'une attaque : [(degats, probabilite)].
+
+    Couvre les 16 tirages aleatoires x coup critique ou non, ponderes par la
+    precision (un echec compte comme 0 degat).
+    """
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes  # liste triee par degats croissants
+
+    def expected_damage(self, cap=None):
+        """Degats moyens, eventuellement plafonnes (ex: PV restants de la cible)."""
+        if cap is None:
+            return sum(damage * prob for damage, prob in self.outcomes)
+        return sum(min(damage, cap) * prob for damage, prob in self.outcomes)
+
+    def ko_probability(self, hp):
+        """Probabilite d'infliger au moins hp degats en un coup."""
+        return sum(prob for damage, prob in self.outcomes if damage >= hp)
+
+    def min_damage(self):
+        return self.outcomes[0][0]
+
+    def max_damage(self):
+        return self.outcomes[-1][0]
+
+
 class DamageCalculator:
     """Calcule les degats selon la formule Gen III."""
 
@@ -54,6 +105,143 @@ class DamageCalculator:
 
         return DamageResult(damage, effectiveness, is_crit, stab > 1.0, move)
 
+    def distribution(self, attacker, defender, move):
+        """Retourne la distribution exacte des degats au lieu d'un tirage.
+
+        Le resultat est mis en cache par (stats de l'attaquant, stats du
+        defenseur, move) : niveau, attaque et defense effectives, puissance,
+        precision, STAB et efficacite.
+        """
+        if not move.is_damaging():
+            return DamageDistribution([(0, 1.0)])
+
+        stab = self._get_stab(attacker, move)
+        effectiveness = self._get_type_effectiveness(move, defender)
+        key = (
+            attacker.level,
+            attacker.get_effective_attack(move.category),
+            defender.get_effective_defense(move.category),
+            move.power,
+            move.accuracy,
+            stab,
+            effectiveness,
+        )
+
+        distribution = _distribution_cache.get(key)
+        if distribution is None:
+            if len(_distribution_cache) >= DISTRIBUTION_CACHE_SIZE:
+                _distribution_cache.clear()
+            distribution = self._build_distribution(*key)
+            _distribution_cache[key] = distribution
+        return distribution
+
+    def _build_distribution(self, level, atk, dfn, power, accuracy, stab, effectiveness):
+        """Enumere les 32 issues (16 tirages x critique) d'une attaque qui touche."""
+        hit_chance = min(1.0, accuracy / 100)
+        base = ((2 * level / 5 + 2) * power * atk / max(1, dfn)) / 50 + 2
+
+        probabilities = {}
+        if hit_chance < 1.0:
+            probabilities[0] = 1.0 - hit_chance
+
+        for critical_mult, crit_prob in ((1.0, 1 - CRITICAL_CHANCE), (2.0, CRITICAL_CHANCE)):
+            prob = hit_chance * crit_prob / len(RANDOM_ROLLS)
+            for roll in RANDOM_ROLLS:
+                if effectiveness == 0:
+                    damage = 0
+                else:
+                    damage = max(1, int(base * stab * effectiveness * critical_mult * roll))
+                probabilities[damage] = probabilities.get(damage, 0.0) + prob
+
+        return DamageDistribution(sorted(probabilities.items()))
+
+    def encode_hits(self, hits):
+        """Prepare les tableaux de calculate_batch a partir de (attaquant, defenseur, move).
+
+        Les moves sans degats recoivent une puissance nulle (0 degat dans le lot).
+
+        Returns:
+            dict: arguments nommes pour calculate_batch
+        """
+        type_chart = self.type_chart
+        count = len(hits)
+        levels = np.empty(count, dtype=np.float64)
+        powers = np.empty(count, dtype=np.float64)
+        attacks = np.empty(count, dtype=np.float64)
+        defenses = np.empty(count, dtype=np.float64)
+
+        for i, (attacker, defender, move) in enumerate(hits):
+            levels[i] = attacker.level
+            powers[i] = move.power if move.is_damaging() else 0
+            attacks[i] = attacker.get_effective_attack(move.category)
+            defenses[i] = defender.get_effective_defense(move.category)
+
+        return {
+            "levels": levels,
+            "powers": powers,
+            "attacks": attacks,
+            "defenses": defenses,
+            "move_types": type_chart.encode_types([move.move_type for _, _, move in hits]),
+            "attacker_types": type_chart.encode_defenders([a.types for a, _, _ in hits]),
+            "defender_types": type_chart.encode_defenders([d.types for _, d, _ in hits]),
+        }
+
+    def calculate_batch(self, levels, powers, attacks, defenses, move_types,
+                        attacker_types, defender_types, rng=None):
+        """Calcule N coups en un seul appel vectorise (meme formule Gen III que calculate).
+
+        Args:
+            levels, powers, attacks, defenses: tableaux (N,) des stats effectives
+                (puissance 0 = move sans degats)
+            move_types: tableau (N,) d'index de types (ou noms de types)
+            attacker_types, defender_types: tableaux (N, 2) d'index de types
+                (voir TypeChart.encode_defenders)
+            rng: np.random.Generator, graine entiere ou None
+
+        Returns:
+            DamageBatchResult
+        """
+        rng = np.random.default_rng(rng)
+        type_chart = self.type_chart
+
+        levels = np.asarray(levels, dtype=np.float64)
+        powers = np.asarray(powers, dtype=np.float64)
+        attacks = np.asarray(attacks, dtype=np.float64)
+        defenses = np.asarray(defenses, dtype=np.float64)
+        move_types = np.asarray(move_types)
+        if move_types.dtype.kind not in "iu":
+            move_types = type_chart.encode_types(move_types)
+        attacker_types = np.asarray(attacker_types)
+        defender_types = np.asarray(defender_types)
+        count = len(powers)
+
+        # Formule de base
+        base = ((2 * levels / 5 + 2) * powers * attacks / np.maximum(1, defenses)) / 50 + 2
+
+        # Modificateurs
+        is_stab = ((attacker_types == move_types[:, None]).any(axis=1)
+                   & (move_types != type_chart.neutral_index))
+        stab = np.where(is_stab, 1.5, 1.0)
+        effectiveness = type_chart.get_effectiveness_indices(move_types, defender_types)
+        is_critical = rng.random(count) < 1 / 16
+        critical_mult = np.where(is_critical, 2.0, 1.0)
+        random_factor = rng.uniform(0.85, 1.0, count)
+
+        modifier = stab * effectiveness.astype(np.float64) * critical_mult * random_factor
+        damage = np.maximum(1, (base * modifier).astype(np.int64))
+
+        # Immunite = 0 degats
+        damage[effectiveness == 0] = 0
+
+        # Moves sans degats : resultat neutre comme dans calculate
+        no_damage = powers <= 0
+        damage[no_damage] = 0
+        effectiveness = np.where(no_damage, np.float32(1.0), effectiveness)
+        is_critical &= ~no_damage
+        is_stab &= ~no_damage
+
+        return DamageBatchResult(damage, effectiveness, is_critical, is_stab)
+
     def _get_stab(self, attacker, move):
         """Same Type Attack Bonus : 1.5 si le type du move correspond au Pokemon."""
         if move.move_type in attacker.types:
@@ -0,0 +1,396 @@
+"""IA Monte Carlo Tree Search ("ultime") qui reflechit en arriere-plan.
+
+Les deux camps choisissent leur action en meme temps : l'arbre est un
+arbre "open-loop" a choix decouples (DUCT). Chaque noeud garde, pour chaque
+camp, les visites et la valeur cumulee de ses actions ; a chaque iteration,
+chaque camp choisit son action par UCB1, le tour est resolu par le
+resolveur headless (battle/resolver.py), puis un rollout rapide joue la
+suite du combat. L'etat n'est pas stocke dans l'arbre : chaque iteration
+repart du BattleSnapshot de la racine (quelques microsecondes).
+
+La recherche tourne sur une copie privee du combat, dans un thread, pendant
+l'intro, les messages et le choix du joueur : quand l'IA doit jouer, elle
+n'a plus qu'a lire le resultat (complete au besoin par un court budget).
+
+Limite : les regles du combat tirent dans le module random global, que les
+rollouts partagent donc avec le jeu.
+"""
+
+import copy
+import math
+import random
+import threading
+import time
+
+from battle.ai import AIOpponent, AI_SWITCH
+from battle.battle import Battle
+from battle.resolver import resolve_turn
+from battle.snapshot import BattleSnapshot
+
+
+MCTS_DIFFICULTY = "ultime"
+
+DEFAULT_EXPLORATION = 0.7
+# Profondeur de l'arbre (tours) puis longueur maximale d'un rollout
+DEFAULT_TREE_TURNS = 3
+DEFAULT_ROLLOUT_TURNS = 30
+# Iterations visees par decision (au-dela, le thread s'arrete)
+DEFAULT_ITERATIONS = 1000
+DEFAULT_MAX_PONDER_ITERATIONS = 20000
+# Temps de reflexion tolere au moment de jouer si l'arriere-plan n'a pas suffi
+DEFAULT_DECISION_BUDGET_MS = 12
+# Politique de rollout : proportion de coups gloutons
+ROLLOUT_GREEDY = 0.8
+
+ACTION_MOVE = "move"
+ACTION_SWITCH = "switch"
+
+
+class _Node:
+    """Noeud de l'arbre : statistiques [visites, valeur] par action et par camp."""
+
+    __slots__ = ("stats", "children")
+
+    def __init__(self):
+        self.stats = ({}, {})
+        self.children = {}
+
+
+class MCTSSearch:
+    """DUCT open-loop sur une copie privee d'un combat."""
+
+    def __init__(self, type_chart, side, exploration=DEFAULT_EXPLORATION,
+                 tree_turns=DEFAULT_TREE_TURNS, rollout_turns=DEFAULT_ROLLOUT_TURNS):
+        """
+        Args:
+            type_chart: TypeChart du combat
+            side: camp de l'IA (1 ou 2)
+            exploration: constante d'exploration de UCB1
+            tree_turns: profondeur maximale de l'arbre en tours
+            rollout_turns: nombre maximal de tours joues par rollout
+        """
+        self.type_chart = type_chart
+        self.side = side
+        self.exploration = exploration
+        self.tree_turns = tree_turns
+        self.rollout_turns = rollout_turns
+
+        self.battle = None
+        self._layout = None
+        self._root_data = None
+        self.root = _Node()
+        self.iterations = 0
+        self._move_scores = {}
+
+    def bind(self, battle):
+        """Cree la copie privee du combat (une fois par combat)."""
+        player1, player2 = copy.deepcopy((battle.player1, battle.player2))
+        self.battle = Battle(player1, player2, self.type_chart, battle.battle_type)
+        self._layout = self.battle.snapshot().layout
+        self._move_scores = {}
+
+    def reset(self, snapshot):
+        """Repart d'un nouvel etat racine (snapshot du vrai combat)."""
+        self._root_data = snapshot.data[:]
+        self.root = _Node()
+        self.iterations = 0
+
+    def run(self, iterations=None, deadline=None, stop_event=None):
+        """Enchaine des iterations jusqu'au nombre, a l'echeance ou a l'arret demande."""
+        done = 0
+        while iterations is None or done < iterations:
+            if stop_event is not None:
+                if stop_event.is_set():
+                    break
+                # Rend la main au thread du jeu entre deux iterations
+                time.sleep(0)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate()
+            done += 1
+        return done
+
+    def best(self, allow_switch=True):
+        """Action la plus visitee a la racine : (ACTION_MOVE, k), (ACTION_SWITCH, i) ou None."""
+        stats = self.root.stats[self.side - 1]
+        candidates = [
+            (visits, action) for action, (visits, _) in stats.items()
+            if allow_switch or action[0] == ACTION_MOVE
+        ]
+        if not candidates:
+            return None
+        return max(candidates)[1]
+
+    # ------------------------------------------------------------------
+    # Iteration
+    # ------------------------------------------------------------------
+
+    def _iterate(self):
+        battle = self.battle
+        battle.restore(BattleSnapshot(self._layout, self._root_data[:]))
+
+        node = self.root
+        path = []
+        for _ in range(self.tree_turns):
+            if battle.is_over:
+                break
+            choice1 = self._select(node, 1)
+            choice2 = self._select(node, 2)
+            path.append((node, choice1, choice2))
+            self._play(choice1, choice2)
+
+            key = (choice1, choice2)
+            child = node.children.get(key)
+            if child is None:
+                node.children[key] = _Node()
+                break
+            node = child
+
+        value = self._rollout()
+        for node, choice1, choice2 in path:
+            self._update(node.stats[0], choice1, value)
+            self._update(node.stats[1], choice2, 1.0 - value)
+        self.iterations += 1
+
+    @staticmethod
+    def _update(stats, action, value):
+        entry = stats.get(action)
+        if entry is None:
+            stats[action] = [1, value]
+        else:
+            entry[0] += 1
+            entry[1] += value
+
+    def _select(self, node, side):
+        """UCB1 sur les actions legales du camp (actions jamais essayees d'abord)."""
+        actions = self._legal_actions(side)
+        stats = node.stats[side - 1]
+        total = 0
+        for action in actions:
+            entry = stats.get(action)
+            if entry is None:
+                return action
+            total += entry[0]
+
+        log_total = math.log(total)
+        best_action, best_score = None, -1.0
+        for action in actions:
+            visits, value = stats[action]
+            score = value / visits + self.exploration * math.sqrt(log_total / visits)
+            if score > best_score:
+                best_action, best_score = action, score
+        return best_action
+
+    def _legal_actions(self, side):
+        player, active = self._side(side)
+        actions = [(ACTION_MOVE, k) for k, move in enumerate(active.moves) if move.has_pp()]
+        if not actions:
+            actions = [(ACTION_MOVE, 0)]
+        for i, pokemon in enumerate(player.team):
+            if pokemon is not active and not pokemon.is_fainted():
+                actions.append((ACTION_SWITCH, i))
+        return actions
+
+    def _play(self, choice1, choice2):
+        """Resout un tour avec les actions choisies puis remplace les KO."""
+        battle = self.battle
+        resolve_turn(battle, self._to_action(1, choice1), self._to_action(2, choice2))
+        self._replace_fainted()
+
+    def _to_action(self, side, choice):
+        player, active = self._side(side)
+        kind, index = choice
+        if kind == ACTION_SWITCH:
+            return AI_SWITCH, player.team[index]
+        return active.moves[index], None
+
+    def _side(self, side):
+        battle = self.battle
+        if side == 1:
+            return battle.player1, battle.pokemon1
+        return battle.player2, battle.pokemon2
+
+    def _replace_fainted(self):
+        battle = self.battle
+        fainted = battle.get_fainted_player()
+        while fainted is not None and not battle.is_over:
+            player = battle.player1 if fainted == 1 else battle.player2
+            battle.switch_pokemon(fainted, random.choice(player.get_alive_pokemon()))
+            fainted = battle.get_fainted_player()
+
+    # ------------------------------------------------------------------
+    # Rollout
+    # ------------------------------------------------------------------
+
+    def _rollout(self):
+        """Joue la suite du combat avec une politique rapide, retourne la valeur du camp 1."""
+        battle = self.battle
+        for _ in range(self.rollout_turns):
+            if battle.is_over:
+                break
+            move1 = self._rollout_move(battle.pokemon1, battle.pokemon2)
+            move2 = self._rollout_move(battle.pokemon2, battle.pokemon1)
+            battle.execute_turn(move1, move2)
+            self._replace_fainted()
+        return self._evaluate()
+
+    def _rollout_move(self, attacker, defender):
+        """Glouton sur puissance x efficacite x STAB x precision, aleatoire sinon."""
+        moves = [move for move in attacker.moves if move.has_pp()] or attacker.moves[:1]
+        if random.random() >= ROLLOUT_GREEDY:
+            return random.choice(moves)
+        return max(moves, key=lambda move: self._move_score(attacker, defender, move))
+
+    def _move_score(self, attacker, defender, move):
+        key = (id(attacker), id(defender), id(move))
+        score = self._move_scores.get(key)
+        if score is None:
+            score = 0.0
+            if move.is_damaging():
+                score = move.power * move.accuracy / 100
+                score *= self.type_chart.get_effectiveness(move.move_type, defender.types)
+                if move.move_type in attacker.types:
+                    score *= 1.5
+            self._move_scores[key] = score
+        return score
+
+    def _evaluate(self):
+        """1 = victoire du camp 1, 0 = defaite, sinon ecart de PV ramene dans [0, 1]."""
+        battle = self.battle
+        if battle.is_over:
+            return 1.0 if battle.winner is battle.player1 else 0.0
+        return 0.5 + 0.5 * (self._hp_fraction(battle.player1) - self._hp_fraction(battle.player2))
+
+    @staticmethod
+    def _hp_fraction(player):
+        max_hp = sum(p.max_hp for p in player.team)
+        return sum(p.current_hp for p in player.team) / max_hp if max_hp else 0.0
+
+
+class MCTSOpponent(AIOpponent):
+    """Variante MCTS de AIOpponent : reflechit dans un thread pendant les animations.
+
+    ponder(battle) lance (ou poursuit) la recherche sur l'etat courant ;
+    choose_action / choose_move arretent le thread et jouent la meilleure
+    action trouvee. Les switchs apres KO restent ceux de AIOpponent.
+    """
+
+    def __init__(self, pokemon, type_chart, difficulty=MCTS_DIFFICULTY, team=None,
+                 opponent_team=None, battle=None, side=2, threaded=True,
+                 iterations=DEFAULT_ITERATIONS,
+                 max_ponder_iterations=DEFAULT_MAX_PONDER_ITERATIONS,
+                 decision_budget_ms=DEFAULT_DECISION_BUDGET_MS, **kwargs):
+        """
+        Args:
+            battle: combat en cours (requis pour la recherche)
+            side: camp de l'IA (1 ou 2)
+            threaded: False = recherche synchrone au moment de jouer (simulateur)
+            iterations: iterations visees par decision
+            max_ponder_iterations: plafond d'iterations en arriere-plan
+            decision_budget_ms: temps tolere au moment de jouer pour atteindre
+                                `iterations` (ignore si threaded est False)
+        """
+        # Repli (search=None) : le score "difficile" de AIOpponent
+        super().__init__(pokemon, type_chart, "difficile", team, opponent_team, **kwargs)
+        self.difficulty = difficulty
+        self.side = side
+        self.threaded = threaded
+        self.iterations = iterations
+        self.max_ponder_iterations = max_ponder_iterations
+        self.decision_budget_ms = decision_budget_ms
+
+        self.battle = None
+        self.mcts = MCTSSearch(type_chart, side)
+        self._root_snapshot = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        if battle is not None:
+            self.attach(battle)
+
+    def attach(self, battle):
+        """Associe l'IA a un combat (copie privee pour la recherche)."""
+        self.stop()
+        self.battle = battle
+        self.mcts.bind(battle)
+        self._root_snapshot = None
+
+    # ------------------------------------------------------------------
+    # Reflexion en arriere-plan
+    # ------------------------------------------------------------------
+
+    def ponder(self):
+        """Lance la recherche en arriere-plan sur l'etat actuel du combat.
+
+        Sans effet si la recherche tourne deja sur ce meme etat.
+        """
+        if not self.threaded or self.battle is None or self.battle.is_over:
+            return
+        snapshot = self.battle.snapshot()
+        if snapshot == self._root_snapshot:
+            return
+
+        self.stop()
+        self._root_snapshot = snapshot
+        self.mcts.reset(snapshot)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self.mcts.run,
+            kwargs={"iterations": self.max_ponder_iterations, "stop_event": self._stop_event},
+            name="mcts-ponder", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Arrete le thread de recherche (l'arbre est conserve)."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+
+    def choose_action(self, opponent, switchable_pokemon=None):
+        decision = self._decide(allow_switch=bool(switchable_pokemon))
+        if decision is not None:
+            kind, index = decision
+            if kind == ACTION_SWITCH:
+                target = self.team[index] if self.team and index < len(self.team) else None
+                if target in (switchable_pokemon or []):
+                    return AI_SWITCH, target
+            else:
+                return self.pokemon.moves[index], None
+        return super().choose_action(opponent, switchable_pokemon)
+
+    def choose_move(self, opponent):
+        decision = self._decide(allow_switch=False)
+        if decision is not None:
+            return self.pokemon.moves[decision[1]]
+        return super().choose_move(opponent)
+
+    def _decide(self, allow_switch):
+        """Termine la recherche sur l'etat courant et retourne la meilleure action."""
+        if self.battle is None or self.battle.is_over:
+            return None
+        active = self.battle.pokemon1 if self.side == 1 else self.battle.pokemon2
+        if active is not self.pokemon:
+            return None
+
+        self.stop()
+        snapshot = self.battle.snapshot()
+        if snapshot != self._root_snapshot:
+            # L'arbre porte sur un etat perime (ou rien n'a ete lance)
+            self.mcts.reset(snapshot)
+
+        missing = self.iterations - self.mcts.iterations
+        if missing > 0:
+            if self.threaded:
+                deadline = time.perf_counter() + self.decision_budget_ms / 1000
+                self.mcts.run(iterations=missing, deadline=deadline)
+            else:
+                self.mcts.run(iterations=missing)
+
+        # L'etat va changer : la prochaine reflexion repartira de zero
+        self._root_snapshot = None
+        return self.mcts.best(allow_switch)
@@ -0,0 +1,59 @@
+"""Resolution d'un tour de combat sans animation (simulateur, rollouts MCTS).
+
+Reprend les regles de BattleState sans pygame ni animation : utilise par
+battle/simulator.py et par les rollouts de battle/mcts.py.
+"""
+
+from battle.ai import AI_SWITCH
+
+
+def resolve_turn(battle, action1, action2):
+    """Resout un tour complet a partir des actions des deux camps.
+
+    Chaque action est le tuple retourne par AIOpponent.choose_action :
+    (move, None) ou (AI_SWITCH, pokemon). Reprend les regles de BattleState :
+    le switch passe avant l'attaque et le Pokemon entrant encaisse le coup.
+
+    Returns:
+        list: Messages du tour
+    """
+    move1, target1 = action1
+    move2, target2 = action2
+
+    if move1 != AI_SWITCH and move2 != AI_SWITCH:
+        return battle.execute_turn(move1, move2)
+
+    battle.turn_number += 1
+    messages = []
+
+    if move1 == AI_SWITCH:
+        messages.extend(battle.switch_pokemon(1, target1))
+    if move2 == AI_SWITCH:
+        messages.extend(battle.switch_pokemon(2, target2))
+
+    if move1 != AI_SWITCH:
+        messages.extend(battle._process_turn(battle.pokemon1, battle.pokemon2, move1))
+        messages.extend(check_ko(battle, 2))
+    elif move2 != AI_SWITCH:
+        messages.extend(battle._process_turn(battle.pokemon2, battle.pokemon1, move2))
+        messages.extend(check_ko(battle, 1))
+
+    return messages
+
+
+def check_ko(battle, player_num):
+    """Verifie le KO du Pokemon actif d'un joueur et termine le combat si besoin."""
+    pokemon = battle.pokemon1 if player_num == 1 else battle.pokemon2
+    if not pokemon.is_fainted():
+        return []
+
+    loser_player = battle.player1 if player_num == 1 else battle.player2
+    winner_player = battle.player2 if player_num == 1 else battle.player1
+
+    messages = [f"{pokemon.name} est K.O. !"]
+    if not loser_player.has_alive_pokemon():
+        battle.is_over = True
+        battle.winner = winner_player
+        battle.loser = loser_player
+        messages.append(f"{winner_player.name} remporte le combat !")
+    return messages
@@ -0,0 +1,596 @@
+"""Recherche expectiminimax pour l'IA "expert".
+
+L'IA explore 2 a 4 plies (un ply = une decision d'un camp, un tour = 2 plies)
+sur les attaques et les switchs (l'adversaire attaque ou remplace un Pokemon
+KO, sans switch volontaire). Les noeuds de hasard couvrent la precision, les
+coups critiques, les effets de statut (paralysie, sommeil, gel) et les
+chances d'infliger un statut. Les regles de tour sont celles de Battle :
+switch d'abord, ordre par vitesse, fin du tour au premier KO, puis degats de
+brulure/poison.
+
+L'etat de recherche est un tuple compact et hashable
+(PV camp 0, statuts camp 0, actif camp 0, PV camp 1, statuts camp 1, actif camp 1)
+qui sert directement de cle a la table de transposition. Le camp 0 est l'IA.
+
+Les 16 tirages de degats d'un coup donnent deux branches : KO (tirages qui
+atteignent les PV restants) et survie (moyenne des autres tirages). La chance
+de KO est donc exacte, comme dans le score "difficile".
+
+Les actions sont triees par degats esperes + chance de KO (meilleurs coups
+d'abord : plus de coupures). A la racine, un autre coup ne remplace le coup
+en tete que s'il vaut nettement plus : a valeur egale, l'IA garde le coup qui
+fait le plus de degats tout de suite.
+
+Simplifications : les PP ne sont suivis qu'a la racine et le compteur de
+sommeil est remplace par une chance de reveil de 1/3 par tour.
+"""
+
+import time
+from bisect import bisect_left
+
+from battle.damage_calculator import RANDOM_ROLLS, CRITICAL_CHANCE
+from models.status_effect import STATUS_FACTORY
+
+
+DEFAULT_MAX_PLIES = 4
+# Budget par decision (une fois par tour, quand le joueur valide son choix) :
+# avec le tri des coups, 4 plies sont atteints dans ~95% des decisions
+DEFAULT_TIME_BUDGET_MS = 40
+DEFAULT_MAX_SWITCHES = 1
+# Un switch volontaire donne un coup gratuit a l'adversaire : a la racine, il
+# doit valoir au moins une barre de PV de plus que la meilleure attaque
+# (en simulation, switcher plus souvent fait perdre des combats).
+ROOT_SWITCH_MARGIN = 1.0
+# Un coup n'en remplace un autre, mieux classe par les degats immediats, que
+# s'il vaut plus de 5% d'une barre de PV en plus (egalites : evaluation bruitee)
+ROOT_TIE_MARGIN = 0.05
+TRANSPOSITION_TABLE_SIZE = 200000
+
+ACTION_MOVE = "move"
+ACTION_SWITCH = "switch"
+
+WIN_SCORE = 100.0
+
+# Chance d'agir en debut de tour selon le statut (et si le statut disparait)
+_ACT_CHANCE = {
+    "paralysis": (0.75, False),
+    "sleep": (1 / 3, True),
+    "freeze": (0.20, True),
+}
+
+
+class _SearchTimeout(Exception):
+    """Levee quand le budget de temps de la decision est epuise."""
+
+
+class _Fighter:
+    """Donnees fixes d'un Pokemon pendant la recherche."""
+
+    __slots__ = ("pokemon", "max_hp", "level", "types", "speed", "attack",
+                 "sp_attack", "defense", "sp_defense", "moves")
+
+    def __init__(self, pokemon):
+        self.pokemon = pokemon
+        self.max_hp = max(1, pokemon.max_hp)
+        self.level = pokemon.level
+        self.types = pokemon.types
+        self.speed = pokemon.speed
+        self.attack = pokemon.attack
+        self.sp_attack = pokemon.sp_attack
+        self.defense = pokemon.defense
+        self.sp_defense = pokemon.sp_defense
+        self.moves = pokemon.moves
+
+
+def _replace(values, index, value):
+    """Copie d'un tuple avec un element remplace."""
+    return values[:index] + (value,) + values[index + 1:]
+
+
+class ExpectiminimaxSearch:
+    """Choisit une action par expectiminimax avec table de transposition et budget de temps."""
+
+    def __init__(self, type_chart, max_plies=DEFAULT_MAX_PLIES,
+                 time_budget_ms=DEFAULT_TIME_BUDGET_MS, max_switches=DEFAULT_MAX_SWITCHES):
+        """
+        Args:
+            type_chart: TypeChart pour l'efficacite des types
+            max_plies: profondeur maximale (2 plies = 1 tour)
+            time_budget_ms: budget par decision, None = pas de limite
+                            (profondeur fixe, resultat deterministe)
+            max_switches: nombre de switchs explores par noeud (meilleurs matchups)
+        """
+        self.type_chart = type_chart
+        self.max_turns = max(1, max_plies // 2)
+        self.time_budget_ms = time_budget_ms
+        self.max_switches = max_switches
+
+        self.table = {}
+        self._signature = None
+        self._fighters = None
+        self._damage_cache = {}
+        self._deadline = None
+
+        # Statistiques de la derniere decision
+        self.last_depth = 0
+        self.nodes = 0
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+
+    def choose(self, team, active, opponent_team, opponent, switchable=None):
+        """Retourne (ACTION_MOVE, move) ou (ACTION_SWITCH, pokemon), ou None.
+
+        Args:
+            team: equipe de l'IA
+            active: Pokemon actif de l'IA
+            opponent_team: equipe adverse (ou [opponent] si inconnue)
+            opponent: Pokemon actif adverse
+            switchable: Pokemon vers lesquels l'IA peut switcher ([] = attaque seulement)
+        """
+        if active not in team or opponent not in opponent_team:
+            return None
+
+        self._prepare(team, opponent_team)
+        state = self._root_state(team, active, opponent_team, opponent)
+
+        root_actions = self._root_actions(state, active, team, switchable or [])
+        if not root_actions:
+            return None
+
+        self._start_clock()
+        best = None
+        for turns in range(1, self.max_turns + 1):
+            try:
+                best = self._search_root(state, turns, root_actions)
+            except _SearchTimeout:
+                break
+            self.last_depth = turns * 2
+
+        if best is None:
+            return None
+
+        kind, index = best
+        if kind == ACTION_SWITCH:
+            return ACTION_SWITCH, team[index]
+        return ACTION_MOVE, active.moves[index]
+
+    def choose_replacement(self, team, candidates, opponent_team, opponent):
+        """Retourne le Pokemon a envoyer apres un KO (meilleure valeur), ou None.
+
+        Args:
+            team: equipe de l'IA
+            candidates: Pokemon vivants qui peuvent entrer
+            opponent_team: equipe adverse (ou [opponent] si inconnue)
+            opponent: Pokemon actif adverse
+        """
+        candidates = [p for p in candidates if p in team]
+        if not candidates or opponent not in opponent_team:
+            return None
+
+        self._prepare(team, opponent_team)
+        state = self._root_state(team, candidates[0], opponent_team, opponent)
+
+        self._start_clock()
+        best = None
+        for turns in range(1, self.max_turns + 1):
+            try:
+                values = [
+                    self._value(_replace(state, 2, team.index(p)), turns) for p in candidates
+                ]
+            except _SearchTimeout:
+                break
+            best = candidates[values.index(max(values))]
+            self.last_depth = turns * 2
+        return best
+
+    # ------------------------------------------------------------------
+    # Preparation
+    # ------------------------------------------------------------------
+
+    def _prepare(self, team, opponent_team):
+        """Reconstruit les donnees fixes si les equipes ont change (vide alors la table)."""
+        signature = (tuple(id(p) for p in team), tuple(id(p) for p in opponent_team))
+        if signature != self._signature:
+            self._signature = signature
+            self._fighters = ([_Fighter(p) for p in team], [_Fighter(p) for p in opponent_team])
+            self._damage_cache = {}
+            self.table = {}
+        elif len(self.table) > TRANSPOSITION_TABLE_SIZE:
+            self.table = {}
+
+    def _root_state(self, team, active, opponent_team, opponent):
+        return (
+            tuple(p.current_hp for p in team),
+            tuple(self._status_name(p) for p in team),
+            team.index(active),
+            tuple(p.current_hp for p in opponent_team),
+            tuple(self._status_name(p) for p in opponent_team),
+            opponent_team.index(opponent),
+        )
+
+    def _start_clock(self):
+        """Remet les statistiques a zero et lance le budget de la decision."""
+        self.nodes = 0
+        self.last_depth = 0
+        self._deadline = None
+        if self.time_budget_ms is not None:
+            self._deadline = time.perf_counter() + self.time_budget_ms / 1000
+
+    @staticmethod
+    def _status_name(pokemon):
+        if pokemon.status and pokemon.status.is_active:
+            return pokemon.status.name
+        return None
+
+    def _root_actions(self, state, active, team, switchable):
+        """Actions de l'IA a la racine : moves avec PP restants + switchs autorises."""
+        actions = [
+            (ACTION_MOVE, k) for k in self._move_order(state, 0) if active.moves[k].has_pp()
+        ]
+        if not actions and active.moves:
+            actions = [(ACTION_MOVE, 0)]
+        allowed = {team.index(p) for p in switchable if p in team}
+        actions.extend(
+            action for action in self._switch_actions(state, 0) if action[1] in allowed
+        )
+        return actions
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def _search_root(self, state, turns, root_actions):
+        """Noeud max de la racine : retourne la meilleure action.
+
+        Les actions arrivent triees (_move_order puis switchs) : une action
+        ne remplace la meilleure que si elle la depasse de sa marge.
+        """
+        best_action = None
+        best_value = float("-inf")
+        for action in root_actions:
+            margin = ROOT_SWITCH_MARGIN if action[0] == ACTION_SWITCH else ROOT_TIE_MARGIN
+            threshold = best_value + margin
+            value = self._min_over_opponent(state, action, turns, threshold)
+            if value > threshold:
+                best_value = value
+                best_action = action
+        return best_action
+
+    def _value(self, state, turns):
+        """Valeur esperee d'un etat pour l'IA, `turns` tours restant a explorer."""
+        self.nodes += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        hp0, _, active0, hp1, _, active1 = state
+        if not any(hp0):
+            return -WIN_SCORE
+        if not any(hp1):
+            return WIN_SCORE
+
+        key = (state, turns)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        if hp0[active0] <= 0:
+            # Remplacement force de l'IA (ne consomme pas de tour)
+            value = max(
+                self._value(_replace(state, 2, j), turns)
+                for j, hp in enumerate(hp0) if hp > 0
+            )
+        elif hp1[active1] <= 0:
+            value = min(
+                self._value(_replace(state, 5, j), turns)
+                for j, hp in enumerate(hp1) if hp > 0
+            )
+        elif turns == 0:
+            value = self._evaluate(state)
+        else:
+            value = float("-inf")
+            for action in self._actions(state, 0):
+                value = max(value, self._min_over_opponent(state, action, turns, value))
+
+        self.table[key] = value
+        return value
+
+    def _min_over_opponent(self, state, action, turns, alpha):
+        """Noeud min : pire reponse adverse a `action` (coupe si <= alpha)."""
+        worst = float("inf")
+        for opp_action in self._actions(state, 1):
+            expected = 0.0
+            for child, prob in self._resolve_turn(state, action, opp_action).items():
+                expected += prob * self._value(child, turns - 1)
+            if expected < worst:
+                worst = expected
+                if worst <= alpha:
+                    break
+        return worst
+
+    def _actions(self, state, side):
+        """Actions d'un camp : ses moves (meilleurs d'abord) + les meilleurs switchs.
+
+        L'adversaire n'a que ses moves : dans le noeud min, il repond en
+        connaissant notre action, et un switch vers le Pokemon qui resiste a
+        notre coup ferait jouer a l'IA des coups mediocres pour s'en proteger.
+        Ses remplacements apres KO restent explores.
+        """
+        actions = [(ACTION_MOVE, k) for k in self._move_order(state, side)]
+        if side == 0:
+            actions.extend(self._switch_actions(state, side))
+        return actions
+
+    def _move_order(self, state, side):
+        """Moves de l'actif d'un camp, tries par degats esperes + chance de KO.
+
+        Meme score que AIOpponent._score_expected_damage (en fraction de PV) :
+        le meilleur coup immediat est explore en premier, les moves de statut
+        en dernier.
+        """
+        attacker = state[side * 3 + 2]
+        defender = state[(1 - side) * 3 + 2]
+        hp = state[(1 - side) * 3][defender]
+        burned = state[side * 3 + 1][attacker] == "burn"
+        key = ("order", side, attacker, defender, hp, burned)
+        order = self._damage_cache.get(key)
+        if order is not None:
+            return order
+
+        fighter = self._fighters[side][attacker]
+        max_hp = self._fighters[1 - side][defender].max_hp
+        scores = []
+        for k, move in enumerate(fighter.moves):
+            score = 0.0
+            if move.is_damaging():
+                normal, critical, _ = self._damage(side, attacker, defender, k, burned)
+                if normal is not None:
+                    for chance, (damages, sums) in ((1 - CRITICAL_CHANCE, normal),
+                                                    (CRITICAL_CHANCE, critical)):
+                        survive = bisect_left(damages, hp)
+                        capped = sums[survive] + (len(damages) - survive) * hp
+                        ko = (len(damages) - survive) / len(damages)
+                        score += chance * (capped / len(damages) / max_hp + ko)
+                    score *= min(1.0, move.accuracy / 100)
+            scores.append(score)
+        order = tuple(sorted(range(len(scores)), key=lambda k: -scores[k]))
+        self._damage_cache[key] = order
+        return order
+
+    def _switch_actions(self, state, side):
+        """Switchs vers les Pokemon vivants, tries par matchup contre l'actif adverse."""
+        hp = state[side * 3]
+        active = state[side * 3 + 2]
+        if self.max_switches <= 0:
+            return []
+        opponent = self._fighters[1 - side][state[(1 - side) * 3 + 2]]
+        candidates = [j for j, h in enumerate(hp) if h > 0 and j != active]
+        candidates.sort(
+            key=lambda j: self._matchup(self._fighters[side][j], opponent), reverse=True
+        )
+        return [(ACTION_SWITCH, j) for j in candidates[:self.max_switches]]
+
+    def _matchup(self, fighter, opponent):
+        """Score de matchup de type (meme principe que AIOpponent._matchup_score)."""
+        opponent_profile = self.type_chart.get_defensive_profile(opponent.types)
+        fighter_profile = self.type_chart.get_defensive_profile(fighter.types)
+        offensive = max(opponent_profile.get(t, 1.0) for t in fighter.types)
+        defensive = max(fighter_profile.get(t, 1.0) for t in opponent.types)
+        return offensive * (2.0 if defensive == 0 else 1.0 / defensive)
+
+    def _evaluate(self, state):
+        """Heuristique : difference des fractions de PV, petit bonus de statut."""
+        hp0, status0, _, hp1, status1, _ = state
+        fighters0, fighters1 = self._fighters
+        score = 0.0
+        for hp, status, fighter in zip(hp0, status0, fighters0):
+            if hp > 0:
+                score += hp / fighter.max_hp - (0.05 if status else 0.0)
+        for hp, status, fighter in zip(hp1, status1, fighters1):
+            if hp > 0:
+                score -= hp / fighter.max_hp - (0.05 if status else 0.0)
+        return score
+
+    # ------------------------------------------------------------------
+    # Resolution d'un tour (noeuds de hasard)
+    # ------------------------------------------------------------------
+
+    def _resolve_turn(self, state, action0, action1):
+        """Retourne {etat suivant: probabilite} pour un tour (switchs puis attaques)."""
+        state = list(state)
+        actions = (action0, action1)
+        for side, (kind, index) in enumerate(actions):
+            if kind == ACTION_SWITCH:
+                state[side * 3 + 2] = index
+
+        speed0 = self._speed(state, 0)
+        speed1 = self._speed(state, 1)
+        if speed0 > speed1:
+            orders = ((1.0, (0, 1)),)
+        elif speed1 > speed0:
+            orders = ((1.0, (1, 0)),)
+        else:
+            orders = ((0.5, (0, 1)), (0.5, (1, 0)))
+
+        outcomes = {}
+        for order_prob, order in orders:
+            pending = [(order_prob, state, False)]
+            for side in order:
+                kind, index = actions[side]
+                if kind != ACTION_MOVE:
+                    continue
+                next_pending = []
+                for prob, branch, ko in pending:
+                    if ko:
+                        next_pending.append((prob, branch, ko))
+                    else:
+                        next_pending.extend(self._attack(prob, branch, side, index))
+                pending = next_pending
+
+            for prob, branch, ko in pending:
+                if not ko:
+                    branch = self._end_of_turn(branch, order)
+                key = tuple(branch)
+                outcomes[key] = outcomes.get(key, 0.0) + prob
+
+        return outcomes
+
+    def _speed(self, state, side):
+        active = state[side * 3 + 2]
+        speed = self._fighters[side][active].speed
+        if state[side * 3 + 1][active] == "paralysis":
+            speed //= 2
+        return speed
+
+    def _attack(self, prob, state, side, move_index):
+        """Branches d'une attaque : statut bloquant, precision, critique, statut inflige.
+
+        Returns:
+            list: [(probabilite, etat, ko_du_defenseur)]
+        """
+        attacker = state[side * 3 + 2]
+        defender_side = 1 - side
+        defender = state[defender_side * 3 + 2]
+        fighter = self._fighters[side][attacker]
+        move = fighter.moves[move_index]
+        branches = []
+
+        # Statut en debut de tour
+        status = state[side * 3 + 1][attacker]
+        act_chance, clears = _ACT_CHANCE.get(status, (1.0, False))
+        if act_chance < 1.0:
+            branches.append((prob * (1 - act_chance), state, False))
+            prob *= act_chance
+            if clears:
+                state = list(state)
+                state[side * 3 + 1] = _replace(state[side * 3 + 1], attacker, None)
+
+        # Precision
+        hit_chance = min(1.0, move.accuracy / 100)
+        if hit_chance < 1.0:
+            branches.append((prob * (1 - hit_chance), state, False))
+            prob *= hit_chance
+
+        if move.is_damaging():
+            normal, critical, effectiveness = self._damage(
+                side, attacker, defender, move_index, status == "burn"
+            )
+            hits = ((1 - CRITICAL_CHANCE, normal), (CRITICAL_CHANCE, critical))
+        else:
+            effectiveness = 1.0
+            hits = ((1.0, None),)
+
+        defender_hp = state[defender_side * 3]
+        hp = defender_hp[defender]
+        for hit_prob, rolls in hits:
+            if rolls is None:
+                branches.extend(
+                    self._ailment(prob * hit_prob, state, defender_side, defender, move, effectiveness)
+                )
+                continue
+            # Tirages sous les PV restants : survie (degats moyens), les autres : KO
+            damages, sums = rolls
+            survive = bisect_left(damages, hp)
+            ko_prob = prob * hit_prob * (len(damages) - survive) / len(damages)
+            if ko_prob > 0:
+                branch = list(state)
+                branch[defender_side * 3] = _replace(defender_hp, defender, 0)
+                branches.append((ko_prob, branch, True))
+            if survive:
+                branch = list(state)
+                branch[defender_side * 3] = _replace(
+                    defender_hp, defender, hp - round(sums[survive] / survive)
+                )
+                branches.extend(self._ailment(
+                    prob * hit_prob * survive / len(damages), branch,
+                    defender_side, defender, move, effectiveness,
+                ))
+
+        return branches
+
+    def _ailment(self, prob, state, side, target, move, effectiveness):
+        """Branches de l'effet de statut d'un move (regles de Battle._apply_ailment)."""
+        statuses = state[side * 3 + 1]
+        if (move.ailment not in STATUS_FACTORY or effectiveness <= 0
+                or statuses[target] is not None):
+            return [(prob, state, False)]
+
+        if move.ailment_chance > 0:
+            chance = move.ailment_chance / 100
+        elif not move.is_damaging():
+            chance = 1.0
+        else:
+            return [(prob, state, False)]
+
+        afflicted = list(state)
+        afflicted[side * 3 + 1] = _replace(statuses, target, move.ailment)
+        branches = [(prob * chance, afflicted, False)]
+        if chance < 1.0:
+            branches.append((prob * (1 - chance), state, False))
+        return branches
+
+    def _end_of_turn(self, state, order):
+        """Degats de brulure et de poison (s'arrete au premier KO, comme Battle)."""
+        for side in order:
+            active = state[side * 3 + 2]
+            status = state[side * 3 + 1][active]
+            if status == "burn":
+                damage = max(1, self._fighters[side][active].max_hp // 16)
+            elif status == "poison":
+                damage = max(1, self._fighters[side][active].max_hp // 8)
+            else:
+                continue
+            state = list(state)
+            hp = max(0, state[side * 3][active] - damage)
+            state[side * 3] = _replace(state[side * 3], active, hp)
+            if hp <= 0:
+                break
+        return state
+
+    def _damage(self, side, attacker, defender, move_index, burned):
+        """Tirages de degats (normal, critique) et efficacite d'un coup, memorises.
+
+        Chaque tirage est un tuple (degats croissants, sommes cumulees) : la
+        chance de KO et les degats moyens sans KO se lisent par bisection.
+        """
+        key = (side, attacker, defender, move_index, burned)
+        cached = self._damage_cache.get(key)
+        if cached is not None:
+            return cached
+
+        fighter = self._fighters[side][attacker]
+        target = self._fighters[1 - side][defender]
+        move = fighter.moves[move_index]
+
+        if move.category == "physical":
+            atk = fighter.attack // 2 if burned else fighter.attack
+            dfn = target.defense
+        else:
+            atk = fighter.sp_attack
+            dfn = target.sp_defense
+
+        base = ((2 * fighter.level / 5 + 2) * move.power * atk / max(1, dfn)) / 50 + 2
+        stab = 1.5 if move.move_type in fighter.types else 1.0
+        effectiveness = self.type_chart.get_effectiveness(move.move_type, target.types)
+
+        if effectiveness == 0:
+            result = (None, None, 0.0)
+        else:
+            modifier = base * stab * effectiveness
+            result = (
+                self._rolls(modifier),
+                self._rolls(modifier * 2.0),
+                effectiveness,
+            )
+
+        self._damage_cache[key] = result
+        return result
+
+    @staticmethod
+    def _rolls(modifier):
+        damages = tuple(max(1, int(modifier * roll)) for roll in RANDOM_ROLLS)
+        sums = [0]
+        for damage in damages:
+            sums.append(sums[-1] + damage)
+        return damages, tuple(sums)
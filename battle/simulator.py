@@ -0,0 +1,302 @@
+"""Simulateur de combats headless (IA vs IA) pour l'equilibrage des equipes.
+
+Aucun import pygame : les combats sont resolus directement avec Battle et
+AIOpponent, sans animation ni rendu.
+
+Usage :
+    python -m battle.simulator --battles 1000 --seed 42
+    python -m battle.simulator --team1 6,9,3 --team2 25,143,150 --ai1 facile --ai2 difficile
+"""
+
+import argparse
+import copy
+import random
+import time
+from collections import Counter
+
+from api.client import APIClient
+from battle.ai import AIOpponent
+from battle.battle import Battle
+from battle.mcts import MCTSOpponent, MCTS_DIFFICULTY, DEFAULT_ITERATIONS
+from battle.resolver import resolve_turn
+from battle.search import DEFAULT_MAX_PLIES
+from config import DEFAULT_LEVEL
+from models.player import Player
+from models.type_chart import TypeChart
+
+
+# Limite de tours au-dela de laquelle un combat est declare nul
+DEFAULT_MAX_TURNS = 500
+
+AI_LEVELS = ("facile", "normal", "difficile", "expert", MCTS_DIFFICULTY)
+
+
+# ----------------------------------------------------------------------
+# Statistiques
+# ----------------------------------------------------------------------
+
+class SimulationResult:
+    """Statistiques agregees d'une serie de combats simules."""
+
+    def __init__(self):
+        self.battles = 0
+        self.wins = [0, 0]  # victoires equipe 1 / equipe 2
+        self.draws = 0      # combats arretes par la limite de tours
+        self.turn_counts = Counter()
+        self.elapsed = 0.0
+
+    def record(self, winner, turns):
+        """Enregistre l'issue d'un combat (winner = 1, 2 ou None)."""
+        self.battles += 1
+        if winner is None:
+            self.draws += 1
+        else:
+            self.wins[winner - 1] += 1
+        self.turn_counts[turns] += 1
+
+    def merge(self, other):
+        """Ajoute les statistiques d'un autre resultat a celui-ci."""
+        self.battles += other.battles
+        self.wins[0] += other.wins[0]
+        self.wins[1] += other.wins[1]
+        self.draws += other.draws
+        self.turn_counts.update(other.turn_counts)
+        self.elapsed += other.elapsed
+
+    def battles_per_second(self):
+        """Debit de simulation."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.battles / self.elapsed
+
+    def win_rate(self, team_num):
+        """Taux de victoire de l'equipe 1 ou 2 (0.0 a 1.0)."""
+        if self.battles == 0:
+            return 0.0
+        return self.wins[team_num - 1] / self.battles
+
+    def turn_histogram(self, bucket_size=5):
+        """Retourne l'histogramme des durees de combat : [(debut, fin, nombre)]."""
+        buckets = Counter()
+        for turns, count in self.turn_counts.items():
+            buckets[turns // bucket_size] += count
+        return [
+            (b * bucket_size, (b + 1) * bucket_size - 1, buckets[b])
+            for b in sorted(buckets)
+        ]
+
+    def format_report(self, bucket_size=5, bar_width=40):
+        """Construit le rapport texte affiche par la CLI."""
+        lines = [
+            f"Combats     : {self.battles} en {self.elapsed:.2f}s "
+            f"({self.battles_per_second():.1f} combats/s)",
+            f"Equipe 1    : {self.wins[0]} victoires ({self.win_rate(1):.1%})",
+            f"Equipe 2    : {self.wins[1]} victoires ({self.win_rate(2):.1%})",
+            f"Nuls        : {self.draws}",
+            "",
+            "Duree des combats (tours) :",
+        ]
+        histogram = self.turn_histogram(bucket_size)
+        peak = max((count for _, _, count in histogram), default=0)
+        for start, end, count in histogram:
+            bar = "#" * max(1, round(count / peak * bar_width)) if peak else ""
+            lines.append(f"  {start:>4}-{end:<4} {count:>8}  {bar}")
+        return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Simulateur
+# ----------------------------------------------------------------------
+
+class BattleSimulator:
+    """Enchaine des combats IA vs IA sans affichage."""
+
+    def __init__(self, type_chart=None, api_client=None, level=DEFAULT_LEVEL,
+                 max_turns=DEFAULT_MAX_TURNS, search_plies=DEFAULT_MAX_PLIES,
+                 search_budget_ms=None, mcts_iterations=DEFAULT_ITERATIONS):
+        """
+        Args:
+            type_chart: TypeChart partage (cree si None)
+            api_client: APIClient utilise pour construire les Pokemon
+                        (client hors-ligne par defaut : aucun appel reseau)
+            level: niveau des Pokemon construits
+            max_turns: nombre de tours avant de declarer le combat nul
+            search_plies: profondeur de l'IA "expert"
+            search_budget_ms: budget par decision de l'IA "expert" (None = profondeur
+                              fixe, ce qui garde les series reproductibles)
+            mcts_iterations: iterations par decision de l'IA "ultime"
+        """
+        self.type_chart = type_chart or TypeChart()
+        self.api_client = api_client or APIClient(offline=True)
+        self.level = level
+        self.max_turns = max_turns
+        self.search_plies = search_plies
+        self.search_budget_ms = search_budget_ms
+        self.mcts_iterations = mcts_iterations
+
+        # Pokemon construits une seule fois puis copies a chaque combat
+        self._prototypes = {}
+
+    def available_ids(self):
+        """IDs des Pokemon de la BDD locale."""
+        return sorted(self.api_client.local_pokemon_db)
+
+    def make_pokemon(self, pokemon_id):
+        """Retourne une copie neuve (PV et PP pleins) d'un Pokemon."""
+        prototype = self._prototypes.get(pokemon_id)
+        if prototype is None:
+            prototype = self.api_client.build_pokemon(pokemon_id, self.level)
+            self._prototypes[pokemon_id] = prototype
+        return copy.deepcopy(prototype)
+
+    def make_player(self, name, team_ids):
+        """Construit un dresseur IA avec l'equipe demandee."""
+        player = Player(name, is_ai=True)
+        for pokemon_id in team_ids:
+            player.add_pokemon(self.make_pokemon(pokemon_id))
+        return player
+
+    def run_battle(self, team1_ids, team2_ids, difficulty1="normal",
+                   difficulty2="normal", seed=None):
+        """Simule un combat complet.
+
+        Returns:
+            tuple: (gagnant: 1, 2 ou None si nul, nombre de tours)
+        """
+        if seed is not None:
+            random.seed(seed)
+
+        player1 = self.make_player("Equipe 1", team1_ids)
+        player2 = self.make_player("Equipe 2", team2_ids)
+        battle = Battle(player1, player2, self.type_chart)
+
+        ai1 = self._make_ai(battle, 1, difficulty1)
+        ai2 = self._make_ai(battle, 2, difficulty2)
+
+        while not battle.is_over and battle.turn_number < self.max_turns:
+            action1 = self._choose_action(ai1, battle.pokemon1, player1, battle.pokemon2)
+            action2 = self._choose_action(ai2, battle.pokemon2, player2, battle.pokemon1)
+            resolve_turn(battle, action1, action2)
+            if not battle.is_over:
+                self._replace_fainted(battle, ai1, ai2)
+
+        if battle.winner is player1:
+            return 1, battle.turn_number
+        if battle.winner is player2:
+            return 2, battle.turn_number
+        return None, battle.turn_number
+
+    def run(self, battles, team1_ids=None, team2_ids=None, difficulty1="normal",
+            difficulty2="normal", team_size=3, seed=None):
+        """Simule une serie de combats.
+
+        Les equipes non fournies sont tirees au hasard a chaque combat. Avec la
+        meme graine, la serie complete est reproduite a l'identique.
+
+        Returns:
+            SimulationResult: statistiques de la serie
+        """
+        rng = random.Random(seed)
+        pool = self.available_ids()
+        result = SimulationResult()
+
+        start = time.perf_counter()
+        for _ in range(battles):
+            team1 = team1_ids or rng.sample(pool, team_size)
+            team2 = team2_ids or rng.sample(pool, team_size)
+            winner, turns = self.run_battle(
+                team1, team2, difficulty1, difficulty2, seed=rng.getrandbits(32)
+            )
+            result.record(winner, turns)
+        result.elapsed = time.perf_counter() - start
+
+        return result
+
+    def _make_ai(self, battle, side, difficulty):
+        player, opponent_player = battle.player1, battle.player2
+        pokemon = battle.pokemon1
+        if side == 2:
+            player, opponent_player = opponent_player, player
+            pokemon = battle.pokemon2
+
+        if difficulty == MCTS_DIFFICULTY:
+            # Recherche synchrone a nombre d'iterations fixe : series reproductibles
+            return MCTSOpponent(
+                pokemon, self.type_chart, team=player.team,
+                opponent_team=opponent_player.team, battle=battle, side=side,
+                threaded=False, iterations=self.mcts_iterations,
+            )
+        return AIOpponent(
+            pokemon, self.type_chart, difficulty,
+            team=player.team, opponent_team=opponent_player.team,
+            search_plies=self.search_plies, search_budget_ms=self.search_budget_ms,
+        )
+
+    def _choose_action(self, ai, active, player, opponent):
+        """Fait choisir une action a l'IA pour son Pokemon actif."""
+        ai.pokemon = active
+        switchable = player.get_switchable_pokemon(active)
+        return ai.choose_action(opponent, switchable)
+
+    def _replace_fainted(self, battle, ai1, ai2):
+        """Envoie un remplacant pour chaque Pokemon KO (choix de l'IA)."""
+        fainted = battle.get_fainted_player()
+        while fainted is not None:
+            if fainted == 1:
+                ai, player, opponent = ai1, battle.player1, battle.pokemon2
+            else:
+                ai, player, opponent = ai2, battle.player2, battle.pokemon1
+            ai.pokemon = battle.pokemon1 if fainted == 1 else battle.pokemon2
+            target = ai.choose_switch_after_ko(player.get_alive_pokemon(), opponent)
+            battle.switch_pokemon(fainted, target)
+            fainted = battle.get_fainted_player()
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+def _parse_team(value):
+    """Convertit "6,9,3" en [6, 9, 3]."""
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation de combats IA vs IA sans affichage.")
+    parser.add_argument("--battles", type=int, default=1000, help="nombre de combats")
+    parser.add_argument("--team1", type=_parse_team, help="IDs de l'equipe 1 (ex: 6,9,3)")
+    parser.add_argument("--team2", type=_parse_team, help="IDs de l'equipe 2")
+    parser.add_argument("--team-size", type=int, default=3,
+                        help="taille des equipes tirees au hasard")
+    parser.add_argument("--ai1", choices=AI_LEVELS, default="normal")
+    parser.add_argument("--ai2", choices=AI_LEVELS, default="normal")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--seed", type=int, help="graine pour reproduire une serie")
+    parser.add_argument("--search-plies", type=int, default=DEFAULT_MAX_PLIES,
+                        help="profondeur de l'IA expert")
+    parser.add_argument("--search-budget-ms", type=float, default=None,
+                        help="budget par decision de l'IA expert (defaut : aucun)")
+    parser.add_argument("--mcts-iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="iterations par decision de l'IA ultime")
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+
+    simulator = BattleSimulator(
+        level=args.level, max_turns=args.max_turns,
+        search_plies=args.search_plies, search_budget_ms=args.search_budget_ms,
+        mcts_iterations=args.mcts_iterations,
+    )
+    result = simulator.run(
+        args.battles, args.team1, args.team2,
+        difficulty1=args.ai1, difficulty2=args.ai2,
+        team_size=args.team_size, seed=seed,
+    )
+
+    print(f"Graine : {seed}  |  IA : {args.ai1} vs {args.ai2}")
+    print(result.format_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Etat de combat compact, copiable en quelques microsecondes.
+
+Pokemon, Move et StatusEffect sont des objets riches (sprites, textes
+d'affichage...) : les copier en profondeur pour chaque noeud d'une recherche
+ou d'un rollout est bien trop couteux. BattleSnapshot ne garde que ce qui
+change pendant un combat, dans une seule liste plate d'entiers :
+
+    [tour, fini, gagnant, switch j1, switch j2, actif j1, actif j2,
+     puis pour chaque Pokemon (equipe 1 puis equipe 2) :
+     PV, statut, tours de sommeil, PP move 1, ..., PP move n]
+
+Cloner = copier cette liste. La disposition (tailles d'equipes, nombre de
+moves) est partagee entre tous les clones d'un meme combat.
+
+Usage :
+    snap = battle.snapshot()
+    ...                       # simuler des tours sur battle
+    battle.restore(snap)      # retour exact a l'etat capture
+"""
+
+from models.status_effect import StatusEffect, STATUS_FACTORY
+
+
+# Codes de statut (0 = aucun, negatif = statut present mais inactif)
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_FACTORY, start=1)}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Indices de l'en-tete
+TURN = 0
+IS_OVER = 1
+WINNER = 2
+SWITCHED = (3, 4)
+ACTIVE = (5, 6)
+HEADER_SIZE = 7
+
+# Champs d'un Pokemon (relatifs a son offset)
+HP = 0
+STATUS = 1
+SLEEP_TURNS = 2
+PP = 3
+
+
+class SnapshotLayout:
+    """Disposition de la liste plate pour un combat donne (partagee par les clones)."""
+
+    __slots__ = ("teams", "offsets", "move_counts")
+
+    def __init__(self, team1, team2):
+        self.teams = (tuple(team1), tuple(team2))
+        self.offsets = ([], [])
+        self.move_counts = ([], [])
+        offset = HEADER_SIZE
+        for side, team in enumerate(self.teams):
+            for pokemon in team:
+                self.offsets[side].append(offset)
+                self.move_counts[side].append(len(pokemon.moves))
+                offset += PP + len(pokemon.moves)
+        self.offsets = (tuple(self.offsets[0]), tuple(self.offsets[1]))
+        self.move_counts = (tuple(self.move_counts[0]), tuple(self.move_counts[1]))
+
+    def size(self):
+        """Longueur totale de la liste plate."""
+        if self.offsets[1]:
+            return self.offsets[1][-1] + PP + self.move_counts[1][-1]
+        if self.offsets[0]:
+            return self.offsets[0][-1] + PP + self.move_counts[0][-1]
+        return HEADER_SIZE
+
+    def matches(self, battle):
+        """Verifie que le combat a toujours les memes equipes et les memes moves."""
+        teams = (battle.player1.team, battle.player2.team)
+        for side in (0, 1):
+            if len(teams[side]) != len(self.teams[side]):
+                return False
+            for pokemon, known, count in zip(teams[side], self.teams[side], self.move_counts[side]):
+                if pokemon is not known or len(pokemon.moves) != count:
+                    return False
+        return True
+
+
+class BattleSnapshot:
+    """Etat dynamique d'un combat (PV, PP, statuts, actifs, tour) dans une liste plate.
+
+    Les stats, types et noms ne changent pas pendant un combat et restent sur
+    les objets Pokemon : seule la partie mutable est capturee.
+    """
+
+    __slots__ = ("layout", "data")
+
+    def __init__(self, layout, data):
+        self.layout = layout
+        self.data = data
+
+    # ------------------------------------------------------------------
+    # Conversion depuis / vers Battle
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_battle(cls, battle, layout=None):
+        """Capture l'etat d'un Battle (layout reutilisable pour le meme combat)."""
+        team1, team2 = battle.player1.team, battle.player2.team
+        if layout is None:
+            layout = SnapshotLayout(team1, team2)
+
+        data = [
+            battle.turn_number,
+            int(battle.is_over),
+            cls._winner_code(battle),
+            int(battle._p1_switched),
+            int(battle._p2_switched),
+            cls._index_of(team1, battle.pokemon1),
+            cls._index_of(team2, battle.pokemon2),
+        ]
+        for team in (team1, team2):
+            for pokemon in team:
+                status = pokemon.status
+                if status is None:
+                    data.extend((pokemon.current_hp, 0, 0))
+                else:
+                    code = STATUS_CODES[status.name]
+                    data.extend((
+                        pokemon.current_hp,
+                        code if status.is_active else -code,
+                        getattr(status, "turns_remaining", 0),
+                    ))
+                data.extend(move.current_pp for move in pokemon.moves)
+
+        return cls(layout, data)
+
+    def apply_to(self, battle):
+        """Remet le Battle exactement dans l'etat capture.
+
+        Raises:
+            ValueError: si les equipes du combat ne correspondent plus au snapshot
+        """
+        layout = self.layout
+        if not layout.matches(battle):
+            raise ValueError("Le snapshot ne correspond pas aux equipes de ce combat")
+
+        data = self.data
+        for side, team in enumerate(layout.teams):
+            for pokemon, offset in zip(team, layout.offsets[side]):
+                pokemon.current_hp = data[offset + HP]
+                self._restore_status(pokemon, data[offset + STATUS], data[offset + SLEEP_TURNS])
+                for k, move in enumerate(pokemon.moves):
+                    move.current_pp = data[offset + PP + k]
+
+        team1, team2 = layout.teams
+        battle.turn_number = data[TURN]
+        battle.is_over = bool(data[IS_OVER])
+        battle._p1_switched = bool(data[SWITCHED[0]])
+        battle._p2_switched = bool(data[SWITCHED[1]])
+        battle.pokemon1 = team1[data[ACTIVE[0]]] if data[ACTIVE[0]] >= 0 else None
+        battle.pokemon2 = team2[data[ACTIVE[1]]] if data[ACTIVE[1]] >= 0 else None
+
+        winner = data[WINNER]
+        players = (battle.player1, battle.player2)
+        battle.winner = players[winner - 1] if winner else None
+        battle.loser = players[2 - winner] if winner else None
+
+    def clone(self):
+        """Copie independante (une copie de liste, la disposition est partagee)."""
+        return BattleSnapshot(self.layout, self.data[:])
+
+    def key(self):
+        """Tuple hashable de l'etat (cle de table de transposition)."""
+        return tuple(self.data)
+
+    # ------------------------------------------------------------------
+    # Acces rapides (camp 0 = joueur 1, camp 1 = joueur 2)
+    # ------------------------------------------------------------------
+
+    def active_index(self, side):
+        return self.data[ACTIVE[side]]
+
+    def set_active_index(self, side, index):
+        self.data[ACTIVE[side]] = index
+
+    def hp(self, side, index):
+        return self.data[self.layout.offsets[side][index] + HP]
+
+    def set_hp(self, side, index, value):
+        self.data[self.layout.offsets[side][index] + HP] = value
+
+    def status(self, side, index):
+        """Nom du statut actif du Pokemon, ou None."""
+        code = self.data[self.layout.offsets[side][index] + STATUS]
+        return STATUS_NAMES[code] if code > 0 else None
+
+    def pp(self, side, index, move_index):
+        return self.data[self.layout.offsets[side][index] + PP + move_index]
+
+    def alive_indices(self, side):
+        """Indices des Pokemon non KO d'un camp."""
+        data = self.data
+        return [i for i, offset in enumerate(self.layout.offsets[side]) if data[offset + HP] > 0]
+
+    def __eq__(self, other):
+        return isinstance(other, BattleSnapshot) and self.data == other.data
+
+    def __hash__(self):
+        return hash(self.key())
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _index_of(team, pokemon):
+        for i, member in enumerate(team):
+            if member is pokemon:
+                return i
+        return -1
+
+    @staticmethod
+    def _winner_code(battle):
+        if battle.winner is None:
+            return 0
+        return 1 if battle.winner is battle.player1 else 2
+
+    @staticmethod
+    def _restore_status(pokemon, code, sleep_turns):
+        """Recree le StatusEffect sans passer par son constructeur (qui tire au hasard)."""
+        if code == 0:
+            pokemon.status = None
+            return
+
+        name = STATUS_NAMES[abs(code)]
+        status = pokemon.status
+        if status is None or status.name != name:
+            status = STATUS_FACTORY[name].__new__(STATUS_FACTORY[name])
+            StatusEffect.__init__(status, name)
+            pokemon.status = status
+        status.is_active = code > 0
+        if name == "sleep":
+            status.turns_remaining = sleep_turns
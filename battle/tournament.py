@@ -0,0 +1,189 @@
+"""Tournoi round-robin entre niveaux d'IA, reparti sur plusieurs processus.
+
+Chaque niveau d'IA ("facile", "normal", "difficile") affronte chaque autre
+niveau sur toutes les paires d'equipes de bdd/pokemon.json (une equipe = une
+espece). Les matchups sont decoupes en taches independantes envoyees a un
+ProcessPoolExecutor puis fusionnes dans une matrice de taux de victoire.
+
+Usage :
+    python -m battle.tournament --workers 8 --seed 42
+    python -m battle.tournament --species 30 --repeats 2
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from battle.simulator import AI_LEVELS, DEFAULT_MAX_TURNS, BattleSimulator, SimulationResult
+from config import DEFAULT_LEVEL
+
+
+# Niveaux du tournoi par defaut ("expert" est bien plus lent, a demander via --levels)
+DEFAULT_LEVELS = ("facile", "normal", "difficile")
+
+
+# Simulateur propre a chaque processus worker (cree par _init_worker)
+_worker_simulator = None
+
+
+def _init_worker(level, max_turns):
+    """Initialise le simulateur d'un worker (une seule fois par processus)."""
+    global _worker_simulator
+    _worker_simulator = BattleSimulator(level=level, max_turns=max_turns)
+
+
+def _run_task(task):
+    """Execute une tache : une ligne d'equipes 1 contre toutes les equipes 2.
+
+    La graine de la tache derive de (graine globale, index de tache) : chaque
+    tache a son propre flux aleatoire, quel que soit le worker qui l'execute,
+    donc le tournoi est reproductible quel que soit le nombre de processus.
+    """
+    index, difficulty1, difficulty2, team1_ids, team2_ids, repeats, seed = task
+    rng = random.Random(f"{seed}:{index}")
+    result = SimulationResult()
+
+    start = time.perf_counter()
+    for team1 in team1_ids:
+        for team2 in team2_ids:
+            for _ in range(repeats):
+                winner, turns = _worker_simulator.run_battle(
+                    [team1], [team2], difficulty1, difficulty2,
+                    seed=rng.getrandbits(32),
+                )
+                result.record(winner, turns)
+    result.elapsed = time.perf_counter() - start
+
+    return difficulty1, difficulty2, result
+
+
+class TournamentResult:
+    """Resultats fusionnes du tournoi : un SimulationResult par (IA 1, IA 2)."""
+
+    def __init__(self, levels):
+        self.levels = list(levels)
+        self.matchups = {
+            (d1, d2): SimulationResult()
+            for d1 in self.levels for d2 in self.levels
+        }
+        self.wall_time = 0.0
+
+    def add(self, difficulty1, difficulty2, result):
+        """Fusionne le resultat d'une tache."""
+        self.matchups[(difficulty1, difficulty2)].merge(result)
+
+    def total_battles(self):
+        return sum(r.battles for r in self.matchups.values())
+
+    def win_rate_matrix(self):
+        """Matrice {ligne: {colonne: taux}} : taux de victoire de l'IA ligne contre l'IA colonne.
+
+        L'IA ligne joue en equipe 1 dans les matchups (ligne, colonne) et en
+        equipe 2 dans les matchups (colonne, ligne) : les deux sont cumules.
+        """
+        matrix = {}
+        for row in self.levels:
+            matrix[row] = {}
+            for col in self.levels:
+                as_team1 = self.matchups[(row, col)]
+                as_team2 = self.matchups[(col, row)]
+                battles = as_team1.battles + as_team2.battles
+                wins = as_team1.wins[0] + as_team2.wins[1]
+                if row == col:
+                    # Miroir : les deux camps sont la meme IA
+                    battles, wins = as_team1.battles, as_team1.wins[0]
+                matrix[row][col] = wins / battles if battles else 0.0
+        return matrix
+
+    def format_report(self):
+        """Construit le rapport texte affiche par la CLI."""
+        battles = self.total_battles()
+        rate = battles / self.wall_time if self.wall_time > 0 else 0.0
+        lines = [
+            f"Combats : {battles} en {self.wall_time:.2f}s ({rate:.1f} combats/s)",
+            "",
+            "Taux de victoire (ligne contre colonne) :",
+            " " * 12 + "".join(f"{level:>12}" for level in self.levels),
+        ]
+        matrix = self.win_rate_matrix()
+        for row in self.levels:
+            cells = "".join(f"{matrix[row][col]:>12.1%}" for col in self.levels)
+            lines.append(f"{row:>12}{cells}")
+        return "\n".join(lines)
+
+
+def build_tasks(species_ids, levels, repeats, seed, rows_per_task=4):
+    """Decoupe le tournoi en taches (quelques lignes d'equipes 1 par tache)."""
+    tasks = []
+    for difficulty1, difficulty2 in itertools.product(levels, repeat=2):
+        for start in range(0, len(species_ids), rows_per_task):
+            rows = species_ids[start:start + rows_per_task]
+            tasks.append((len(tasks), difficulty1, difficulty2, rows, species_ids, repeats, seed))
+    return tasks
+
+
+def run_tournament(species_ids=None, levels=DEFAULT_LEVELS, repeats=1, workers=None,
+                   seed=0, level=DEFAULT_LEVEL, max_turns=DEFAULT_MAX_TURNS):
+    """Lance le tournoi complet sur un pool de processus.
+
+    Args:
+        species_ids: especes participantes (toute la BDD locale si None)
+        levels: niveaux d'IA qui s'affrontent
+        repeats: nombre de combats par (equipe 1, equipe 2, IA 1, IA 2)
+        workers: nombre de processus (os.cpu_count() si None)
+        seed: graine globale du tournoi
+
+    Returns:
+        TournamentResult
+    """
+    if species_ids is None:
+        species_ids = BattleSimulator(level=level, max_turns=max_turns).available_ids()
+
+    workers = workers or os.cpu_count() or 1
+    tasks = build_tasks(list(species_ids), levels, repeats, seed)
+    tournament = TournamentResult(levels)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(level, max_turns)) as pool:
+        futures = [pool.submit(_run_task, task) for task in tasks]
+        for future in as_completed(futures):
+            tournament.add(*future.result())
+    tournament.wall_time = time.perf_counter() - start
+
+    return tournament
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tournoi round-robin entre niveaux d'IA.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (defaut : nombre de coeurs)")
+    parser.add_argument("--species", type=int, default=None,
+                        help="limiter aux N premieres especes de la BDD")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="combats par paire d'equipes et de niveaux d'IA")
+    parser.add_argument("--levels", nargs="+", choices=AI_LEVELS, default=list(DEFAULT_LEVELS),
+                        help="niveaux d'IA participants")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    species_ids = BattleSimulator(level=args.level, max_turns=args.max_turns).available_ids()
+    if args.species:
+        species_ids = species_ids[:args.species]
+
+    tournament = run_tournament(
+        species_ids, levels=args.levels, repeats=args.repeats, workers=args.workers,
+        seed=args.seed, level=args.level, max_turns=args.max_turns,
+    )
+
+    print(f"Graine : {args.seed}  |  {len(species_ids)} especes")
+    print(tournament.format_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
 """Constantes globales du jeu Pokemon Battle Arena."""
 
 import os
-import pygame
 
 # --- Ecran ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 TITLE = "Pokemon Battle Arena"
+# "full" : tout l'ecran a chaque frame ; "dirty" : seules les zones modifiees
+# (etats qui le gerent, ex. la carte), quasi rien quand l'image ne change pas
+RENDER_MODE = "full"
 
 # --- Chemins ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
 CACHE_DIR = os.path.join(BASE_DIR, "cache")
+CACHE_BACKEND = "sqlite"  # "sqlite" (cache/cache.sqlite3, WAL) ou "files" (un fichier par entree)
+CACHE_MEMORY_ENTRIES = 1024       # Entrees JSON gardees en memoire devant le disque (LRU)
+CACHE_MEMORY_BYTES = 8 * 1024 * 1024
+ASSET_BUNDLE_PATH = os.path.join(BASE_DIR, "bdd", "assets.pack")  # Archive hors-ligne (python -m api.asset_bundle)
+MAP_CACHE_DIR = os.path.join(CACHE_DIR, "maps")  # Cartes TMX compilees (refaites si le TMX change)
+MAP_COMPILED_CACHE = True  # False : cartes gardees en memoire seulement
 IMAGES_DIR = os.path.join(BASE_DIR, "images")
 
 # --- Police custom (Angie) ---
@@ -34,6 +42,7 @@ ARENA_BACKGROUNDS = [
 API_BASE_URL = "https://pokeapi.co/api/v2"
 SPRITE_URL_FRONT = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{id}.png"
 SPRITE_URL_BACK = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/back/{id}.png"
+API_MAX_WORKERS = 8  # Requetes simultanees max (construction d'equipe, prechargement)
 
 # Pool de Pokemon disponibles (Gen 1)
 AVAILABLE_POKEMON_IDS = list(range(1, 152))
@@ -99,6 +108,11 @@ MOVE_TEXT_RECT = (0, 490, 400, 110)
 
 # --- Taille des sprites ---
 SPRITE_SCALE = 3
+SPRITE_CACHE_BYTES = 32 * 1024 * 1024  # Budget du cache partage des sprites (octets de pixels, LRU)
+MAP_CHUNK_CACHE_BYTES = 8 * 1024 * 1024  # Budget des chunks de carte composes (octets de pixels, LRU)
+
+# --- Carte (deplacements) ---
+TRAINER_SIGHT = 4  # Pas a portee desquels un dresseur repere le joueur et vient a lui (0 = jamais)
 
 def get_font(size):
     """Charge la font Pokemon custom ou fallback sur la font systeme.
@@ -106,6 +120,9 @@ def get_font(size):
     La font PKMN_RBYGSC est une font bitmap : il faut utiliser des tailles
     plus petites que les fonts systeme pour un rendu lisible.
     """
+    # Import local : config doit rester importable sans pygame (simulation headless)
+    import pygame
+
     if GAME_FONT:
         return pygame.font.Font(GAME_FONT, size)
     return pygame.font.Font(None, size)
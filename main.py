@@ -2,8 +2,9 @@
 
 import pygame
 
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE  
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, RENDER_MODE
 from api.client import APIClient
+from api.game_data import get_game_data
 from models.type_chart import TypeChart
 from models.combat import Combat
 from states.state_manager import StateManager
@@ -21,20 +22,26 @@ from states.evolution_state import EvolutionState
 class Game:
     """Classe principale du jeu. Initialise Pygame, gere la boucle de jeu."""
 
-    def __init__(self):
+    def __init__(self, render_mode=RENDER_MODE):
+        """
+        Args:
+            render_mode: "full" (flip a chaque frame) ou "dirty" (zones modifiees)
+        """
         pygame.init()
+        self.render_mode = render_mode
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
 
         # Services partages
-        self.api_client = APIClient()
+        self.game_data = get_game_data()
+        self.api_client = APIClient(game_data=self.game_data)
         self.type_chart = TypeChart()
         self.combat = Combat(self.type_chart)
 
         # State machine
-        self.state_manager = StateManager()
+        self.state_manager = StateManager(game_data=self.game_data)
         self.state_manager.register_state("title", TitleState(self.state_manager))
         self.state_manager.register_state("selection", SelectionState(self.state_manager, self.api_client))
         self.state_manager.register_state("battle", BattleState(self.state_manager, self.type_chart))
@@ -56,12 +63,21 @@ class Game:
             for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.state_manager.invalidate()
 
             self.state_manager.handle_events(events)
             self.state_manager.update(dt)
-            self.state_manager.draw(self.screen)
 
-            pygame.display.flip()
+            if self.render_mode == "dirty":
+                rects = self.state_manager.draw_dirty(self.screen)
+                if rects is None:
+                    pygame.display.flip()
+                elif rects:
+                    pygame.display.update(rects)
+            else:
+                self.state_manager.draw(self.screen)
+                pygame.display.flip()
 
         pygame.quit()
 
@@ -0,0 +1,166 @@
+"""Recherche de chemin sur la carte (A* 4 directions sur la grille de collision).
+
+Les cases bloquees viennent de la CollisionGrid (murs) et de l'EntityIndex
+(Pokemon sauvages, dresseurs). Les chemins trouves sont gardes par (depart,
+arrivee) dans un cache LRU, vide des qu'une entite bouge (EntityIndex.version).
+Le nombre de cases explorees par recherche est borne : des dizaines de
+requetes par frame restent possibles meme sur une grande carte.
+"""
+
+import heapq
+from collections import OrderedDict
+
+
+PATH_CACHE_ENTRIES = 512  # Chemins gardes (LRU)
+PATH_MAX_NODES = 4096     # Cases explorees au plus par recherche (sinon : pas de chemin)
+
+
+class PathFinder:
+    """A* sur une CollisionGrid, en evitant les entites qui bloquent le passage."""
+
+    def __init__(self, grid, entity_index, max_entries=PATH_CACHE_ENTRIES, max_nodes=PATH_MAX_NODES):
+        """
+        Args:
+            grid: CollisionGrid de la carte
+            entity_index: EntityIndex des entites de la carte
+            max_entries: nombre de chemins gardes en cache
+            max_nodes: cases explorees au plus par recherche
+        """
+        self.grid = grid
+        self.entity_index = entity_index
+        self.max_entries = max_entries
+        self.max_nodes = max_nodes
+        self._cache = OrderedDict()  # (depart, arrivee) -> tuple de cases ou None
+        self._neighbors, self._components = self._compile(grid)
+        self._version = None
+        self._occupied = frozenset()
+        self.hits = 0
+        self.misses = 0
+
+    def find_path(self, start, goal):
+        """Chemin de start a goal, cases (x, y) sans le depart, arrivee comprise.
+
+        L'arrivee peut etre occupee par une entite (on marche vers elle pour
+        l'affronter), pas par un mur. Le depart peut etre occupe (l'entite qui
+        se deplace).
+
+        Returns:
+            list | None: [] si start == goal, None si aucun chemin
+        """
+        self._check_version()
+        key = (tuple(start), tuple(goal))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            path = self._cache[key]
+        else:
+            self.misses += 1
+            path = self._search(*key)
+            self._cache[key] = path
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return list(path) if path is not None else None
+
+    def invalidate(self):
+        """Oublie les chemins calcules (obstacles modifies hors de l'EntityIndex)."""
+        self._cache.clear()
+        self._version = None
+
+    def stats(self):
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def _check_version(self):
+        """Vide le cache si une entite a bouge depuis le dernier calcul."""
+        version = self.entity_index.version
+        if version != self._version:
+            self._cache.clear()
+            width = self.grid.width
+            self._occupied = frozenset(
+                y * width + x for x, y in self.entity_index.positions() if self.grid.in_bounds(x, y)
+            )
+            self._version = version
+
+    @staticmethod
+    def _compile(grid):
+        """Voisins libres de chaque case et zones connexes (murs seulement), calcules une fois.
+
+        Deux cases de zones differentes ne sont jamais reliees : la recherche
+        s'arrete tout de suite au lieu d'explorer toute la zone de depart.
+        """
+        width, height = grid.width, grid.height
+        cells = grid.cells
+        neighbors = []
+        for i in range(width * height):
+            x, y = i % width, i // width
+            neighbors.append(tuple(
+                ni for ni, inside in (
+                    (i - 1, x > 0), (i + 1, x < width - 1),
+                    (i - width, y > 0), (i + width, y < height - 1),
+                ) if inside and not cells[ni]
+            ))
+
+        components = [-1] * (width * height)
+        label = 0
+        for seed in range(width * height):
+            if cells[seed] or components[seed] != -1:
+                continue
+            components[seed] = label
+            stack = [seed]
+            while stack:
+                for ni in neighbors[stack.pop()]:
+                    if components[ni] == -1:
+                        components[ni] = label
+                        stack.append(ni)
+            label += 1
+        return neighbors, components
+
+    def _search(self, start, goal):
+        grid = self.grid
+        width, height = grid.width, grid.height
+        sx, sy = start
+        gx, gy = goal
+        if not grid.in_bounds(sx, sy) or not grid.is_free(gx, gy):
+            return None
+        if start == goal:
+            return ()
+
+        start_i = sy * width + sx
+        goal_i = gy * width + gx
+        if self._components[start_i] != self._components[goal_i] and not grid.cells[start_i]:
+            return None
+
+        neighbors = self._neighbors
+        occupied = self._occupied
+
+        # (f, h, case) : a f egal, la case la plus proche de l'arrivee d'abord
+        h = abs(sx - gx) + abs(sy - gy)
+        heap = [(h, h, start_i)]
+        cost = {start_i: 0}
+        came_from = {start_i: -1}
+        closed = set()
+        while heap:
+            _, _, i = heapq.heappop(heap)
+            if i in closed:
+                continue
+            if i == goal_i:
+                path = []
+                while i != start_i:
+                    path.append((i % width, i // width))
+                    i = came_from[i]
+                path.reverse()
+                return tuple(path)
+
+            closed.add(i)
+            if len(closed) > self.max_nodes:
+                return None
+
+            next_cost = cost[i] + 1
+            for ni in neighbors[i]:
+                if ni in occupied and ni != goal_i:
+                    continue
+                if next_cost < cost.get(ni, next_cost + 1):
+                    cost[ni] = next_cost
+                    came_from[ni] = i
+                    nh = abs(ni % width - gx) + abs(ni // width - gy)
+                    heapq.heappush(heap, (next_cost + nh, nh, ni))
+        return None
@@ -3,6 +3,9 @@
 import json
 import os
 
+import numpy as np
+
+from api.pokedex_db import get_pokedex_db
 from config import BASE_DIR
 
 
@@ -12,6 +15,8 @@ class TypeChart:
     def __init__(self):
         self.chart = {}
         self._load_chart()
+        self._build_matrix()
+        self._build_defensive_profiles()
 
     def _load_chart(self):
         """Charge la table de types depuis bdd/types.json (donnees de Manon)."""
@@ -77,13 +82,114 @@ class TypeChart:
                       "dark": 2.0, "steel": 0.5},
         }
 
+    def _build_matrix(self):
+        """Construit la matrice dense attaquant x defenseur et la table type -> index.
+
+        self.matrix est la matrice 18x18 (float32). self._padded_matrix ajoute une
+        ligne et une colonne neutres (1.0) a l'index self.neutral_index : elles
+        servent pour un type inconnu ou l'absence de second type du defenseur.
+        """
+        self.type_names = list(self.chart)
+        self.type_index = {name: i for i, name in enumerate(self.type_names)}
+        self.neutral_index = len(self.type_names)
+
+        size = self.neutral_index + 1
+        padded = np.ones((size, size), dtype=np.float32)
+        for atk_type, relations in self.chart.items():
+            row = self.type_index[atk_type]
+            for def_type, multiplier in relations.items():
+                col = self.type_index.get(def_type)
+                if col is not None:
+                    padded[row, col] = multiplier
+
+        self._padded_matrix = padded
+        self.matrix = padded[:-1, :-1]
+
+    def _build_defensive_profiles(self):
+        """Precalcule le profil defensif de chaque combinaison de types de bdd/pokemon.json.
+
+        Un profil donne, pour chacun des 18 types d'attaque, le multiplicateur
+        subi par un defenseur : {("grass", "poison"): {"fire": 2.0, ...}}.
+        Les deux ordres d'une combinaison double partagent le meme profil.
+        """
+        self._profiles = {}
+
+        pokemon_list = get_pokedex_db().all()
+        if not pokemon_list:
+            return
+
+        for pokemon in pokemon_list:
+            self.get_defensive_profile(pokemon["types"])
+
+    def get_defensive_profile(self, defender_types):
+        """Retourne le profil defensif {type_attaque: multiplicateur} d'un defenseur.
+
+        Les combinaisons absentes de la BDD sont calculees au premier appel puis memorisees.
+        """
+        key = tuple(defender_types)
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = {}
+            for atk_type, attack_chart in self.chart.items():
+                multiplier = 1.0
+                for def_type in key:
+                    multiplier *= attack_chart.get(def_type, 1.0)
+                profile[atk_type] = multiplier
+            self._profiles[key] = profile
+            self._profiles[key[::-1]] = profile
+        return profile
+
+    def encode_types(self, type_names):
+        """Convertit une liste de types en tableau d'index (types inconnus = neutre)."""
+        return np.array(
+            [self.type_index.get(name, self.neutral_index) for name in type_names],
+            dtype=np.intp,
+        )
+
+    def encode_defenders(self, defender_types_list):
+        """Convertit une liste de types de defenseurs en tableau (N, 2) d'index.
+
+        Un defenseur mono-type recoit l'index neutre en seconde colonne.
+        """
+        encoded = np.full((len(defender_types_list), 2), self.neutral_index, dtype=np.intp)
+        for i, defender_types in enumerate(defender_types_list):
+            for j, def_type in enumerate(defender_types[:2]):
+                encoded[i, j] = self.type_index.get(def_type, self.neutral_index)
+        return encoded
+
+    def get_effectiveness_indices(self, move_indices, defender_indices):
+        """Version vectorisee sur des index deja encodes.
+
+        Args:
+            move_indices: tableau (N,) d'index de types d'attaque
+            defender_indices: tableau (N, 2) d'index de types du defenseur
+
+        Returns:
+            np.ndarray: multiplicateurs (N,) en float32
+        """
+        move_indices = np.asarray(move_indices)
+        defender_indices = np.asarray(defender_indices)
+        return (self._padded_matrix[move_indices, defender_indices[:, 0]]
+                * self._padded_matrix[move_indices, defender_indices[:, 1]])
+
+    def get_effectiveness_batch(self, move_types, defender_types_list):
+        """Calcule en un seul appel l'efficacite de N paires (type d'attaque, types du defenseur).
+
+        Args:
+            move_types: liste de N types d'attaque (ex: ["fire", "water"])
+            defender_types_list: liste de N listes de types (ex: [["grass"], ["rock", "ground"]])
+
+        Returns:
+            np.ndarray: multiplicateurs (N,) en float32
+        """
+        return self.get_effectiveness_indices(
+            self.encode_types(move_types),
+            self.encode_defenders(defender_types_list),
+        )
+
     def get_effectiveness(self, move_type, defender_types):
         """Calcule le multiplicateur total d'un type d'attaque contre les types du defenseur."""
-        multiplier = 1.0
-        attack_chart = self.chart.get(move_type, {})
-        for def_type in defender_types:
-            multiplier *= attack_chart.get(def_type, 1.0)
-        return multiplier
+        return self.get_defensive_profile(defender_types).get(move_type, 1.0)
 
     def get_effectiveness_text(self, multiplier):
         """Retourne un texte decrivant l'efficacite."""
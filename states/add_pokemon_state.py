@@ -14,6 +14,7 @@ import os
 import shutil
 
 from states.state import State
+from api.pokedex_db import reload_pokedex_db
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, BG_DARK, WHITE, YELLOW,
                     BLACK, BASE_DIR, get_font)
 
@@ -281,17 +282,14 @@ class AddPokemonState(State):
             types.append(type2)
 
         # --- ETAPE 1 : bdd/pokemon.json ---
-        pokemon_file = os.path.join(BASE_DIR, "bdd", "pokemon.json")
-        with open(pokemon_file, "r", encoding="utf-8") as f:
-            all_pokemon = json.load(f)
-
-        for p in all_pokemon:
-            if p["name"].lower() == name:
-                self.message = f"{name} existe deja !"
-                self.message_timer = 3.0
-                return
+        # Verifications sur le referentiel partage (le JSON n'est relu que pour l'ecriture)
+        game_data = self.state_manager.game_data
+        if game_data.species_by_name(name):
+            self.message = f"{name} existe deja !"
+            self.message_timer = 3.0
+            return
 
-        max_id = max((p["id"] for p in all_pokemon), default=0)
+        max_id = max(game_data, default=0)
         new_id = max_id + 1
 
         # --- Gerer la photo custom ---
@@ -339,10 +337,16 @@ class AddPokemonState(State):
             "height": 10
         }
 
+        pokemon_file = os.path.join(BASE_DIR, "bdd", "pokemon.json")
+        with open(pokemon_file, "r", encoding="utf-8") as f:
+            all_pokemon = json.load(f)
         all_pokemon.append(new_pokemon_bdd)
         with open(pokemon_file, "w", encoding="utf-8") as f:
             json.dump(all_pokemon, f, ensure_ascii=False, indent=4)
 
+        # Recompiler la BDD partagee pour que les autres ecrans voient le nouveau Pokemon
+        reload_pokedex_db()
+
         # --- ETAPE 2 : pokedex.json ---
         pokedex_file = os.path.join(BASE_DIR, "pokedex.json")
         if os.path.exists(pokedex_file):
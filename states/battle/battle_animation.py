@@ -51,6 +51,7 @@ class BattleAnimation:
 
     def update(self, dt):
         """Met a jour les animations."""
+        self._sync_sprites()
         self.text_box.update(dt)
         self.hp_bar_p1.update(dt)
         self.hp_bar_p2.update(dt)
@@ -254,5 +254,6 @@ class BattleLogic:
             self.current_message_index = 0
             self.text_box.set_text(messages[0])
             self.phase = PHASE_SHOW_RESULTS
+            self._ponder_ai()
         else:
             self._enter_action_phase()
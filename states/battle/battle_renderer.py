@@ -9,7 +9,7 @@ from ui.damage_number import DamageNumber
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE,
                     PLAYER_SPRITE_POS, ENEMY_SPRITE_POS,
                     PLAYER_INFO_POS, ENEMY_INFO_POS,
-                    TEXT_BOX_RECT, MOVE_TEXT_RECT, MOVE_MENU_RECT)
+                    TEXT_BOX_RECT, MOVE_TEXT_RECT, MOVE_MENU_RECT, SPRITE_SCALE)
 
 from states.battle.constants import PHASE_ACTION_P1, PHASE_CHOOSE_P1
 
@@ -18,14 +18,37 @@ class BattleRenderer:
     """Methodes de rendu de l'ecran de combat."""
 
     def _load_sprites(self):
-        """Charge les sprites des Pokemon actifs."""
-        self.player_sprite = self.sprite_loader.load_sprite(
-            self.battle.pokemon1.back_sprite_path
-        )
-        self.enemy_sprite = self.sprite_loader.load_sprite(
-            self.battle.pokemon2.front_sprite_path
+        """Demande les sprites des Pokemon actifs et precharge ceux des equipes.
+
+        Le decodage se fait en fond : un placeholder est affiche jusqu'a ce
+        que _sync_sprites() recoive le sprite (aucune saccade au lancement).
+        """
+        self._sprite_requests = {
+            1: self.sprite_loader.request_sprite(self.battle.pokemon1.back_sprite_path),
+            2: self.sprite_loader.request_sprite(self.battle.pokemon2.front_sprite_path),
+        }
+        self._sync_sprites()
+        self._pin_sprites()
+
+        # Remplacants des deux equipes : deja decodes quand ils entreront
+        self.sprite_loader.prefetch(
+            [(p.back_sprite_path, SPRITE_SCALE) for p in self.battle.player1.team]
+            + [(p.front_sprite_path, SPRITE_SCALE) for p in self.battle.player2.team]
         )
 
+    def _sync_sprites(self):
+        """Recupere les sprites decodes en fond (appele chaque frame)."""
+        self.sprite_loader.poll()
+        self.player_sprite = self._sprite_requests[1].surface
+        self.enemy_sprite = self._sprite_requests[2].surface
+
+    def _pin_sprites(self):
+        """Garde les sprites affiches dans le cache partage (jamais evinces)."""
+        self.sprite_loader.pin(self, [
+            (self.battle.pokemon1.back_sprite_path, SPRITE_SCALE),
+            (self.battle.pokemon2.front_sprite_path, SPRITE_SCALE),
+        ])
+
     def _create_ui(self):
         """Cree les widgets UI pour les Pokemon actifs."""
         self.hp_bar_p2 = HPBar(
@@ -41,10 +64,8 @@ class BattleRenderer:
 
     def _refresh_ui_after_switch(self, player_num):
         """Manon : Met a jour les sprites et barres de vie apres un switch."""
-        from battle.ai import AIOpponent
-
         if player_num == 1:
-            self.player_sprite = self.sprite_loader.load_sprite(
+            self._sprite_requests[1] = self.sprite_loader.request_sprite(
                 self.battle.pokemon1.back_sprite_path
             )
             self.hp_bar_p1 = HPBar(
@@ -54,7 +75,7 @@ class BattleRenderer:
             # Angie : reset position sprite
             self.player_sprite_pos = list(PLAYER_SPRITE_POS)
         else:
-            self.enemy_sprite = self.sprite_loader.load_sprite(
+            self._sprite_requests[2] = self.sprite_loader.request_sprite(
                 self.battle.pokemon2.front_sprite_path
             )
             self.hp_bar_p2 = HPBar(
@@ -63,13 +84,11 @@ class BattleRenderer:
             )
             # Angie : reset position sprite
             self.enemy_sprite_pos = list(ENEMY_SPRITE_POS)
-            # Manon : mettre a jour l'IA
+            # Manon : mettre a jour l'IA (meme instance : garde la reflexion en cours)
             if self.ai:
-                self.ai = AIOpponent(
-                    self.battle.pokemon2, self.type_chart,
-                    difficulty=self.ai_difficulty,
-                    team=self.battle.player2.team
-                )
+                self.ai.pokemon = self.battle.pokemon2
+        self._sync_sprites()
+        self._pin_sprites()
 
     def draw(self, surface):
         """Dessine l'ecran de combat complet."""
@@ -6,9 +6,10 @@ import pygame
 from states.state import State
 from battle.battle import Battle
 from battle.ai import AIOpponent
+from battle.mcts import MCTSOpponent, MCTS_DIFFICULTY
 from ui.action_menu import ActionMenu      # Manon
 from ui.team_menu import TeamMenu          # Manon
-from ui.sprite_loader import SpriteLoader
+from ui.sprite_loader import get_sprite_loader
 from ui.sound_manager import sound_manager
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT,
                     PLAYER_SPRITE_POS, ENEMY_SPRITE_POS,
@@ -32,7 +33,7 @@ class BattleState(BattleRenderer, BattleInput, BattleLogic, BattleAnimation, Sta
         self.type_chart = type_chart
         self.battle = None
         self.ai = None
-        self.sprite_loader = SpriteLoader()
+        self.sprite_loader = get_sprite_loader()
 
         self.phase = PHASE_INTRO
         self.hp_bar_p1 = None
@@ -44,6 +45,7 @@ class BattleState(BattleRenderer, BattleInput, BattleLogic, BattleAnimation, Sta
 
         self.player_sprite = None
         self.enemy_sprite = None
+        self._sprite_requests = {}
 
         self.message_queue = []
         self.current_message_index = 0
@@ -107,11 +109,20 @@ class BattleState(BattleRenderer, BattleInput, BattleLogic, BattleAnimation, Sta
 
         # IA si mode PvIA
         self.ai_difficulty = self.state_manager.shared_data.get("ai_difficulty", "normal")
-        if mode == "pvia":
+        if mode == "pvia" and self.ai_difficulty == MCTS_DIFFICULTY:
+            # Reflechit dans un thread pendant l'intro et les messages
+            self.ai = MCTSOpponent(
+                self.battle.pokemon2, self.type_chart,
+                team=self.battle.player2.team,
+                opponent_team=self.battle.player1.team,
+                battle=self.battle, side=2
+            )
+        elif mode == "pvia":
             self.ai = AIOpponent(
                 self.battle.pokemon2, self.type_chart,
                 difficulty=self.ai_difficulty,
-                team=self.battle.player2.team
+                team=self.battle.player2.team,
+                opponent_team=self.battle.player1.team
             )
         else:
             self.ai = None
@@ -164,6 +175,14 @@ class BattleState(BattleRenderer, BattleInput, BattleLogic, BattleAnimation, Sta
         self._attack_missed = False
         self._last_result = None
 
+        self._ponder_ai()
+
+    def exit(self):
+        """Arrete la reflexion de l'IA et relache les sprites en quittant le combat."""
+        if self.ai:
+            self.ai.stop()
+        self.sprite_loader.release(self)
+
     # =========================================================================
     # ORCHESTRATION DES PHASES
     # =========================================================================
@@ -177,6 +196,7 @@ class BattleState(BattleRenderer, BattleInput, BattleLogic, BattleAnimation, Sta
         self.move_p1 = None
         self.move_p2 = None
         self.text_box.set_text(f"Que doit faire {self.battle.pokemon1.name} ?")
+        self._ponder_ai()
 
     def _enter_action_p2(self):
         """Affiche le menu d'action pour le joueur 2."""
@@ -264,3 +284,9 @@ class BattleState(BattleRenderer, BattleInput, BattleLogic, BattleAnimation, Sta
 
         if messages:
             self.text_box.set_text(messages[0])
+        self._ponder_ai()
+
+    def _ponder_ai(self):
+        """Laisse l'IA reflechir pendant les messages si l'etat du combat est stable."""
+        if self.ai and not self.battle.is_over and self.battle.get_fainted_player() is None:
+            self.ai.ponder()
@@ -4,7 +4,7 @@ import math
 import pygame
 
 from states.state import State
-from ui.sprite_loader import SpriteLoader
+from ui.sprite_loader import get_sprite_loader
 from ui.sound_manager import sound_manager
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, YELLOW,
                     BG_DARK, get_font, render_fitted_text)
@@ -23,7 +23,7 @@ class EvolutionState(State):
 
     def __init__(self, state_manager):
         super().__init__(state_manager)
-        self.sprite_loader = SpriteLoader()
+        self.sprite_loader = get_sprite_loader()
 
         # Donnees d'evolution
         self.evolutions_queue = []   # Liste de (pokemon, evo_data, api)
@@ -102,7 +102,9 @@ class EvolutionState(State):
             new_front = api.download_sprite(evo_data["id"], "front")
             self.new_sprite = self.sprite_loader.load_sprite(new_front, scale=4)
         except Exception:
+            new_front = None
             self.new_sprite = None
+        self.sprite_loader.pin(self, [(pokemon.front_sprite_path, 4), (new_front, 4)])
 
         self.new_name = evo_data["name"].title()
 
@@ -145,6 +147,10 @@ class EvolutionState(State):
         """Passe a l'ecran de resultat."""
         self.state_manager.change_state("result")
 
+    def exit(self):
+        """Relache les sprites de l'evolution."""
+        self.sprite_loader.release(self)
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
@@ -1,35 +1,49 @@
 import pygame
-import pytmx
-import json
 import os
 import unicodedata
 import re
 from models.item import ITEMS_DATABASE
-from pytmx.util_pygame import load_pygame
 from states.state import State
 import save_manager
-from config import BASE_DIR, SCREEN_WIDTH, SCREEN_HEIGHT, get_font
+from config import BASE_DIR, SCREEN_WIDTH, SCREEN_HEIGHT, TRAINER_SIGHT, get_font
 from models.player import Player
+from models.map_grid import CollisionGrid, EntityIndex
+from models.pathfinding import PathFinder
+from ui.map_cache import get_map_cache
 from ui.sound_manager import sound_manager
+from ui.tile_map import Camera
 
 TILE_SIZE = 16
 
 class MapState(State):
+    # Rendu par zones modifiees : rien n'est redessine quand le joueur ne bouge pas
+    dirty_rendering = True
+
+    # Delais entre deux pas (secondes) : joueur qui suit un chemin (clic), dresseur qui approche
+    WALK_STEP_DELAY = 0.12
+    TRAINER_STEP_DELAY = 0.2
+
     def __init__(self, state_manager, map_file="assets/maps/route01.tmx"):
         super().__init__(state_manager)
         self.map_file = map_file
-        self.tmx_data = None
+        self.map_data = None  # MapData partagee (ui/map_cache), analysee une fois
         self.player_pos = [1, 1]  # Position du joueur en tiles
         self.player_sprite = None
         self.can_move = True
-        self.all_pokemon = []  # Cache des donnees pokemon
         self.defeated_entities = set() # Noms des dresseurs/pokémons battus + objets ramassés
 
         # Listes d'entités sur la carte
         self.map_trainers = []
         self.map_pokemons = []
         self.map_items = []
-        
+        self.entity_index = EntityIndex()  # Memes entites, indexees par case
+        self.pathfinder = None  # PathFinder sur la grille de collision et ces entites
+
+        # Deplacements automatiques : chemin du joueur (clic) et dresseur qui approche
+        self.walk_path = []
+        self.approaching = None  # (dresseur, chemin restant) ou None
+        self.step_timer = 0
+
         # Sprites
         self.trainer_sprite = None
         self.msg_timer = 0
@@ -50,49 +64,53 @@ class MapState(State):
         self.show_menu_hint = True
         self.menu_hint_timer = 6.0  # secondes
         self.menu_hint_text = "Appuyez sur M pour ouvrir le menu"
-        
+
+        # Couches statiques (image de fond + tuiles) composees par chunks autour
+        # de la camera, gardees tant que le fichier de la carte ne change pas
+        self.tile_map = None
+        self.collision = None  # CollisionGrid compilee de la couche "Collision"
+        self.camera = None
+
+        # Derniere image dessinee (rendu par zones modifiees)
+        self._drawn_scene = None
+        self._drawn_player = None
+
     def enter(self):
         print("Entré dans MapState")
         sound_manager.play_music("pokemontheme.mp3")
-        self.tmx_data = load_pygame(self.map_file)
-        self.width = self.tmx_data.width
-        self.height = self.tmx_data.height
-        
-        # Récupère l'index du calque Collision
-        self.collision_layer_index = None
-        for i, layer in enumerate(self.tmx_data.layers):
-            if layer.name == "Collision":
-                self.collision_layer_index = i
-                break
+        # Carte analysee une seule fois (ou si le fichier TMX a change)
+        self.map_data = get_map_cache().load(self.map_file)
+        self.width = self.map_data.width
+        self.height = self.map_data.height
+        self.tile_map = self.map_data.tile_map
+        self.collision = self.map_data.collision
 
         # Restaurer la position sauvegardee si disponible
         saved_pos = self.state_manager.shared_data.pop("saved_player_pos", None)
         if saved_pos:
             self.player_pos = list(saved_pos)
         else:
-            start_obj = next((o for o in self.tmx_data.objects if o.name == "StartPosition"), None)
-            self.player_pos = [int(start_obj.x // TILE_SIZE), int(start_obj.y // TILE_SIZE)] if start_obj else [1, 1]
+            start = self.map_data.start_position
+            self.player_pos = [int(start[0] // TILE_SIZE), int(start[1] // TILE_SIZE)] if start else [1, 1]
         
-        self.player_sprite = pygame.image.load("assets/sprites/player.png").convert_alpha()
+        # Sprites charges a la premiere entree seulement
+        if self.player_sprite is None:
+            self.player_sprite = pygame.image.load("assets/sprites/player.png").convert_alpha()
+
+            # Charger le sprite dresseur
+            trainer_path = os.path.join(BASE_DIR, "assets", "sprites", "mimi.png")
+            if os.path.exists(trainer_path):
+                img = pygame.image.load(trainer_path).convert_alpha()
+                # Redimensionner un peu pour tenir dans une case (ou un peu plus gros)
+                self.trainer_sprite = pygame.transform.scale(img, (24, 24))
         
-        # Charger le sprite dresseur
-        trainer_path = os.path.join(BASE_DIR, "assets", "sprites", "mimi.png")
-        if os.path.exists(trainer_path):
-            img = pygame.image.load(trainer_path).convert_alpha()
-            # Redimensionner un peu pour tenir dans une case (ou un peu plus gros)
-            self.trainer_sprite = pygame.transform.scale(img, (24, 24))
-        
-        map_pixel_w = self.width * TILE_SIZE
-        map_pixel_h = self.height * TILE_SIZE
-        self.offset_x = (SCREEN_WIDTH - map_pixel_w) // 2
-        self.offset_y = (SCREEN_HEIGHT - map_pixel_h) // 2
-
-        # Charger les donnees pokemon
-        if not self.all_pokemon:
-            pokemon_file = os.path.join(BASE_DIR, "bdd", "pokemon.json")
-            if os.path.exists(pokemon_file):
-                with open(pokemon_file, "r", encoding="utf-8") as f:
-                    self.all_pokemon = json.load(f)
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, self.tile_map.width, self.tile_map.height)
+        self._follow_player()
+
+        self.can_move = True
+        self.walk_path = []
+        self.approaching = None
+        self.step_timer = 0
 
         # Si retour d'un combat, ajouter l'adversaire (s'il y en avait un) aux vaincus
         victorious_over = self.state_manager.shared_data.pop("victorious_over", None)
@@ -101,40 +119,41 @@ class MapState(State):
 
         self._parse_map_entities()
 
+    def _follow_player(self):
+        """Centre la camera sur le joueur (dans les limites de la carte)."""
+        px, py = self.player_pos
+        self.camera.follow(px*TILE_SIZE + TILE_SIZE // 2, py*TILE_SIZE + TILE_SIZE // 2)
+        self.offset_x, self.offset_y = self.camera.offset
+
     def _parse_map_entities(self):
         self.map_trainers = []
         self.map_pokemons = []
         self.map_items = []
-        
-        for group in self.tmx_data.objectgroups:
-            # Note: Le type/class est souvent défini au niveau du groupe entier dans Tiled
-            # ou sur les objets. On va vérifier les deux.
-            for obj in group:
-                obj_class = obj.properties.get('class', obj.properties.get('type', group.properties.get('class', '')))
-                
-                # Attributs natifs si non trouvé dans properties
-                if not obj_class:
-                    obj_class = getattr(obj, 'class', getattr(group, 'class', '')) or getattr(obj, 'type', '')
-
-                # Normaliser
-                cls = str(obj_class).lower()
-                name = str(obj.name)
-                
-                # Ignorer si déjà battu/ramassé
-                if name in self.defeated_entities:
-                    continue
-                
-                x_tile = int(obj.x // TILE_SIZE)
-                y_tile = int(obj.y // TILE_SIZE)
-                
-                entity = {"name": name, "x": x_tile, "y": y_tile, "class": cls}
-                
-                if "dresseur" in cls:
-                    self.map_trainers.append(entity)
-                elif "pokemon" in cls or "sauvage" in cls:
-                    self.map_pokemons.append(entity)
-                elif "objet" in cls or "baie" in cls:
-                    self.map_items.append(entity)
+        self.entity_index = EntityIndex()
+
+        # Entites pre-analysees : on ne refait que le filtrage des vaincus/ramasses
+        for parsed in self.map_data.entities:
+            name = parsed["name"]
+            cls = parsed["class"]
+
+            # Ignorer si déjà battu/ramassé
+            if name in self.defeated_entities:
+                continue
+
+            entity = dict(parsed)
+
+            if "dresseur" in cls:
+                self.map_trainers.append(entity)
+                self.entity_index.add("trainer", entity)
+            elif "pokemon" in cls or "sauvage" in cls:
+                self.map_pokemons.append(entity)
+                self.entity_index.add("pokemon", entity)
+            elif "objet" in cls or "baie" in cls:
+                self.map_items.append(entity)
+                self.entity_index.add("item", entity)
+
+        grid = self.collision or CollisionGrid.empty(self.width, self.height)
+        self.pathfinder = PathFinder(grid, self.entity_index)
 
     def handle_events(self, events):
         for event in events:
@@ -178,6 +197,7 @@ class MapState(State):
                     elif event.key == pygame.K_RIGHT:
                         dx = 1
                     if dx or dy:
+                        self.walk_path = []  # Les fleches reprennent la main
                         self.try_move(dx, dy)
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -191,8 +211,15 @@ class MapState(State):
                         self.menu_active = True
                         self.menu_index = 0
                         continue
+
+                    # Clic sur la carte : le joueur s'y rend
+                    if self.can_move:
+                        self.walk_to_screen_pos(event.pos)
                     
     def update(self, dt):
+        self._update_walking(dt)
+        self._follow_player()
+
         if self.msg_timer > 0:
             self.msg_timer -= dt
             
@@ -214,76 +241,129 @@ class MapState(State):
         if self.is_walkable(nx, ny):
             self.player_pos = [nx, ny]
             self._save_position()
+            self._check_trainer_sight()
+
+    def walk_to_screen_pos(self, pos):
+        """Calcule le chemin du joueur vers la case sous le point pos de l'ecran."""
+        wx, wy = self.camera.screen_to_world(*pos)
+        goal = (wx // TILE_SIZE, wy // TILE_SIZE)
+        path = self.pathfinder.find_path(self.player_pos, goal)
+        if path:
+            self.walk_path = path
+            self.step_timer = 0
+
+    def _update_walking(self, dt):
+        """Avance d'un pas sur le chemin du joueur, ou fait approcher le dresseur qui l'a repere."""
+        if not self.walk_path and not self.approaching:
+            return
+        if self.menu_active:
+            return
+        self.step_timer -= dt
+        if self.step_timer > 0:
+            return
+
+        if self.approaching:
+            self.step_timer = self.TRAINER_STEP_DELAY
+            trainer, path = self.approaching
+            if len(path) <= 1:
+                # A cote du joueur : le combat commence
+                self.approaching = None
+                self.can_move = True
+                self.start_trainer_battle(trainer)
+                return
+            nx, ny = path.pop(0)
+            self.entity_index.move("trainer", trainer, nx, ny)
+            return
+
+        self.step_timer = self.WALK_STEP_DELAY
+        nx, ny = self.walk_path.pop(0)
+        x, y = self.player_pos
+        self.try_move(nx - x, ny - y)
+        if self.player_pos != [nx, ny]:
+            # Bloque ou interaction (combat, objet ramasse) : on s'arrete
+            self.walk_path = []
+
+    def _check_trainer_sight(self):
+        """Un dresseur a portee (TRAINER_SIGHT pas) repere le joueur et marche vers lui."""
+        if TRAINER_SIGHT <= 0 or self.approaching:
+            return
+        px, py = self.player_pos
+        for trainer in self.map_trainers:
+            if abs(trainer["x"] - px) + abs(trainer["y"] - py) > TRAINER_SIGHT:
+                continue
+            path = self.pathfinder.find_path((trainer["x"], trainer["y"]), self.player_pos)
+            if path and len(path) <= TRAINER_SIGHT:
+                self.approaching = (trainer, path)
+                self.walk_path = []
+                self.can_move = False
+                self.step_timer = self.TRAINER_STEP_DELAY
+                self.show_message(f"{trainer['name']} vous a repere !")
+                return
 
     def is_walkable(self, x, y):
         # Vérifie entités (ne pas marcher SUR le dresseur ou le pokemon sauvage)
-        for t in self.map_trainers:
-            if t["x"] == x and t["y"] == y: return False
-        for p in self.map_pokemons:
-            if p["x"] == x and p["y"] == y: return False
-            
-        if self.collision_layer_index is None:
-            return True
-        # Vérifie les limites de la map
-        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+        if self.entity_index.is_occupied(x, y):
             return False
-        gid = self.tmx_data.get_tile_gid(x, y, self.collision_layer_index)
-        return gid == 0
+
+        if self.collision is None:
+            return True
+        # Limites de la map + grille de collision compilee
+        return self.collision.is_free(x, y)
 
     def check_special(self, nx, ny):
         """Si on essaye d'aller sur (nx, ny), déclencher l'entité si présente."""
         # 1. Objet (on marche dessus et on le ramasse)
-        for item in list(self.map_items):
-            if item["x"] == nx and item["y"] == ny:
-                item_name = item["name"]
-                self.show_message(f"Vous avez trouvé : {item_name} !")
-
-                # retirer de la map et marquer comme ramassé
-                self.defeated_entities.add(item_name)
-                self.map_items.remove(item)
-
-                # tenter d'ajouter au sac du joueur
-                player = self.state_manager.shared_data.get("player")
-                # normaliser la clé et rechercher dans DB
-                key = self._normalize_item_key(item_name)
-                item_obj = ITEMS_DATABASE.get(key)
-                if player and hasattr(player, "bag") and item_obj:
-                    player.bag.add_item(item_obj, quantity=1)
-                    print(f"[MapState] Ajouté au sac : {item_obj.name}")
-                else:
-                    # Fallback / debug : si pas de player ou item introuvable
-                    if not player:
-                        print(f"[MapState] Aucun player trouvé pour ajouter l'objet {item_name}.")
-                    if not item_obj:
-                        print(f"[MapState] Item clé '{key}' introuvable dans ITEMS_DATABASE.")
-
-                return False
+        item = self.entity_index.get("item", nx, ny)
+        if item:
+            item_name = item["name"]
+            self.show_message(f"Vous avez trouvé : {item_name} !")
+
+            # retirer de la map et marquer comme ramassé
+            self.defeated_entities.add(item_name)
+            self.map_items.remove(item)
+            self.entity_index.remove("item", item)
+
+            # tenter d'ajouter au sac du joueur
+            player = self.state_manager.shared_data.get("player")
+            # normaliser la clé et rechercher dans DB
+            key = self._normalize_item_key(item_name)
+            item_obj = ITEMS_DATABASE.get(key)
+            if player and hasattr(player, "bag") and item_obj:
+                player.bag.add_item(item_obj, quantity=1)
+                print(f"[MapState] Ajouté au sac : {item_obj.name}")
+            else:
+                # Fallback / debug : si pas de player ou item introuvable
+                if not player:
+                    print(f"[MapState] Aucun player trouvé pour ajouter l'objet {item_name}.")
+                if not item_obj:
+                    print(f"[MapState] Item clé '{key}' introuvable dans ITEMS_DATABASE.")
+
+            return False
 
         # 2. Pokémon Sauvage (Combat)
-        for pkmn in self.map_pokemons:
-            if pkmn["x"] == nx and pkmn["y"] == ny:
-                self.start_wild_battle(pkmn)
-                return True # Bloque le mouvement tant que le combat n'est pas gagné
+        pkmn = self.entity_index.get("pokemon", nx, ny)
+        if pkmn:
+            self.start_wild_battle(pkmn)
+            return True # Bloque le mouvement tant que le combat n'est pas gagné
 
         # 3. Dresseur (Combat IA)
-        for trainer in self.map_trainers:
-            if trainer["x"] == nx and trainer["y"] == ny:
-                self.start_trainer_battle(trainer)
-                return True # Bloque
+        trainer = self.entity_index.get("trainer", nx, ny)
+        if trainer:
+            self.start_trainer_battle(trainer)
+            return True # Bloque
 
         return False # Pas d'interaction
 
     def start_wild_battle(self, pkmn_entity):
         print(f"[MapState] Combat sauvage contre {pkmn_entity['name']}")
-        wild_name = pkmn_entity["name"].lower()
-        if wild_name == "ratata":
-            wild_name = "rattata"
-        wild_data = next((p for p in self.all_pokemon if p["name"] == wild_name), None)
-        
+        # Recherche par nom (alias compris, ex: "Ratata" -> rattata)
+        wild_data = self.state_manager.game_data.species_by_name(pkmn_entity["name"])
+
         if not wild_data:
-            print(f"Erreur : Pokemon {wild_name} introuvable dans bdd.")
+            print(f"Erreur : Pokemon {pkmn_entity['name']} introuvable dans bdd.")
             self.defeated_entities.add(pkmn_entity["name"]) # Éliminer le blocage
             self.map_pokemons.remove(pkmn_entity)
+            self.entity_index.remove("pokemon", pkmn_entity)
             return
 
         # Niveau bas pour le début (3 à 5)
@@ -302,7 +382,7 @@ class MapState(State):
         # Construire une équipe adaptée (ex: 1 pokémon n.5)
         # On donne un Roucool à David et un Rattata à Mimi par exemple
         pkmn_name = "roucool" if trainer_name.lower() == "david" else "rattata"
-        wild_data = next((p for p in self.all_pokemon if p["name"] == pkmn_name), None)
+        wild_data = self.state_manager.game_data.species_by_name(pkmn_name)
         
         trainer_player = Player(name=f"Dresseur {trainer_name}", is_ai=True)
         if wild_data:
@@ -358,19 +438,44 @@ class MapState(State):
             defeated_entities=list(self.defeated_entities)
         )
 
+    def _render_signature(self):
+        """Tout ce qui change l'image de la carte, sauf la position du joueur."""
+        return (
+            (self.offset_x, self.offset_y),  # Camera qui defile : tout l'ecran change
+            tuple((e["x"], e["y"]) for e in self.map_items),
+            tuple((e["x"], e["y"]) for e in self.map_pokemons),
+            tuple((e["x"], e["y"]) for e in self.map_trainers),
+            self.msg_text if self.msg_timer > 0 else None,
+            self.show_menu_hint,
+            self.menu_index if self.menu_active else None,
+        )
+
+    def _player_rect(self, pos):
+        """Zone ecran du sprite joueur a la case pos."""
+        rect = self.player_sprite.get_rect()
+        rect.topleft = (pos[0]*TILE_SIZE + self.offset_x, pos[1]*TILE_SIZE + self.offset_y)
+        return rect
+
+    def draw_dirty(self, screen):
+        """Ne redessine que les cases quittee et atteinte quand seul le joueur a bouge."""
+        scene = self._render_signature()
+        player = tuple(self.player_pos)
+        if scene == self._drawn_scene and player == self._drawn_player:
+            return []
+        if scene != self._drawn_scene or self._drawn_player is None:
+            self.draw(screen)
+            return None
+
+        dirty = self._player_rect(self._drawn_player).union(self._player_rect(player))
+        screen.set_clip(dirty)
+        self.draw(screen)
+        screen.set_clip(None)
+        return [dirty]
+
     def draw(self, screen):   
         screen.fill((0, 0, 0))  # Fond noir 
-        for layer in self.tmx_data.visible_layers:
-            if isinstance(layer, pytmx.TiledImageLayer):
-                if layer.image:
-                    screen.blit(layer.image, (self.offset_x, self.offset_y))
-                
-            elif isinstance(layer, pytmx.TiledTileLayer):
-                for x, y, gid in layer:
-                    if gid != 0:
-                        tile = self.tmx_data.get_tile_image_by_gid(gid)
-                        if tile:
-                            screen.blit(tile, (x*TILE_SIZE + self.offset_x, y*TILE_SIZE + self.offset_y))
+        # Couches statiques : seulement les chunks visibles par la camera
+        self.tile_map.draw(screen, self.camera)
         
         # Dessiner Objets
         for item in self.map_items:
@@ -464,6 +569,9 @@ class MapState(State):
                 if i == self.menu_index:
                     # Petit curseur
                     pygame.draw.circle(screen, (255, 255, 0), (menu_x + 30, start_y + i * 40 + opt_surf.get_height()//2), 5)
+
+        self._drawn_scene = self._render_signature()
+        self._drawn_player = tuple(self.player_pos)
                     
     def _normalize_item_key(self, name: str) -> str:
         """Normalise le nom venant de la map en clé lowercase underscore (baies_ameres)."""
@@ -5,7 +5,8 @@ from states.state import State
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, BG_DARK, WHITE, YELLOW,
                     get_font, BASE_DIR, BTN_AJOUT, BTN_AJOUT_HOVER,
                     BG_POKEDEX, POKEDEX_TITLE_IMG)
-from ui.sprite_loader import SpriteLoader
+from ui.sprite_loader import get_sprite_loader
+from api.asset_bundle import get_asset_bundle
 from ui.button import Button
 from ui.sound_manager import sound_manager
 
@@ -17,7 +18,7 @@ POKEDEX_SPRITE_SIZE = 64
 class PokedexState(State):
     def __init__(self, state_manager):
         super().__init__(state_manager)
-        self.sprite_loader = SpriteLoader()
+        self.sprite_loader = get_sprite_loader()
         self.pokedex_data = []
         self.sprites_cache = {}
         self.return_to = "title"
@@ -26,7 +27,6 @@ class PokedexState(State):
         self.max_scroll = 0
         self.bg_image = None
         self.title_image = None
-        self.bdd_pokemon = []  # Donnees completes depuis bdd/pokemon.json
 
     def enter(self):
         print("Entre dans PokedexState")
@@ -52,16 +52,6 @@ class PokedexState(State):
             print(f"[Pokedex] Image titre introuvable ({e}), fallback texte")
             self.title_image = None
 
-        # ============ CHARGER BDD POKEMON (pour les sprites) ============
-        bdd_file = os.path.join(BASE_DIR, "bdd", "pokemon.json")
-        self.bdd_pokemon = []
-        if os.path.exists(bdd_file):
-            try:
-                with open(bdd_file, "r", encoding="utf-8") as f:
-                    self.bdd_pokemon = json.load(f)
-            except Exception:
-                pass
-
         # ============ CHARGER LE POKEDEX ============
         pokedex_file = os.path.join(BASE_DIR, "pokedex.json")
         self.pokedex_data = []
@@ -134,11 +124,7 @@ class PokedexState(State):
                 continue
 
             # --- CAS 2 & 3 : chercher dans bdd/pokemon.json ---
-            bdd_entry = None
-            for bp in self.bdd_pokemon:
-                if bp["id"] == pk_id:
-                    bdd_entry = bp
-                    break
+            bdd_entry = self.state_manager.game_data.species(pk_id)
 
             if not bdd_entry:
                 continue
@@ -163,10 +149,12 @@ class PokedexState(State):
             filepath = os.path.join(cache_dir, filename)
 
             if not os.path.exists(filepath):
-                try:
-                    urllib.request.urlretrieve(sprite_url, filepath)
-                except Exception:
-                    continue
+                bundle = get_asset_bundle()
+                if not (bundle and bundle.extract_sprite_url(sprite_url, filepath)):
+                    try:
+                        urllib.request.urlretrieve(sprite_url, filepath)
+                    except Exception:
+                        continue
 
             if os.path.exists(filepath):
                 try:
@@ -3,7 +3,7 @@
 import pygame
 
 from states.state import State
-from ui.sprite_loader import SpriteLoader
+from ui.sprite_loader import get_sprite_loader
 from ui.sound_manager import sound_manager
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE,
                     BG_DARK, YELLOW, GREEN, get_font, render_fitted_text)
@@ -14,7 +14,7 @@ class ResultState(State):
 
     def __init__(self, state_manager):
         super().__init__(state_manager)
-        self.sprite_loader = SpriteLoader()
+        self.sprite_loader = get_sprite_loader()
         self.winner = None
         self.winner_sprite = None
         self._font_title = None
@@ -66,6 +66,11 @@ class ResultState(State):
                 )
             except Exception:
                 self.winner_sprite = None
+            self.sprite_loader.pin(self, [(self.winner.front_sprite_path, 4)])
+
+    def exit(self):
+        """Relache le sprite du gagnant."""
+        self.sprite_loader.release(self)
 
     def handle_events(self, events):
         """Entree pour rejouer, Echap pour quitter."""
@@ -1,5 +1,6 @@
 """Ecran de selection des Pokemon - Style Pokedex avec selection multi-Pokemon."""
 
+import queue
 import threading
 import random
 import pygame
@@ -7,14 +8,21 @@ import pygame
 from states.state import State
 from models.player import Player
 from ui.pokemon_card import PokemonCard
-from ui.sprite_loader import SpriteLoader
+from ui.sprite_loader import get_sprite_loader
 from ui.sound_manager import sound_manager
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BG_DARK, YELLOW, AVAILABLE_POKEMON_IDS, render_fitted_text, BG_SELECTION)
-from config import GAME_FONT
+from config import GAME_FONT, API_MAX_WORKERS
 
 
 MAX_TEAM_SIZE = 6  # Nombre max de Pokemon par equipe
 
+# Grille des cartes
+GRID_COLS = 5
+CARD_WIDTH = 140
+CARD_HEIGHT = 170
+CARD_MARGIN = 12
+GRID_START_Y = 90
+
 
 class SelectionState(State):
     """Ecran ou chaque joueur choisit son equipe - Design Pokedex."""
@@ -25,7 +33,7 @@ class SelectionState(State):
     def __init__(self, state_manager, api_client):
         super().__init__(state_manager)
         self.api_client = api_client
-        self.sprite_loader = SpriteLoader()
+        self.sprite_loader = get_sprite_loader()
         self.cards = []
         self.current_player = 1
         # Changement Manon : listes d'IDs au lieu d'un seul ID
@@ -34,6 +42,14 @@ class SelectionState(State):
         self.loading_progress = 0
         self.loading_total = len(AVAILABLE_POKEMON_IDS)
         self.pokemon_previews = []
+
+        # Prechargement des previews : N workers, resultats consommes par update()
+        self.prefetch_workers = API_MAX_WORKERS
+        self._pending_slots = []  # Emplacements de la grille pas encore demandes
+        self._prefetch_lock = threading.Lock()
+        self._preview_queue = queue.Queue()
+        self._prefetch_generation = 0
+        self._card_slots = set()  # Emplacements deja occupes par une carte
         self.scroll_offset = 0
         self.max_scroll = 0
         self._font_title = None
@@ -78,61 +94,125 @@ class SelectionState(State):
 
         self.current_player = 1
         self.selected = {1: [], 2: []}
-        self.loading = True
+        self.loading = False
         self.loading_progress = 0
         self.pokemon_previews = []
         self.cards = []
+        self._card_slots = set()
         self.scroll_offset = 0
 
-        thread = threading.Thread(target=self._load_pokemon_list, daemon=True)
-        thread.start()
+        # La grille a sa taille finale des le depart : les cartes arrivent
+        # dans leur emplacement au fur et a mesure
+        last_rect = self._slot_rect(len(AVAILABLE_POKEMON_IDS) - 1)
+        self.max_scroll = max(0, last_rect.bottom - SCREEN_HEIGHT + 50)
 
-    def _load_pokemon_list(self):
-        """Charge les previews de tous les Pokemon disponibles."""
-        for pokemon_id in AVAILABLE_POKEMON_IDS:
+        self._start_prefetch()
+
+    def exit(self):
+        """Abandonne le prechargement en cours."""
+        with self._prefetch_lock:
+            self._prefetch_generation += 1
+
+    # ------------------------------------------------------------------
+    # Prechargement des previews
+    # ------------------------------------------------------------------
+
+    @property
+    def previews_loading(self):
+        """True tant que toutes les previews ne sont pas arrivees."""
+        return self.loading_progress < self.loading_total
+
+    def _start_prefetch(self):
+        """Lance les workers qui chargent les previews (lignes visibles d'abord)."""
+        self._preview_queue = queue.Queue()
+        with self._prefetch_lock:
+            # Nouvelle generation et nouvelle liste ensemble : un ancien worker
+            # ne peut pas prendre un emplacement de la nouvelle liste
+            self._prefetch_generation += 1
+            generation = self._prefetch_generation
+            self._pending_slots = list(range(len(AVAILABLE_POKEMON_IDS)))
+
+        for _ in range(min(self.prefetch_workers, len(AVAILABLE_POKEMON_IDS))):
+            thread = threading.Thread(
+                target=self._prefetch_worker, args=(generation, self._preview_queue), daemon=True
+            )
+            thread.start()
+
+    def _next_slot(self, generation):
+        """Emplacement suivant a charger : le plus proche de la zone visible.
+
+        None si la liste est vide ou si le worker est d'une generation perimee.
+        """
+        with self._prefetch_lock:
+            if generation != self._prefetch_generation or not self._pending_slots:
+                return None
+            row_height = CARD_HEIGHT + CARD_MARGIN
+            first_row = max(0, (self.scroll_offset + 70 - GRID_START_Y) // row_height)
+            last_row = (self.scroll_offset + SCREEN_HEIGHT - 40 - GRID_START_Y) // row_height
+
+            def distance(slot):
+                row = slot // GRID_COLS
+                if row < first_row:
+                    return first_row - row
+                return max(0, row - last_row)
+
+            slot = min(self._pending_slots, key=lambda s: (distance(s), s))
+            self._pending_slots.remove(slot)
+            return slot
+
+    def _prefetch_worker(self, generation, results):
+        """Worker : charge des previews jusqu'a epuisement (ou changement d'ecran)."""
+        while generation == self._prefetch_generation:
+            slot = self._next_slot(generation)
+            if slot is None:
+                return
+            pokemon_id = AVAILABLE_POKEMON_IDS[slot]
             try:
-                preview = self.api_client.get_pokemon_preview(pokemon_id)
-                self.pokemon_previews.append(preview)
+                results.put((slot, self.api_client.get_pokemon_preview(pokemon_id)))
             except Exception as e:
                 print(f"Erreur chargement Pokemon {pokemon_id}: {e}")
-            self.loading_progress += 1
-
-        self._build_cards()
-        self.loading = False
-
-    def _build_cards(self):
-        """Construit les PokemonCard a partir des previews."""
-        self.cards = []
-        cols = 5
-        card_width = 140
-        card_height = 170
-        margin = 12
-        start_x = (SCREEN_WIDTH - (cols * (card_width + margin) - margin)) // 2
-        start_y = 90
-
-        for i, preview in enumerate(self.pokemon_previews):
-            col = i % cols
-            row = i // cols
-            x = start_x + col * (card_width + margin)
-            y = start_y + row * (card_height + margin)
+            with self._prefetch_lock:
+                if generation == self._prefetch_generation:
+                    self.loading_progress += 1
 
+    def _receive_previews(self):
+        """Cree les cartes des previews arrivees (thread principal : sprites pygame)."""
+        while True:
             try:
-                sprite = self.sprite_loader.load_sprite_small(preview["sprite_path"])
-            except Exception:
-                sprite = None
-
-            # Angie : Passer les stats a la carte pour l'affichage au dos (flip)
-            card = PokemonCard(
-                x, y, card_width, card_height,
-                preview["id"], preview["name"],
-                preview["types"], sprite,
-                preview.get("stats", {})  # <- Les stats pour le flip !
-            )
-            self.cards.append(card)
+                slot, preview = self._preview_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.pokemon_previews.append(preview)
+            self._add_card(slot, preview)
+
+    def _slot_rect(self, slot):
+        """Rectangle de la carte a l'emplacement slot de la grille."""
+        start_x = (SCREEN_WIDTH - (GRID_COLS * (CARD_WIDTH + CARD_MARGIN) - CARD_MARGIN)) // 2
+        col = slot % GRID_COLS
+        row = slot // GRID_COLS
+        x = start_x + col * (CARD_WIDTH + CARD_MARGIN)
+        y = GRID_START_Y + row * (CARD_HEIGHT + CARD_MARGIN)
+        return pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
+
+    def _add_card(self, slot, preview):
+        """Construit la PokemonCard d'une preview a son emplacement."""
+        rect = self._slot_rect(slot)
 
-        if self.cards:
-            last_card = self.cards[-1]
-            self.max_scroll = max(0, last_card.rect.bottom - SCREEN_HEIGHT + 50)
+        try:
+            sprite = self.sprite_loader.load_sprite_small(preview["sprite_path"])
+        except Exception:
+            sprite = None
+
+        # Angie : Passer les stats a la carte pour l'affichage au dos (flip)
+        card = PokemonCard(
+            rect.x, rect.y, rect.width, rect.height,
+            preview["id"], preview["name"],
+            preview["types"], sprite,
+            preview.get("stats", {})  # <- Les stats pour le flip !
+        )
+        card.is_selected = preview["id"] in self.selected[self.current_player]
+        self.cards.append(card)
+        self._card_slots.add(slot)
 
     def handle_events(self, events):
         """Gere la selection par clic."""
@@ -227,10 +307,13 @@ class SelectionState(State):
             try:
                 mode = self.state_manager.shared_data.get("mode", "pvp")
 
+                # Les deux equipes en une fois : requetes en parallele
+                team_size = len(self.selected[1])
+                team = self.api_client.build_team(self.selected[1] + self.selected[2])
+
                 # Construire le Player 1
                 player1 = Player("Joueur 1")
-                for pid in self.selected[1]:
-                    pokemon = self.api_client.build_pokemon(pid)
+                for pokemon in team[:team_size]:
                     player1.add_pokemon(pokemon)
 
                 # Construire le Player 2
@@ -240,13 +323,14 @@ class SelectionState(State):
                         "facile": "Debutant",
                         "normal": "Champion",
                         "difficile": "Maitre",
+                        "expert": "Legende",
+                        "ultime": "Conseil 4",
                     }
                     ai_name = ai_names.get(difficulty, "Champion")
                     player2 = Player(ai_name, is_ai=True)
                 else:
                     player2 = Player("Joueur 2")
-                for pid in self.selected[2]:
-                    pokemon = self.api_client.build_pokemon(pid)
+                for pokemon in team[team_size:]:
                     player2.add_pokemon(pokemon)
 
                 # Passer les Players via shared_data
@@ -268,6 +352,8 @@ class SelectionState(State):
             self.state_manager.shared_data["start_battle"] = False
             self.state_manager.change_state("battle")
 
+        self._receive_previews()
+
         # Angie : Mettre a jour l'animation flip de chaque carte
         for card in self.cards:
             card.update(dt)
@@ -309,6 +395,20 @@ class SelectionState(State):
         surface.blit(title_shadow, (title_x + 2, 22))
         surface.blit(title, (title_x, 20))
 
+        # Emplacements encore en chargement
+        if self.previews_loading:
+            for slot in range(len(AVAILABLE_POKEMON_IDS)):
+                if slot in self._card_slots:
+                    continue
+                draw_rect = self._slot_rect(slot)
+                draw_rect.y -= self.scroll_offset
+                if draw_rect.bottom > 70 and draw_rect.top < SCREEN_HEIGHT - 40:
+                    pygame.draw.rect(surface, (70, 70, 75), draw_rect, 2, border_radius=10)
+
+            # Progression dans le bas du bandeau
+            fill = int(SCREEN_WIDTH * self.loading_progress / max(1, self.loading_total))
+            pygame.draw.rect(surface, YELLOW, (0, 65, fill, 5))
+
         # Cartes Pokemon (avec scroll)
         for card in self.cards:
             draw_rect = card.rect.copy()
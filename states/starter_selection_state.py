@@ -4,7 +4,6 @@ Le joueur commence son aventure en choisissant UN SEUL Pokemon parmi les 3 start
 """
 
 import pygame
-import json
 import os
 import urllib.request
 
@@ -12,7 +11,8 @@ from states.state import State  # Classe de base pour tous les etats
 from models.pokemon import Pokemon  # Classe Pokemon pour creer le starter
 from models.move import Move  # Classe Move pour les attaques
 from models.player import Player  # Classe Player pour le dresseur
-from ui.sprite_loader import SpriteLoader  # Pour charger les sprites Pokemon
+from ui.sprite_loader import get_sprite_loader  # Pour charger les sprites Pokemon
+from api.asset_bundle import get_asset_bundle  # Sprites hors-ligne
 from ui.sound_manager import sound_manager  # Pour la musique
 from config import (
     SCREEN_WIDTH, 
@@ -54,7 +54,7 @@ class StarterSelectionState(State):
         self.selected_index = 0  # Index du starter selectionne (0, 1 ou 2)
         
         # ============ SPRITES ============
-        self.sprite_loader = SpriteLoader()  # Gestionnaire de sprites
+        self.sprite_loader = get_sprite_loader()  # Gestionnaire de sprites partage
         self.starter_sprites = {}  # Dictionnaire {pokemon_id: sprite_surface}
         
         # ============ CACHE DES SPRITES TELECHARGES ============
@@ -151,26 +151,15 @@ class StarterSelectionState(State):
         Charge les donnees des 3 starters depuis bdd/pokemon.json.
         On filtre uniquement les Pokemon avec les IDs 1, 4, 7.
         """
-        # Chemin vers le fichier JSON contenant tous les Pokemon
-        pokemon_file = os.path.join(BASE_DIR, "bdd", "pokemon.json")
-        
-        # Verification que le fichier existe
-        if not os.path.exists(pokemon_file):
-            print(f"[ERREUR] Fichier {pokemon_file} introuvable !")
-            self.starters_data = []
-            return
-        
-        # Chargement du fichier JSON
-        with open(pokemon_file, "r", encoding="utf-8") as f:
-            all_pokemon = json.load(f)
-        
-        # Filtrer pour ne garder que les 3 starters
+        # Referentiel partage (acces direct par id, dans l'ordre :
+        # Bulbizarre, Salameche, Carapuce)
+        game_data = self.state_manager.game_data
         self.starters_data = [
-            poke for poke in all_pokemon if poke["id"] in self.STARTER_IDS
+            game_data[pokemon_id] for pokemon_id in self.STARTER_IDS
+            if pokemon_id in game_data
         ]
-        
-        # Trier pour avoir l'ordre : Bulbizarre, Salameche, Carapuce
-        self.starters_data.sort(key=lambda p: self.STARTER_IDS.index(p["id"]))
+        if not self.starters_data:
+            print("[ERREUR] Aucun starter dans la BDD Pokemon !")
         
         print(f"[StarterSelection] {len(self.starters_data)} starters charges")
     
@@ -198,6 +187,11 @@ class StarterSelectionState(State):
         if os.path.exists(filepath):
             print(f"[StarterSelection] Sprite deja en cache : {filename}")
             return filepath
+
+        # Sinon l'archive d'assets hors-ligne, si elle existe
+        bundle = get_asset_bundle()
+        if bundle and bundle.extract_sprite_url(url, filepath):
+            return filepath
         
         # Telecharger le sprite
         try:
@@ -4,6 +4,10 @@
 class State:
     """Classe de base pour tous les etats (ecrans) du jeu."""
 
+    # Rendu par zones modifiees (config.RENDER_MODE = "dirty") : un etat qui
+    # le gere met dirty_rendering a True et redefinit draw_dirty
+    dirty_rendering = False
+
     def __init__(self, state_manager):
         self.state_manager = state_manager
 
@@ -26,3 +30,13 @@ class State:
     def draw(self, surface):
         """Dessine cet etat a l'ecran."""
         raise NotImplementedError
+
+    def draw_dirty(self, surface):
+        """Dessine seulement ce qui a change depuis la frame precedente.
+
+        Returns:
+            list[pygame.Rect] | None: zones modifiees ([] = rien a afficher),
+            None = tout l'ecran
+        """
+        self.draw(surface)
+        return None
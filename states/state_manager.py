@@ -1,13 +1,22 @@
 """Gestionnaire d'etats du jeu (State Machine)."""
 
+from api.game_data import get_game_data
+
 
 class StateManager:
     """Gere les transitions entre les differents etats du jeu."""
 
-    def __init__(self):
+    def __init__(self, game_data=None):
+        """
+        Args:
+            game_data: referentiel GameData partage par les etats
+                       (celui du processus si None)
+        """
         self.states = {}
         self.current_state = None
         self.shared_data = {}  # Donnees partagees entre etats
+        self.game_data = game_data if game_data is not None else get_game_data()
+        self._full_redraw = True  # Prochain draw_dirty : tout l'ecran
 
     def register_state(self, name, state):
         """Enregistre un etat avec un nom."""
@@ -19,6 +28,7 @@ class StateManager:
             self.current_state.exit()
         self.current_state = self.states[name]
         self.current_state.enter()
+        self._full_redraw = True
 
     def handle_events(self, events):
         """Delegue au state courant."""
@@ -34,3 +44,22 @@ class StateManager:
         """Delegue au state courant."""
         if self.current_state:
             self.current_state.draw(surface)
+
+    def draw_dirty(self, surface):
+        """Rendu par zones modifiees (si le state courant le gere).
+
+        Returns:
+            list[pygame.Rect] | None: zones a mettre a jour ([] = aucune),
+            None = tout l'ecran (changement d'etat, state sans support...)
+        """
+        if not self.current_state:
+            return []
+        if self._full_redraw or not self.current_state.dirty_rendering:
+            self._full_redraw = False
+            self.current_state.draw(surface)
+            return None
+        return self.current_state.draw_dirty(surface)
+
+    def invalidate(self):
+        """Force un rendu complet a la prochaine frame (fenetre re-exposee...)."""
+        self._full_redraw = True
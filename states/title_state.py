@@ -1,8 +1,6 @@
 """Ecran titre / menu principal."""
 
 import pygame
-import json
-import os
 
 from states.state import State
 from ui.button import Button
@@ -10,7 +8,7 @@ from ui.sound_manager import sound_manager
 import save_manager
 from config import (SCREEN_WIDTH, SCREEN_HEIGHT, BLACK, WHITE,
                     BG_DARK, YELLOW, RED, BLUE, get_font,
-                    TITLE_LOGO, BG_MENU, BASE_DIR,
+                    TITLE_LOGO, BG_MENU,
                     BTN_AVENTURE, BTN_AVENTURE_HOVER,
                     BTN_PVP, BTN_PVP_HOVER,
                     BTN_IA, BTN_IA_HOVER,
@@ -149,26 +147,39 @@ class TitleState(State):
 
         self.difficulty_buttons = [
             Button(
-                center_x - diff_btn_width // 2, 300,
+                center_x - diff_btn_width // 2, 275,
                 diff_btn_width, diff_btn_height,
                 image_normal=BTN_FACILE,
                 image_hover=BTN_FACILE_HOVER,
                 hide_text=True
             ),
             Button(
-                center_x - diff_btn_width // 2, 370,
+                center_x - diff_btn_width // 2, 330,
                 diff_btn_width, diff_btn_height,
                 image_normal=BTN_NORMAL,
                 image_hover=BTN_NORMAL_HOVER,
                 hide_text=True
             ),
             Button(
-                center_x - diff_btn_width // 2, 440,
+                center_x - diff_btn_width // 2, 385,
                 diff_btn_width, diff_btn_height,
                 image_normal=BTN_DIFFICILE,
                 image_hover=BTN_DIFFICILE_HOVER,
                 hide_text=True
             ),
+            # Pas d'image pour "expert" : bouton colore
+            Button(
+                center_x - diff_btn_width // 2, 440,
+                diff_btn_width, diff_btn_height,
+                text="EXPERT", font_size=18,
+                color=(112, 48, 160), hover_color=(144, 72, 200)
+            ),
+            Button(
+                center_x - diff_btn_width // 2, 495,
+                diff_btn_width, diff_btn_height,
+                text="ULTIME", font_size=18,
+                color=(40, 40, 40), hover_color=(176, 32, 32)
+            ),
         ]
 
     def handle_events(self, events):
@@ -222,7 +233,7 @@ class TitleState(State):
                         self._show_difficulty = True
 
     def _handle_difficulty_click(self, mouse_pos):
-        difficulties = ["facile", "normal", "difficile"]
+        difficulties = ["facile", "normal", "difficile", "expert", "ultime"]
         for i, button in enumerate(self.difficulty_buttons):
             if button.check_click(mouse_pos, True):
                 sound_manager.play_select()
@@ -232,8 +243,8 @@ class TitleState(State):
                 return
 
     def _handle_difficulty_key(self, event):
-        difficulties = ["facile", "normal", "difficile"]
-        key_map = {pygame.K_1: 0, pygame.K_2: 1, pygame.K_3: 2}
+        difficulties = ["facile", "normal", "difficile", "expert", "ultime"]
+        key_map = {pygame.K_1: 0, pygame.K_2: 1, pygame.K_3: 2, pygame.K_4: 3, pygame.K_5: 4}
 
         if event.key in key_map:
             sound_manager.play_select()
@@ -272,16 +283,16 @@ class TitleState(State):
                 "Choisissez la difficulte", True, WHITE
             )
             sub_x = (SCREEN_WIDTH - subtitle.get_width()) // 2
-            surface.blit(subtitle, (sub_x, 260))
+            surface.blit(subtitle, (sub_x, 235))
 
             for button in self.difficulty_buttons:
                 button.draw(surface)
 
             hint = self.subtitle_font.render(
-                "1 / 2 / 3 ou cliquez | Echap = retour", True, (180, 180, 180)
+                "1 a 5 ou cliquez | Echap = retour", True, (180, 180, 180)
             )
             hint_x = (SCREEN_WIDTH - hint.get_width()) // 2
-            surface.blit(hint, (hint_x, 520))
+            surface.blit(hint, (hint_x, 560))
         else:
             # Logo
             if self.logo_image:
@@ -312,16 +323,8 @@ class TitleState(State):
         player_pos = save_data.get("player_pos", [1, 1])
         defeated_entities = save_data.get("defeated_entities", [])
 
-        # Charger les donnees du starter depuis bdd/pokemon.json
-        pokemon_file = os.path.join(BASE_DIR, "bdd", "pokemon.json")
-        with open(pokemon_file, "r", encoding="utf-8") as f:
-            all_pokemon = json.load(f)
-
-        starter_data = None
-        for poke in all_pokemon:
-            if poke["id"] == starter_id:
-                starter_data = poke
-                break
+        # Donnees du starter depuis le referentiel partage
+        starter_data = self.state_manager.game_data.species(starter_id)
 
         if not starter_data:
             return
@@ -0,0 +1,281 @@
+"""Cartes Tiled analysees une fois et gardees en memoire (et sur disque).
+
+MapState repasse par enter() a chaque retour de combat, du Pokedex ou du sac :
+le XML de la carte n'est analyse et les images des tilesets ne sont chargees
+qu'au premier passage, ou quand le fichier TMX a change. Une forme compilee
+(cache/maps : index JSON, tableaux numpy, tuiles et fonds en PNG) evite aussi
+pytmx au lancement suivant du jeu ; elle est refaite si la date de
+modification du TMX change.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pygame
+import pytmx
+from pytmx.util_pygame import load_pygame
+
+from config import MAP_CACHE_DIR, MAP_COMPILED_CACHE
+from models.map_grid import CollisionGrid
+from ui.tile_map import ChunkedTileMap
+
+
+FORMAT_VERSION = 1
+
+
+class MapData:
+    """Carte prete a l'emploi : couches visibles, collisions et entites.
+
+    Attributes:
+        layers: couches visibles dans l'ordre de la carte, ("image", Surface)
+                ou ("tiles", tableau numpy [y, x] d'indices dans tiles, 0 = vide)
+        tiles: images des tuiles utilisees (tiles[0] = None)
+        entities: objets de la carte {"name", "x", "y", "class"} (en cases),
+                  sans filtrage des entites vaincues/ramassees
+        start_position: position en pixels de l'objet "StartPosition", ou None
+    """
+
+    def __init__(self, path, mtime, width, height, tile_width, tile_height,
+                 layers, tiles, collision, entities, start_position):
+        self.path = path
+        self.mtime = mtime
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.layers = layers
+        self.tiles = tiles
+        self.collision = collision
+        self.entities = entities
+        self.start_position = start_position
+        self._tile_map = None
+
+        self.pixel_width = width * tile_width
+        self.pixel_height = height * tile_height
+        for kind, layer in layers:
+            if kind == "image":
+                self.pixel_width = max(self.pixel_width, layer.get_width())
+                self.pixel_height = max(self.pixel_height, layer.get_height())
+
+    @property
+    def tile_map(self):
+        """Rendu par chunks de la carte (les chunks composes restent d'une entree a l'autre)."""
+        if self._tile_map is None:
+            self._tile_map = ChunkedTileMap(self)
+        return self._tile_map
+
+
+# ----------------------------------------------------------------------
+# Analyse du TMX (pytmx)
+# ----------------------------------------------------------------------
+
+def _object_class(obj, group):
+    """Classe Tiled d'un objet : definie sur l'objet ou sur son groupe."""
+    # Note: Le type/class est souvent defini au niveau du groupe entier dans Tiled
+    # ou sur les objets. On verifie les deux.
+    obj_class = obj.properties.get('class', obj.properties.get('type', group.properties.get('class', '')))
+    # Attributs natifs si non trouve dans properties
+    if not obj_class:
+        obj_class = getattr(obj, 'class', getattr(group, 'class', '')) or getattr(obj, 'type', '')
+    return str(obj_class).lower()
+
+
+def parse_tmx(path, mtime):
+    """Analyse un fichier TMX avec pytmx (charge les images des tilesets)."""
+    tmx_data = load_pygame(path)
+    tile_width = tmx_data.tilewidth
+    tile_height = tmx_data.tileheight
+
+    # Tuiles renumerotees : seulement celles utilisees par les couches visibles
+    tiles = [None]
+    indices = {}
+    layers = []
+    for layer in tmx_data.visible_layers:
+        if isinstance(layer, pytmx.TiledImageLayer):
+            if layer.image:
+                layers.append(("image", layer.image))
+        elif isinstance(layer, pytmx.TiledTileLayer):
+            grid = np.zeros((tmx_data.height, tmx_data.width), dtype=np.uint16)
+            for x, y, gid in layer:
+                if gid == 0:
+                    continue
+                index = indices.get(gid)
+                if index is None:
+                    tile = tmx_data.get_tile_image_by_gid(gid)
+                    index = indices[gid] = len(tiles) if tile else 0
+                    if tile:
+                        tiles.append(tile)
+                grid[y, x] = index
+            layers.append(("tiles", grid))
+
+    entities = []
+    start_position = None
+    for group in tmx_data.objectgroups:
+        for obj in group:
+            if obj.name == "StartPosition" and start_position is None:
+                start_position = (obj.x, obj.y)
+            entities.append({
+                "name": str(obj.name),
+                "x": int(obj.x // tile_width),
+                "y": int(obj.y // tile_height),
+                "class": _object_class(obj, group),
+            })
+
+    return MapData(
+        path, mtime, tmx_data.width, tmx_data.height, tile_width, tile_height,
+        layers, tiles, CollisionGrid.from_tmx(tmx_data), entities, start_position,
+    )
+
+
+# ----------------------------------------------------------------------
+# Forme compilee sur disque
+# ----------------------------------------------------------------------
+
+def _compiled_base(path, cache_dir):
+    """Prefixe des fichiers compiles d'une carte (nom lisible + empreinte du chemin)."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{name}-{digest}")
+
+
+def _as_png(surface):
+    """Copie avec canal alpha : conserve la transparence (colorkey compris) dans le PNG."""
+    out = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    out.blit(surface, (0, 0))
+    return out
+
+
+def save_compiled(map_data, cache_dir=MAP_CACHE_DIR):
+    """Ecrit la forme compilee d'une carte (l'index JSON en dernier : il valide le reste)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    base = _compiled_base(map_data.path, cache_dir)
+
+    # Toutes les tuiles sur une bande horizontale
+    rects = []
+    strip_width = sum(t.get_width() for t in map_data.tiles[1:])
+    strip_height = max((t.get_height() for t in map_data.tiles[1:]), default=0)
+    strip = pygame.Surface((max(1, strip_width), max(1, strip_height)), pygame.SRCALPHA)
+    x = 0
+    for tile in map_data.tiles[1:]:
+        strip.blit(_as_png(tile), (x, 0))
+        rects.append([x, 0, tile.get_width(), tile.get_height()])
+        x += tile.get_width()
+    pygame.image.save(strip, base + "_tiles.png")
+
+    arrays = {}
+    layers = []
+    for i, (kind, layer) in enumerate(map_data.layers):
+        if kind == "image":
+            file_name = f"{os.path.basename(base)}_layer{i}.png"
+            pygame.image.save(_as_png(layer), os.path.join(cache_dir, file_name))
+            layers.append({"kind": "image", "file": file_name})
+        else:
+            arrays[f"layer{i}"] = layer
+            layers.append({"kind": "tiles", "array": f"layer{i}"})
+    if map_data.collision is not None:
+        arrays["collision"] = map_data.collision.blocked
+    np.savez(base + ".npz", **arrays)
+
+    index = {
+        "version": FORMAT_VERSION,
+        "source_mtime": map_data.mtime,
+        "width": map_data.width,
+        "height": map_data.height,
+        "tile_width": map_data.tile_width,
+        "tile_height": map_data.tile_height,
+        "tiles": rects,
+        "layers": layers,
+        "entities": map_data.entities,
+        "start_position": map_data.start_position,
+    }
+    tmp_path = base + ".json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, base + ".json")
+
+
+def load_compiled(path, mtime, cache_dir=MAP_CACHE_DIR):
+    """Carte depuis sa forme compilee, ou None si absente, perimee ou illisible."""
+    base = _compiled_base(path, cache_dir)
+    try:
+        with open(base + ".json", "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != FORMAT_VERSION or index.get("source_mtime") != mtime:
+        return None
+
+    try:
+        strip = pygame.image.load(base + "_tiles.png").convert_alpha()
+        tiles = [None] + [strip.subsurface(rect) for rect in index["tiles"]]
+        with np.load(base + ".npz") as arrays:
+            layers = []
+            for layer in index["layers"]:
+                if layer["kind"] == "image":
+                    image = pygame.image.load(os.path.join(cache_dir, layer["file"])).convert_alpha()
+                    layers.append(("image", image))
+                else:
+                    layers.append(("tiles", arrays[layer["array"]]))
+            collision = CollisionGrid(arrays["collision"]) if "collision" in arrays.files else None
+    except (pygame.error, OSError, ValueError, KeyError) as e:
+        print(f"[MapCache] Forme compilee de {path} illisible ({e})")
+        return None
+
+    start = index["start_position"]
+    return MapData(
+        path, mtime, index["width"], index["height"], index["tile_width"], index["tile_height"],
+        layers, tiles, collision, index["entities"], tuple(start) if start else None,
+    )
+
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+
+class MapCache:
+    """Cartes deja chargees, par chemin ; rechargees si le TMX est modifie."""
+
+    def __init__(self, cache_dir=MAP_CACHE_DIR, use_disk=MAP_COMPILED_CACHE):
+        """
+        Args:
+            cache_dir: dossier de la forme compilee
+            use_disk: lire/ecrire la forme compilee (sinon memoire seule)
+        """
+        self.cache_dir = cache_dir
+        self.use_disk = use_disk
+        self._maps = {}  # chemin absolu -> MapData
+
+    def load(self, map_file):
+        """MapData de la carte (analysee au premier appel ou si le fichier a change)."""
+        path = os.path.abspath(map_file)
+        mtime = os.path.getmtime(path)
+        map_data = self._maps.get(path)
+        if map_data is not None and map_data.mtime == mtime:
+            return map_data
+
+        map_data = load_compiled(path, mtime, self.cache_dir) if self.use_disk else None
+        if map_data is None:
+            map_data = parse_tmx(path, mtime)
+            if self.use_disk:
+                try:
+                    save_compiled(map_data, self.cache_dir)
+                except (OSError, pygame.error) as e:
+                    print(f"[MapCache] Impossible d'ecrire la forme compilee de {path} ({e})")
+        self._maps[path] = map_data
+        return map_data
+
+    def clear(self):
+        self._maps.clear()
+
+
+_shared_cache = None
+
+
+def get_map_cache():
+    """MapCache partage (les cartes restent chargees entre deux entrees dans MapState)."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = MapCache()
+    return _shared_cache
@@ -0,0 +1,254 @@
+"""Atlas de sprites Pokemon : toutes les faces/dos dans quelques grandes planches.
+
+Le builder decode une fois chaque sprite du cache (face et dos de chaque
+espece), le met a l'echelle 1, 2 et 3 et range les resultats dans des planches
+PNG (cache/atlas/sprites_s<echelle>_<n>.png) avec un index des rectangles
+(cache/atlas/sprites.json). Au jeu, SpriteLoader sert des copies de sprites
+decoupees dans ces planches : une planche decodee sert a tous ses sprites au
+lieu de les charger un par un, puis peut etre evincee du cache des surfaces
+(les copies ne partagent pas ses pixels).
+
+    python -m ui.sprite_atlas
+"""
+
+import json
+import os
+import re
+
+import pygame
+
+from config import CACHE_DIR, SPRITE_CACHE_BYTES
+from ui.surface_cache import SurfaceCache
+
+
+ATLAS_DIR = os.path.join(CACHE_DIR, "atlas")
+ATLAS_INDEX = os.path.join(ATLAS_DIR, "sprites.json")
+ATLAS_SCALES = (1, 2, 3)
+SHEET_SIZE = 2048
+PADDING = 1  # Evite que le filtrage deborde sur le sprite voisin
+
+FORMAT_VERSION = 1
+
+# Noms des fichiers de sprites du jeu -> cle "<id>_<front|back>"
+#   cache/sprites/4_back.png, cache/starter_sprites/pokemon_back_4.png
+_CACHE_NAME = re.compile(r"^(\d+)_(front|back)\.png$")
+_STARTER_NAME = re.compile(r"^pokemon_(back_)?(\d+)\.png$")
+
+
+def atlas_key_for_path(file_path):
+    """Cle d'atlas d'un chemin de sprite du jeu, ou None si ce n'est pas un sprite PokeAPI."""
+    name = os.path.basename(file_path)
+    match = _CACHE_NAME.match(name)
+    if match:
+        return f"{match.group(1)}_{match.group(2)}"
+    match = _STARTER_NAME.match(name)
+    if match:
+        return f"{match.group(2)}_{'back' if match.group(1) else 'front'}"
+    return None
+
+
+# ----------------------------------------------------------------------
+# Construction
+# ----------------------------------------------------------------------
+
+def pack_shelves(sizes, sheet_size=SHEET_SIZE, padding=PADDING):
+    """Range des rectangles en etageres dans des planches carrees.
+
+    Args:
+        sizes: dict {cle: (largeur, hauteur)}
+
+    Returns:
+        tuple: (placements {cle: (planche, x, y)}, tailles utilisees [(l, h)] par planche)
+    """
+    placements = {}
+    sheets = []
+    x = y = shelf_height = 0
+    width_used = 0
+
+    def close_sheet():
+        sheets.append((width_used, y + shelf_height))
+
+    order = sorted(sizes, key=lambda k: (-sizes[k][1], k))
+    for key in order:
+        w, h = sizes[key]
+        if w + padding > sheet_size or h + padding > sheet_size:
+            raise ValueError(f"Sprite {key} trop grand pour une planche ({w}x{h})")
+        if x + w > sheet_size:
+            # Etagere suivante
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        if y + h > sheet_size:
+            close_sheet()
+            x = y = shelf_height = width_used = 0
+        placements[key] = (len(sheets), x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        width_used = max(width_used, x - padding)
+    if placements:
+        close_sheet()
+    return placements, sheets
+
+
+def build_atlas(sprite_paths, atlas_dir=ATLAS_DIR, scales=ATLAS_SCALES, sheet_size=SHEET_SIZE):
+    """Construit les planches et l'index a partir de {cle: chemin du PNG}.
+
+    Returns:
+        dict: l'index ecrit dans sprites.json
+    """
+    os.makedirs(atlas_dir, exist_ok=True)
+
+    images = {}
+    for key, path in sorted(sprite_paths.items()):
+        try:
+            images[key] = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"[SpriteAtlas] {path} ignore ({e})")
+
+    index = {"version": FORMAT_VERSION, "scales": {}}
+    for scale in scales:
+        sizes = {k: (img.get_width() * scale, img.get_height() * scale) for k, img in images.items()}
+        placements, sheet_sizes = pack_shelves(sizes, sheet_size)
+
+        sheets = [pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA) for w, h in sheet_sizes]
+        rects = {}
+        for key, (sheet, x, y) in placements.items():
+            w, h = sizes[key]
+            scaled = pygame.transform.scale(images[key], (w, h))
+            sheets[sheet].blit(scaled, (x, y))
+            rects[key] = [sheet, x, y, w, h]
+
+        names = []
+        for i, sheet in enumerate(sheets):
+            name = f"sprites_s{scale}_{i}.png"
+            pygame.image.save(sheet, os.path.join(atlas_dir, name))
+            names.append(name)
+        index["scales"][str(scale)] = {"sheets": names, "rects": rects}
+
+    tmp_path = os.path.join(atlas_dir, "sprites.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, os.path.join(atlas_dir, "sprites.json"))
+    return index
+
+
+def collect_sprite_paths(cache, pokemon_ids):
+    """Chemins des sprites face/dos disponibles dans le cache pour ces especes."""
+    paths = {}
+    for pokemon_id in pokemon_ids:
+        for side in ("front", "back"):
+            path = cache.get_sprite_path(pokemon_id, side)
+            if path:
+                paths[f"{pokemon_id}_{side}"] = path
+    return paths
+
+
+# ----------------------------------------------------------------------
+# Lecture
+# ----------------------------------------------------------------------
+
+class SpriteAtlas:
+    """Index de l'atlas ; les planches sont decodees au premier sprite demande.
+
+    Les planches decodees sont des entrees du cache de surfaces (comptees a
+    leur vraie taille, evincables) : SpriteLoader y partage le sien.
+    """
+
+    def __init__(self, index, atlas_dir=ATLAS_DIR, cache=None):
+        """
+        Args:
+            cache: SurfaceCache ou garder les planches decodees (un cache
+                   dedie de SPRITE_CACHE_BYTES si None)
+        """
+        self.atlas_dir = atlas_dir
+        self._scales = {int(scale): data for scale, data in index["scales"].items()}
+        self.cache = cache if cache is not None else SurfaceCache(SPRITE_CACHE_BYTES)
+
+    @staticmethod
+    def sheet_key(scale, sheet_index):
+        """Cle d'une planche dans le cache de surfaces."""
+        return ("atlas", scale, sheet_index)
+
+    @classmethod
+    def open(cls, atlas_dir=ATLAS_DIR, cache=None):
+        """Ouvre l'atlas, ou None s'il n'a pas ete construit."""
+        path = os.path.join(atlas_dir, "sprites.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != FORMAT_VERSION:
+            return None
+        return cls(index, atlas_dir, cache)
+
+    @property
+    def scales(self):
+        return sorted(self._scales)
+
+    def __contains__(self, key):
+        return any(key in data["rects"] for data in self._scales.values())
+
+    def get(self, key, scale):
+        """Copie du sprite a cette echelle, ou None s'il n'est pas dans l'atlas.
+
+        La copie a ses propres pixels : la planche peut etre evincee ensuite.
+        """
+        data = self._scales.get(scale)
+        if data is None:
+            return None
+        rect = data["rects"].get(key)
+        if rect is None:
+            return None
+        sheet_index, x, y, w, h = rect
+        sheet = self.cache.get(self.sheet_key(scale, sheet_index))
+        if sheet is None:
+            raw = self.decode_sheet(scale, sheet_index)
+            if raw is None:
+                return None
+            sheet = self.add_sheet(scale, sheet_index, raw)
+        return sheet.subsurface((x, y, w, h)).copy()
+
+    def sheet_of(self, key, scale):
+        """Numero de la planche contenant le sprite a cette echelle, ou None."""
+        data = self._scales.get(scale)
+        rect = data["rects"].get(key) if data else None
+        return rect[0] if rect else None
+
+    def is_sheet_loaded(self, scale, sheet_index):
+        return self.sheet_key(scale, sheet_index) in self.cache
+
+    def decode_sheet(self, scale, sheet_index):
+        """Decode une planche sans la convertir (utilisable hors du thread d'affichage)."""
+        path = os.path.join(self.atlas_dir, self._scales[scale]["sheets"][sheet_index])
+        try:
+            return pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"[SpriteAtlas] Planche {path} illisible ({e})")
+            return None
+
+    def add_sheet(self, scale, sheet_index, raw):
+        """Convertit (thread d'affichage) et met en cache une planche decodee par decode_sheet."""
+        sheet = raw.convert_alpha()
+        self.cache.put(self.sheet_key(scale, sheet_index), sheet)
+        return sheet
+
+
+def main():
+    from api.asset_bundle import get_asset_bundle
+    from api.cache import Cache
+    from api.game_data import get_game_data
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+
+    cache = Cache(CACHE_DIR, bundle=get_asset_bundle())
+    paths = collect_sprite_paths(cache, list(get_game_data()))
+    index = build_atlas(paths)
+    for scale, data in index["scales"].items():
+        print(f"echelle {scale} : {len(data['rects'])} sprites, {len(data['sheets'])} planche(s)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,80 @@
 """Chargement et mise a l'echelle des sprites Pokemon."""
 
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
 import pygame
 
-from config import SPRITE_SCALE
+from config import SPRITE_SCALE, SPRITE_CACHE_BYTES
+from ui.sprite_atlas import SpriteAtlas, atlas_key_for_path
+from ui.surface_cache import SurfaceCache
 
 
 class SpriteLoader:
-    """Charge et met a l'echelle les sprites pour Pygame."""
+    """Charge et met a l'echelle les sprites pour Pygame.
+
+    Les sprites PokeAPI presents dans l'atlas (python -m ui.sprite_atlas) sont
+    decoupes dans ses planches ; les autres sont charges fichier par fichier.
+    Les surfaces renvoyees sont partagees : a ne pas modifier.
+
+    Le cache des surfaces est borne (SPRITE_CACHE_BYTES, LRU) et contient
+    aussi les planches de l'atlas decodees, comptees a leur vraie taille ; les
+    ecrans epinglent les sprites qu'ils affichent avec pin() pour les garder.
+
+    request_sprite() decode et met a l'echelle dans un thread de fond : le
+    sprite recu est un placeholder jusqu'a ce que poll() (thread d'affichage,
+    une fois par frame) y place la surface finale.
+    """
+
+    DECODE_WORKERS = 2
+
+    def __init__(self, atlas=None, max_bytes=SPRITE_CACHE_BYTES):
+        """
+        Args:
+            atlas: SpriteAtlas a utiliser (celui de cache/atlas, ouvert au
+                   premier sprite, si None) ; ses planches vont dans le
+                   cache des surfaces du loader
+            max_bytes: budget en octets de pixels du cache des surfaces
+        """
+        self.cache = SurfaceCache(max_bytes)
+        self._atlas = atlas
+        if atlas is not None:
+            atlas.cache = self.cache
+        self._atlas_checked = atlas is not None
 
-    def __init__(self):
-        self.cache = {}
+        # Decodage asynchrone : requetes en cours par cle, resultats a convertir
+        self._executor = None
+        self._pending = {}
+        self._pending_sheets = {}  # (echelle, planche) -> cles des requetes qui l'attendent
+        self._decoded = queue.Queue()
+        self._placeholders = {}
+
+    @property
+    def atlas(self):
+        if not self._atlas_checked:
+            self._atlas = SpriteAtlas.open(cache=self.cache)
+            self._atlas_checked = True
+        return self._atlas
 
     def load_sprite(self, file_path, scale=SPRITE_SCALE):
         """Charge un sprite, le scale en nearest-neighbor pour un look pixel art."""
-        
+
         if not file_path:
             # Retourner une surface vide plutôt que de planter
             placeholder = pygame.Surface((96, 96), pygame.SRCALPHA)
             placeholder.fill((200, 50, 200, 180))  # Violet = sprite manquant visible
             return placeholder
-        
+
         cache_key = f"{file_path}_{scale}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        sprite = self.cache.get(cache_key)
+        if sprite is not None:
+            return sprite
+
+        sprite = self._load_from_atlas(file_path, scale)
+        if sprite is not None:
+            self.cache.put(cache_key, sprite)
+            return sprite
 
         try:
             sprite = pygame.image.load(file_path).convert_alpha()
@@ -31,14 +83,195 @@ class SpriteLoader:
             placeholder = pygame.Surface((96, 96), pygame.SRCALPHA)
             placeholder.fill((200, 50, 200, 180))
             return placeholder
-        
+
         width = sprite.get_width() * scale
         height = sprite.get_height() * scale
         sprite = pygame.transform.scale(sprite, (width, height))
 
-        self.cache[cache_key] = sprite
+        self.cache.put(cache_key, sprite)
         return sprite
 
+    def _load_from_atlas(self, file_path, scale):
+        """Sprite depuis l'atlas (echelle pre-calculee, ou mise a l'echelle de l'echelle 1)."""
+        atlas = self.atlas
+        if atlas is None:
+            return None
+        key = atlas_key_for_path(file_path)
+        if key is None:
+            return None
+        sprite = atlas.get(key, scale)
+        if sprite is not None:
+            return sprite
+        base = atlas.get(key, 1)
+        if base is None:
+            return None
+        return pygame.transform.scale(base, (base.get_width() * scale, base.get_height() * scale))
+
     def load_sprite_small(self, file_path, scale=2):
         """Charge un sprite avec un scale plus petit (pour l'ecran de selection)."""
         return self.load_sprite(file_path, scale)
+
+    # ------------------------------------------------------------------
+    # Chargement asynchrone
+    # ------------------------------------------------------------------
+
+    def request_sprite(self, file_path, scale=SPRITE_SCALE):
+        """Demande un sprite sans bloquer la frame.
+
+        Returns:
+            SpriteRequest: .surface est le sprite s'il est deja disponible,
+            sinon un placeholder remplace par poll() quand le decodage est fini.
+        """
+        cache_key = f"{file_path}_{scale}"
+        if not file_path:
+            return SpriteRequest(file_path, scale, self.load_sprite(file_path, scale), ready=True)
+
+        sprite = self.cache.get(cache_key)
+        if sprite is not None:
+            return SpriteRequest(file_path, scale, sprite, ready=True)
+
+        request = self._pending.get(cache_key)
+        if request is not None:
+            return request
+
+        # Planche de l'atlas deja decodee : decouper le sprite ne coute presque rien
+        atlas = self.atlas
+        key = atlas_key_for_path(file_path) if atlas else None
+        sheet = atlas.sheet_of(key, scale) if key else None
+        if sheet is not None and atlas.is_sheet_loaded(scale, sheet):
+            return SpriteRequest(file_path, scale, self.load_sprite(file_path, scale), ready=True)
+
+        request = SpriteRequest(file_path, scale, self._placeholder(scale))
+        self._pending[cache_key] = request
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.DECODE_WORKERS, thread_name_prefix="sprites"
+            )
+        if sheet is not None and not os.path.exists(file_path):
+            # Sprite seulement dans l'atlas : un seul decodage par planche,
+            # partage par toutes les requetes qui l'attendent
+            waiting = self._pending_sheets.get((scale, sheet))
+            if waiting is None:
+                self._pending_sheets[(scale, sheet)] = [cache_key]
+                self._executor.submit(self._decode_sheet, scale, sheet)
+            else:
+                waiting.append(cache_key)
+        else:
+            self._executor.submit(self._decode, cache_key, file_path, scale)
+        return request
+
+    def prefetch(self, sprites):
+        """Lance le decodage de sprites qui seront affiches plus tard : liste de (file_path, scale)."""
+        for file_path, scale in sprites:
+            if file_path:
+                self.request_sprite(file_path, scale)
+
+    def poll(self):
+        """Termine les decodages finis (conversion pour l'affichage). Appele chaque frame.
+
+        Returns:
+            int: nombre de sprites devenus disponibles
+        """
+        done = 0
+        while True:
+            try:
+                kind, key, raw = self._decoded.get_nowait()
+            except queue.Empty:
+                return done
+
+            if kind == "sheet":
+                scale, sheet = key
+                if raw is not None and not self.atlas.is_sheet_loaded(scale, sheet):
+                    self.atlas.add_sheet(scale, sheet, raw)
+                cache_keys = self._pending_sheets.pop(key, [])
+            else:
+                cache_keys = [key]
+
+            for cache_key in cache_keys:
+                request = self._pending.pop(cache_key, None)
+                if request is None:
+                    continue
+                if kind == "surface":
+                    sprite = raw.convert_alpha()
+                    self.cache.put(cache_key, sprite)
+                else:
+                    # Planche chargee (ou illisible, fichier absent) : chargement
+                    # normal, placeholder violet + message en cas d'echec
+                    sprite = self.load_sprite(request.file_path, request.scale)
+                request.surface = sprite
+                request.ready = True
+                done += 1
+
+    def _decode(self, cache_key, file_path, scale):
+        """Thread de fond : decode un fichier sans toucher a l'affichage (pas de convert)."""
+        try:
+            if os.path.exists(file_path):
+                image = pygame.image.load(file_path)
+                size = (image.get_width() * scale, image.get_height() * scale)
+                self._decoded.put(("surface", cache_key, pygame.transform.scale(image, size)))
+                return
+        except Exception as e:
+            print(f"[SpriteLoader] Decodage de '{file_path}' impossible: {e}")
+        self._decoded.put(("missing", cache_key, None))
+
+    def _decode_sheet(self, scale, sheet):
+        """Thread de fond : decode une planche de l'atlas (sans convert)."""
+        raw = None
+        try:
+            raw = self.atlas.decode_sheet(scale, sheet)
+        except Exception as e:
+            print(f"[SpriteLoader] Decodage de la planche {sheet} (x{scale}) impossible: {e}")
+        self._decoded.put(("sheet", (scale, sheet), raw))
+
+    def _placeholder(self, scale):
+        """Silhouette discrete affichee pendant le decodage (partagee par echelle)."""
+        placeholder = self._placeholders.get(scale)
+        if placeholder is None:
+            size = 96 * scale
+            placeholder = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.ellipse(
+                placeholder, (0, 0, 0, 60),
+                (size // 4, size * 3 // 4, size // 2, size // 8)
+            )
+            self._placeholders[scale] = placeholder
+        return placeholder
+
+    def pin(self, owner, sprites):
+        """Epingle les sprites affiches par owner : liste de (file_path, scale).
+
+        Remplace les sprites precedemment epingles par owner.
+        """
+        self.cache.set_pinned(
+            owner, [f"{file_path}_{scale}" for file_path, scale in sprites if file_path]
+        )
+
+    def release(self, owner):
+        """Relache tous les sprites epingles par owner."""
+        self.cache.set_pinned(owner, [])
+
+    def stats(self):
+        """Compteurs du cache des surfaces (hits, misses, octets, evictions...)."""
+        return self.cache.stats()
+
+
+class SpriteRequest:
+    """Sprite demande a SpriteLoader.request_sprite (surface = placeholder tant que not ready)."""
+
+    __slots__ = ("file_path", "scale", "surface", "ready")
+
+    def __init__(self, file_path, scale, surface, ready=False):
+        self.file_path = file_path
+        self.scale = scale
+        self.surface = surface
+        self.ready = ready
+
+
+_shared_loader = None
+
+
+def get_sprite_loader():
+    """SpriteLoader partage par tous les ecrans (un seul decodage par sprite)."""
+    global _shared_loader
+    if _shared_loader is None:
+        _shared_loader = SpriteLoader()
+    return _shared_loader
@@ -0,0 +1,112 @@
+"""Cache de surfaces pygame borne en memoire (LRU sur les octets de pixels)."""
+
+from collections import OrderedDict
+
+from config import SPRITE_CACHE_BYTES
+
+
+def surface_bytes(surface):
+    """Octets de pixels d'une surface (largeur x hauteur x octets par pixel)."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class SurfaceCache:
+    """Surfaces indexees par cle, evincees de la moins recemment utilisee a la plus recente
+    quand le total depasse max_bytes.
+
+    Les entrees epinglees (sprites a l'ecran) ne sont jamais evincees. Chaque
+    proprietaire (un etat du jeu) declare son ensemble de cles epinglees avec
+    set_pinned ; une cle reste epinglee tant qu'un proprietaire la garde.
+    """
+
+    def __init__(self, max_bytes=SPRITE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # cle -> (surface, octets)
+        self._bytes = 0
+        self._pins = {}  # cle -> nombre de proprietaires
+        self._owners = {}  # id(proprietaire) -> set de cles
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def get(self, key):
+        """Surface cachee (devient la plus recente), ou None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, surface, size=None):
+        """Ajoute une surface puis evince les plus anciennes non epinglees si besoin.
+
+        Args:
+            size: octets comptes (surface_bytes(surface) si None)
+        """
+        if size is None:
+            size = surface_bytes(surface)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (surface, size)
+        self._bytes += size
+        self._evict()
+
+    def set_pinned(self, owner, keys):
+        """Remplace les cles epinglees par owner (liste vide = tout relacher)."""
+        new_keys = set(keys)
+        old_keys = self._owners.pop(id(owner), set())
+        for key in old_keys - new_keys:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+        for key in new_keys - old_keys:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        if new_keys:
+            self._owners[id(owner)] = new_keys
+        self._evict()
+
+    def is_pinned(self, key):
+        return key in self._pins
+
+    def clear(self):
+        """Vide le cache (les entrees epinglees restent)."""
+        for key in [k for k in self._entries if k not in self._pins]:
+            self._bytes -= self._entries.pop(key)[1]
+
+    def stats(self):
+        """Compteurs et occupation du cache."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "pinned": len(self._pins),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key in self._pins:
+                continue
+            self._bytes -= self._entries.pop(key)[1]
+            self.evictions += 1
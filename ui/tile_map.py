@@ -0,0 +1,128 @@
+"""Rendu des cartes Tiled par morceaux (chunks) avec camera qui suit le joueur.
+
+Seuls les chunks proches de la camera sont composes (image de fond + couches
+de tuiles) et gardes dans un cache LRU borne en octets : la memoire et le
+temps par frame ne dependent pas de la taille de la carte.
+"""
+
+import pygame
+
+from config import MAP_CHUNK_CACHE_BYTES
+from ui.surface_cache import SurfaceCache
+
+
+CHUNK_TILES = 16  # Cote d'un chunk en tuiles
+
+
+class Camera:
+    """Fenetre d'affichage sur le monde (coordonnees en pixels de la carte).
+
+    Suit une position en restant dans les limites de la carte ; sur un axe ou
+    la carte est plus petite que l'ecran, elle est centree.
+    """
+
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    @staticmethod
+    def _axis(center, view, world):
+        if world <= view:
+            return -((view - world) // 2)
+        return max(0, min(center - view // 2, world - view))
+
+    def follow(self, x, y):
+        """Centre la camera sur le point (x, y) du monde."""
+        self.x = self._axis(x, self.view_width, self.world_width)
+        self.y = self._axis(y, self.view_height, self.world_height)
+
+    @property
+    def offset(self):
+        """Position a l'ecran de l'origine du monde."""
+        return -self.x, -self.y
+
+    def world_to_screen(self, x, y):
+        return x - self.x, y - self.y
+
+    def screen_to_world(self, x, y):
+        return x + self.x, y + self.y
+
+
+class ChunkedTileMap:
+    """Couches visibles d'une carte (MapData), composees par chunks a la demande."""
+
+    def __init__(self, map_data, chunk_tiles=CHUNK_TILES, max_bytes=MAP_CHUNK_CACHE_BYTES):
+        self.map_data = map_data
+        self.tile_width = map_data.tile_width
+        self.tile_height = map_data.tile_height
+        self.chunk_tiles = chunk_tiles
+        self.chunk_width = chunk_tiles * self.tile_width
+        self.chunk_height = chunk_tiles * self.tile_height
+        self.width = map_data.pixel_width
+        self.height = map_data.pixel_height
+        self.chunks = SurfaceCache(max_bytes)
+        self._visible = []
+
+    def draw(self, screen, camera):
+        """Dessine les chunks visibles par la camera."""
+        left = max(0, camera.x)
+        top = max(0, camera.y)
+        right = min(self.width, camera.x + camera.view_width)
+        bottom = min(self.height, camera.y + camera.view_height)
+        if right <= left or bottom <= top:
+            return
+        visible = [
+            (cx, cy)
+            for cy in range(top // self.chunk_height, (bottom - 1) // self.chunk_height + 1)
+            for cx in range(left // self.chunk_width, (right - 1) // self.chunk_width + 1)
+        ]
+        if visible != self._visible:
+            # Les chunks a l'ecran ne sont jamais evinces, meme si le budget est petit
+            self.chunks.set_pinned(self, visible)
+            self._visible = visible
+        for cx, cy in visible:
+            screen.blit(self.chunk(cx, cy), camera.world_to_screen(
+                cx * self.chunk_width, cy * self.chunk_height
+            ))
+
+    def chunk(self, cx, cy):
+        """Surface du chunk (cx, cy), composee au premier acces."""
+        surface = self.chunks.get((cx, cy))
+        if surface is None:
+            surface = self._bake_chunk(cx, cy)
+            self.chunks.put((cx, cy), surface)
+        return surface
+
+    def _bake_chunk(self, cx, cy):
+        x0 = cx * self.chunk_width
+        y0 = cy * self.chunk_height
+        width = min(self.chunk_width, self.width - x0)
+        height = min(self.chunk_height, self.height - y0)
+
+        # Fond noir opaque comme l'ecran : meme rendu que tuile par tuile
+        surface = pygame.Surface((width, height)).convert()
+        surface.fill((0, 0, 0))
+
+        tx0 = x0 // self.tile_width
+        ty0 = y0 // self.tile_height
+        tx1 = min(self.map_data.width, tx0 + self.chunk_tiles)
+        ty1 = min(self.map_data.height, ty0 + self.chunk_tiles)
+        tiles = self.map_data.tiles
+        for kind, layer in self.map_data.layers:
+            if kind == "image":
+                surface.blit(layer, (-x0, -y0))
+                continue
+            # Couche de tuiles : tableau [y, x] d'indices dans map_data.tiles (0 = vide)
+            for ty in range(ty0, ty1):
+                for tx, index in enumerate(layer[ty, tx0:tx1].tolist(), tx0):
+                    if index:
+                        surface.blit(tiles[index], (tx * self.tile_width - x0, ty * self.tile_height - y0))
+        return surface
+
+    def stats(self):
+        """Occupation du cache des chunks."""
+        return self.chunks.stats()